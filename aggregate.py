@@ -0,0 +1,252 @@
+"""
+Agregasi group-by streaming untuk file dBase III
+Satu pass atas chunk record: count, sum, min, max per grup. Agregat parsial
+per chunk dan per proses digabung, jadi yang disimpan hanya tabel ringkasan.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+import blockio
+import columnar
+import dbase
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# File di bawah ukuran ini diproses dalam satu proses saja
+PARALLEL_THRESHOLD = 64 * blockio.MB
+MAX_WORKERS = 8
+
+DELETED = ord(dbase.DELETED_FLAG)
+
+
+@dataclass
+class Partial:
+    """Agregat parsial: satu baris per kunci grup"""
+
+    keys: np.ndarray  # S{lebar kunci}, terurut
+    count: np.ndarray  # int64 (g,)
+    sum: np.ndarray  # float64 (g, k)
+    min: np.ndarray  # float64 (g, k)
+    max: np.ndarray  # float64 (g, k)
+
+
+@dataclass
+class AggregateResult:
+    """Tabel ringkasan hasil agregasi"""
+
+    columns: list[str]
+    rows: list[list]
+
+    def to_pandas(self) -> pd.DataFrame:
+        import pandas as pd
+
+        return pd.DataFrame(self.rows, columns=self.columns)
+
+
+def _reduce(keys, count, sums, mins, maxs) -> Partial:
+    """Gabungkan baris dengan kunci sama (dipakai untuk chunk maupun merge)"""
+    unique, inverse = np.unique(keys, return_inverse=True)
+    groups = len(unique)
+
+    out_count = np.bincount(inverse, weights=count, minlength=groups).astype(np.int64)
+    out_sum = np.empty((groups, sums.shape[1]), dtype=np.float64)
+    for j in range(sums.shape[1]):
+        out_sum[:, j] = np.bincount(
+            inverse, weights=np.nan_to_num(sums[:, j]), minlength=groups
+        )
+
+    # min/max: urutkan per grup lalu reduce tiap segmen
+    order = np.argsort(inverse, kind="stable")
+    starts = np.flatnonzero(np.diff(inverse[order], prepend=-1))
+    out_min = np.fmin.reduceat(mins[order], starts, axis=0)
+    out_max = np.fmax.reduceat(maxs[order], starts, axis=0)
+    return Partial(unique, out_count, out_sum, out_min, out_max)
+
+
+def merge(partials: list[Partial | None]) -> Partial | None:
+    """Gabungkan beberapa agregat parsial"""
+    partials = [p for p in partials if p is not None and len(p.keys)]
+    if not partials:
+        return None
+    if len(partials) == 1:
+        return partials[0]
+    return _reduce(
+        np.concatenate([p.keys for p in partials]),
+        np.concatenate([p.count for p in partials]),
+        np.concatenate([p.sum for p in partials]),
+        np.concatenate([p.min for p in partials]),
+        np.concatenate([p.max for p in partials]),
+    )
+
+
+def key_column(matrix: np.ndarray, key_fields: list[dbase.DbfField]) -> np.ndarray:
+    """Gabungkan byte mentah field kunci menjadi satu kolom S lebar tetap"""
+    cols = np.concatenate(
+        [np.arange(f.offset, f.offset + f.length) for f in key_fields]
+    )
+    width = len(cols)
+    return np.ascontiguousarray(matrix[:, cols]).view(f"S{width}").ravel()
+
+
+def chunk_partial(
+    chunk: bytes,
+    header: dbase.DbfHeader,
+    key_fields: list[dbase.DbfField],
+    value_fields: list[dbase.DbfField],
+    include_deleted: bool = False,
+) -> Partial | None:
+    """Agregat parsial untuk satu chunk record"""
+    matrix = columnar.record_matrix(chunk, header.record_size)
+    if not include_deleted:
+        matrix = matrix[matrix[:, 0] != DELETED]
+    if not len(matrix):
+        return None
+
+    values = np.empty((len(matrix), len(value_fields)), dtype=np.float64)
+    for j, f in enumerate(value_fields):
+        values[:, j] = columnar.parse_numeric(
+            columnar.fixed_width(matrix, f.offset, f.length)
+        )
+
+    ones = np.ones(len(matrix), dtype=np.int64)
+    return _reduce(key_column(matrix, key_fields), ones, values, values, values)
+
+
+def aggregate_range(
+    filepath: Path | str,
+    header: dbase.DbfHeader,
+    key_fields: list[dbase.DbfField],
+    value_fields: list[dbase.DbfField],
+    start: int = 0,
+    stop: int | None = None,
+    io_config: blockio.IOConfig | None = None,
+    include_deleted: bool = False,
+) -> Partial | None:
+    """Agregasi streaming untuk rentang record [start, stop)"""
+    running = None
+    for chunk in dbase.iter_record_chunks(filepath, header, io_config, start, stop):
+        part = chunk_partial(chunk, header, key_fields, value_fields, include_deleted)
+        running = merge([running, part])
+    return running
+
+
+def resolve_fields(header: dbase.DbfHeader, names: list[str]) -> list[dbase.DbfField]:
+    """Cari field berdasarkan nama (tidak peka huruf besar/kecil)"""
+    by_name = {f.name.upper(): f for f in header.fields}
+    fields = []
+    for name in names:
+        field = by_name.get(name.strip().upper())
+        if field is None:
+            available = ", ".join(header.field_names)
+            raise ValueError(f"Kolom '{name}' tidak ditemukan. Tersedia: {available}")
+        fields.append(field)
+    return fields
+
+
+def auto_workers(header: dbase.DbfHeader) -> int:
+    """Jumlah proses: 1 untuk file kecil, sampai MAX_WORKERS untuk file besar"""
+    data_size = header.num_records * header.record_size
+    if data_size < PARALLEL_THRESHOLD:
+        return 1
+    return max(1, min(os.cpu_count() or 1, MAX_WORKERS))
+
+
+def _number(value: float, decimals: int = 0):
+    """Float ke int bila bulat, None bila NaN (semua sel kosong)
+
+    decimals > 0 membulatkan ke jumlah desimal field, agar SUM tidak membawa
+    sisa pembulatan float (88463.94999999998 -> 88463.95).
+    """
+    if np.isnan(value):
+        return None
+    value = round(float(value), decimals) if decimals > 0 else float(value)
+    return int(value) if value.is_integer() else value
+
+
+def group_by(
+    filepath,
+    group_fields: list[str],
+    sum_fields: list[str] | None = None,
+    encoding: str | None = None,
+    io_config: blockio.IOConfig | None = None,
+    workers: int | None = None,
+    include_deleted: bool = False,
+) -> AggregateResult:
+    """Hitung COUNT, SUM, MIN, MAX per grup dalam satu pass streaming"""
+    header = dbase.read_header(filepath)
+    if not group_fields:
+        raise ValueError("Minimal satu kolom group-by diperlukan")
+    key_fields = resolve_fields(header, group_fields)
+    value_fields = resolve_fields(header, sum_fields or [])
+    encoding = encoding or header.encoding
+
+    workers = blockio.budget_workers(io_config, workers or auto_workers(header))
+    # Anggota arsip tidak bisa di-seek murah per rentang: satu pass saja
+    if not blockio.is_path(filepath):
+        workers = 1
+    if workers <= 1 or header.num_records < workers:
+        partial = aggregate_range(
+            filepath,
+            header,
+            key_fields,
+            value_fields,
+            0,
+            None,
+            io_config,
+            include_deleted,
+        )
+    else:
+        step = -(-header.num_records // workers)
+        io_config = blockio.share_memory(io_config, workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    aggregate_range,
+                    filepath,
+                    header,
+                    key_fields,
+                    value_fields,
+                    start,
+                    start + step,
+                    io_config,
+                    include_deleted,
+                )
+                for start in range(0, header.num_records, step)
+            ]
+            partial = merge([f.result() for f in futures])
+
+    columns = [f.name for f in key_fields] + ["COUNT"]
+    for f in value_fields:
+        columns += [f"SUM_{f.name}", f"MIN_{f.name}", f"MAX_{f.name}"]
+
+    rows = []
+    if partial is not None:
+        width = partial.keys.dtype.itemsize
+        buffer = partial.keys.tobytes()
+        for g in range(len(partial.keys)):
+            key = buffer[g * width : (g + 1) * width]
+            row, pos = [], 0
+            for f in key_fields:
+                row.append(
+                    key[pos : pos + f.length].decode(encoding, errors="replace").strip()
+                )
+                pos += f.length
+            row.append(int(partial.count[g]))
+            for j, f in enumerate(value_fields):
+                row += [
+                    _number(partial.sum[g, j], f.decimals),
+                    _number(partial.min[g, j]),
+                    _number(partial.max[g, j]),
+                ]
+            rows.append(row)
+
+    return AggregateResult(columns, rows)
@@ -4,13 +4,31 @@ DAT/DTA to Excel Exporter - Gradio Web App
 Aplikasi web untuk mengekspor file database legacy ke Excel
 """
 
-import struct
+from __future__ import annotations
+
+import math
+import multiprocessing
+import os
 import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
+from typing import TYPE_CHECKING
+
+import archive
+import blockio
+import dbase
+import integrity
+import xlsx
 
-import pandas as pd
-import gradio as gr
+# gradio diimpor saat UI dibangun (lihat build_app), pandas dan numpy (columnar,
+# extsort) di dalam handler yang membutuhkan, bukan saat modul diimpor
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 # ============== PARSER FUNCTIONS ==============
@@ -18,107 +36,45 @@ import gradio as gr
 
 def read_dbase3_manual(filepath: str) -> tuple[pd.DataFrame, str]:
     """Membaca file dBase III secara manual"""
-    with open(filepath, "rb") as f:
-        _version = struct.unpack("B", f.read(1))[0]  # noqa: F841
-        _year, _month, _day = struct.unpack("3B", f.read(3))
-        num_records = struct.unpack("<I", f.read(4))[0]
-        header_size = struct.unpack("<H", f.read(2))[0]
-        record_size = struct.unpack("<H", f.read(2))[0]
-        f.read(20)
-
-        fields = []
-        while True:
-            first_byte = f.read(1)
-            if first_byte == b"\r" or first_byte == b"\x0d":
-                break
-            f.seek(-1, 1)
-            field_data = f.read(32)
-            name = field_data[0:11].replace(b"\x00", b"").decode("latin-1").strip()
-            ftype = chr(field_data[11])
-            length = field_data[16]
-            fields.append((name, ftype, length))
-
-        f.seek(header_size)
-        records = []
-        for i in range(num_records):
-            record = f.read(record_size)
-            if not record or record[0:1] == b"\x1a":
-                break
-            row = {}
-            offset = 1
-            for name, ftype, length in fields:
-                value = (
-                    record[offset : offset + length]
-                    .decode("latin-1", errors="ignore")
-                    .strip()
-                )
-                row[name] = value
-                offset += length
-            records.append(row)
+    import columnar
 
-        info = f"dBase III | {num_records:,} records | {len(fields)} kolom"
-        return pd.DataFrame(records), info
+    header = dbase.read_header(filepath)
+    table = columnar.load_dbase(filepath, header)
+
+    info = (
+        f"dBase III | {len(table):,} records | {len(header.fields)} kolom"
+        f" | {header.encoding}"
+    )
+    info += _integrity_note(filepath, header)
+    # Kode barang, kasir, satuan: satu string per nilai unik, bukan per sel
+    return table.to_pandas(categorical="auto"), info
+
+
+def _integrity_note(filepath: str, header: dbase.DbfHeader | None = None) -> str:
+    """Peringatan dari cek ukuran vs header (O(1)); string kosong jika sehat"""
+    try:
+        warnings = integrity.size_check(filepath, header).warnings()
+    except (OSError, ValueError):
+        return ""
+    return "".join(f" | PERINGATAN: {w}" for w in warnings)
 
 
 def read_stock_dat(filepath: str) -> tuple[pd.DataFrame, str]:
     """Membaca file STOCK1.DAT"""
-    with open(filepath, "rb") as f:
-        data = f.read()
+    import columnar
 
-    pos = 0
-    for i in range(len(data) - 13):
-        chunk = data[i : i + 13]
-        try:
-            if chunk.isdigit():
-                pos = i
-                break
-        except Exception:
-            continue
-
-    record_size = 23
-    first_pos = pos
-    next_pos = pos + 13
-    while next_pos < len(data) - 13:
-        chunk = data[next_pos : next_pos + 13]
-        if chunk.isdigit():
-            record_size = next_pos - first_pos
-            break
-        next_pos += 1
+    data = blockio.read_all(filepath)
+    table = columnar.load_stock(data)
 
-    records = []
-    current = pos
-    while current < len(data) - record_size:
-        record = data[current : current + record_size]
-        barcode = record[:13].decode("latin-1", errors="ignore").strip()
-        extra_bytes = record[13:]
-
-        if barcode.replace(" ", "").replace("\x00", ""):
-            try:
-                value1 = (
-                    struct.unpack("<I", extra_bytes[4:8])[0]
-                    if len(extra_bytes) >= 8
-                    else 0
-                )
-            except Exception:
-                value1 = 0
-
-            records.append(
-                {
-                    "BARCODE": barcode.strip(),
-                    "VALUE": value1,
-                    "RAW_DATA": extra_bytes.hex(),
-                }
-            )
-        current += record_size
-
-    info = f"Custom Binary (Stock) | {len(records):,} records"
-    return pd.DataFrame(records), info
+    info = f"Custom Binary (Stock) | {len(table):,} records"
+    return table.to_pandas(), info
 
 
 def read_tproduk_dat(filepath: str) -> tuple[pd.DataFrame, str]:
     """Membaca file TPRODUK1.DAT"""
-    with open(filepath, "rb") as f:
-        data = f.read()
+    import pandas as pd
+
+    data = blockio.read_all(filepath)
 
     records = []
     pos = data.find(b"nota")
@@ -127,7 +83,9 @@ def read_tproduk_dat(filepath: str) -> tuple[pd.DataFrame, str]:
             {
                 "TYPE": "INDEX/CONFIG",
                 "SIZE": len(data),
-                "CONTENT": data[pos : pos + 50].decode("latin-1", errors="ignore"),
+                "CONTENT": data[pos : pos + 50].decode(
+                    dbase.DEFAULT_ENCODING, errors="ignore"
+                ),
             }
         )
 
@@ -135,14 +93,30 @@ def read_tproduk_dat(filepath: str) -> tuple[pd.DataFrame, str]:
     return pd.DataFrame(records), info
 
 
-def detect_and_read(filepath: str) -> tuple[pd.DataFrame, str]:
-    """Deteksi format dan baca file"""
-    path = Path(filepath)
-    with open(filepath, "rb") as f:
+def _source_name(source) -> str:
+    """Nama file dari path atau anggota arsip"""
+    return Path(source).name if blockio.is_path(source) else source.name
+
+
+def upload_sources(filepath: str) -> list:
+    """File upload -> sumber data; arsip .zip/.gz diganti anggota DAT/DTA-nya"""
+    if not archive.is_archive(filepath):
+        return [filepath]
+    sources = archive.expand([Path(filepath)])
+    if not sources:
+        raise ValueError("Arsip tidak berisi file DAT/DTA")
+    return sources
+
+
+def detect_and_read(filepath) -> tuple[pd.DataFrame, str]:
+    """Deteksi format dan baca file (path atau anggota arsip)"""
+    import pandas as pd
+
+    with blockio.open_source(filepath) as f:
         header = f.read(10)
 
     version = header[0]
-    filename = path.name.upper()
+    filename = _source_name(filepath).upper()
 
     if filename.endswith(".DTA") and version == 0x03:
         return read_dbase3_manual(filepath)
@@ -158,49 +132,328 @@ def detect_and_read(filepath: str) -> tuple[pd.DataFrame, str]:
             return pd.DataFrame(), "Format tidak dikenali"
 
 
+# ============== PAGED PREVIEW ==============
+
+PAGE_SIZES = [50, 100, 500, 1000]
+DEFAULT_PAGE_SIZE = 100
+# Jumlah halaman hasil decode yang disimpan (LRU)
+PAGE_CACHE_SIZE = 32
+# Jumlah DbfTable (mmap + file handle) yang tetap terbuka
+TABLE_CACHE_SIZE = 4
+RECNO_COLUMN = "No."
+
+
+def _file_key(filepath: str) -> tuple[str, int, int]:
+    """Kunci cache: path + mtime + ukuran (berubah jika file diganti)"""
+    stat = Path(filepath).stat()
+    return str(filepath), stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=4)
+def _preview_sources(key: tuple[str, int, int]) -> tuple:
+    """Sumber yang bisa di-preview dari satu upload (arsip: semua anggota)"""
+    return tuple(upload_sources(key[0]))
+
+
+def member_choices(filepath: str | None) -> list[str]:
+    """Nama anggota DAT/DTA yang bisa di-preview dari arsip (kosong jika bukan arsip)"""
+    if not filepath or not archive.is_archive(filepath):
+        return []
+    return [source.member for source in _preview_sources(_file_key(filepath))]
+
+
+def _member_index(sources: tuple, member: str | None) -> int:
+    """Posisi anggota arsip yang dipilih (default: yang pertama)"""
+    if member is None or len(sources) == 1:
+        return 0
+    for i, source in enumerate(sources):
+        if not blockio.is_path(source) and source.member == member:
+            return i
+    raise ValueError(f"{member} tidak ada di arsip")
+
+
+class _TableCache:
+    """LRU DbfTable terbuka; tabel yang tersingkir langsung ditutup
+
+    lru_cache tidak bisa dipakai: ia hanya membuang referensi, sehingga mmap
+    dan file handle tabel lama baru dilepas saat garbage collection.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._tables: OrderedDict[tuple, dbase.DbfTable | None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, member: int) -> dbase.DbfTable | None:
+        with self._lock:
+            if (key, member) in self._tables:
+                self._tables.move_to_end((key, member))
+                return self._tables[key, member]
+            table = _load_table(_preview_sources(key)[member])
+            self._tables[key, member] = table
+            while len(self._tables) > self.maxsize:
+                _, evicted = self._tables.popitem(last=False)
+                if evicted is not None:
+                    evicted.close()
+            return table
+
+    def clear(self):
+        with self._lock:
+            for table in self._tables.values():
+                if table is not None:
+                    table.close()
+            self._tables.clear()
+
+
+_tables = _TableCache(TABLE_CACHE_SIZE)
+
+
+def _open_table(key: tuple[str, int, int], member: int = 0) -> dbase.DbfTable | None:
+    """DbfTable (mmap) untuk file dBase, None untuk format lain"""
+    return _tables.get(key, member)
+
+
+def _load_table(source) -> dbase.DbfTable | None:
+    filename = _source_name(source).upper()
+    if "STOCK" in filename or "PRODUK" in filename:
+        return None
+    if blockio.is_path(source):
+        try:
+            return dbase.DbfTable(source)
+        except (ValueError, OSError):
+            return None
+    try:
+        # Akses acak butuh file seekable: anggota arsip di-spool sekali
+        spooled = source.spool()
+    except OSError:
+        return None
+    try:
+        return dbase.DbfTable(spooled)
+    except (ValueError, OSError):
+        spooled.close()
+        return None
+
+
+@lru_cache(maxsize=2)
+def _read_full(key: tuple[str, int, int], member: int = 0) -> tuple[pd.DataFrame, str]:
+    """Format non-dBase tidak bisa diakses acak: baca penuh sekali, lalu cache"""
+    return detect_and_read(_preview_sources(key)[member])
+
+
+@lru_cache(maxsize=PAGE_CACHE_SIZE)
+def _decode_page(
+    key: tuple[str, int, int], member: int, page: int, page_size: int
+) -> pd.DataFrame:
+    """Decode hanya record pada satu halaman langsung dari file yang di-mmap"""
+    import pandas as pd
+
+    table = _open_table(key, member)
+    start = (page - 1) * page_size
+    recnos, columns = table.read_range(start, start + page_size)
+    df = pd.DataFrame(dict(zip(table.field_names, columns)))
+    df.insert(0, RECNO_COLUMN, [r + 1 for r in recnos])
+    return df
+
+
+def load_page(
+    filepath: str,
+    page: int,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    member: str | None = None,
+) -> tuple[pd.DataFrame, str, int]:
+    """Ambil satu halaman data: (DataFrame, info, nomor halaman yang dipakai)
+
+    member memilih anggota arsip (nama dari member_choices); default yang pertama.
+    """
+    started = time.perf_counter()
+    key = _file_key(filepath)
+    page_size = max(1, page_size)
+
+    sources = _preview_sources(key)
+    index = _member_index(sources, member)
+    table = _open_table(key, index)
+    if table is not None:
+        total = len(table)
+        prefix = f"dBase III | {len(table.field_names)} kolom | {table.encoding}"
+        prefix += _integrity_note(sources[index], table.header)
+    else:
+        full, prefix = _read_full(key, index)
+        total = len(full)
+
+    if archive.is_archive(filepath):
+        prefix = (
+            f"{_source_name(sources[index])} ({index + 1}/{len(sources)} file di "
+            f"arsip) | {prefix}"
+        )
+
+    pages = max(1, math.ceil(total / page_size))
+    page = min(max(1, page), pages)
+
+    if table is not None:
+        df = _decode_page(key, index, page, page_size)
+    else:
+        start = (page - 1) * page_size
+        df = full.iloc[start : start + page_size].copy()
+        df.insert(0, RECNO_COLUMN, range(start + 1, start + 1 + len(df)))
+
+    elapsed = (time.perf_counter() - started) * 1000
+    first = min((page - 1) * page_size + 1, total)
+    last = min(page * page_size, total)
+    info = (
+        f"{prefix} | Halaman {page:,}/{pages:,} | "
+        f"record {first:,}-{last:,} dari {total:,} | {elapsed:.1f} ms"
+    )
+    return df, info, page
+
+
 # ============== GRADIO FUNCTIONS ==============
 
 
-def preview_file(file) -> tuple[pd.DataFrame, str]:
-    """Preview isi file"""
+def browse_page(file, page, page_size, member=None) -> tuple[pd.DataFrame, str, int]:
+    """Tampilkan satu halaman data (member: anggota arsip yang dipilih)"""
+    import pandas as pd
+
     if file is None:
-        return pd.DataFrame(), "Silakan upload file terlebih dahulu"
+        return pd.DataFrame(), "Silakan upload file terlebih dahulu", 1
 
     try:
-        df, info = detect_and_read(file.name)
-        if len(df) > 100:
-            preview_df = df.head(100)
-            info += f" | Menampilkan 100 dari {len(df):,} baris"
-        else:
-            preview_df = df
-        return preview_df, f"[OK] {info}"
+        df, info, page = load_page(
+            file.name, int(page or 1), int(page_size or DEFAULT_PAGE_SIZE), member
+        )
+        return df, f"[OK] {info}", page
     except Exception as e:
-        return pd.DataFrame(), f"[ERROR] {str(e)}"
+        return pd.DataFrame(), f"[ERROR] {str(e)}", 1
+
+
+def prev_page(file, page, page_size, member=None) -> tuple[pd.DataFrame, str, int]:
+    """Halaman sebelumnya"""
+    return browse_page(file, int(page or 1) - 1, page_size, member)
+
+
+def next_page(file, page, page_size, member=None) -> tuple[pd.DataFrame, str, int]:
+    """Halaman berikutnya"""
+    return browse_page(file, int(page or 1) + 1, page_size, member)
+
+
+def jump_to_record(
+    file, record, page_size, member=None
+) -> tuple[pd.DataFrame, str, int]:
+    """Lompat ke halaman yang berisi nomor record tertentu (1-based)"""
+    page_size = int(page_size or DEFAULT_PAGE_SIZE)
+    page = (max(int(record or 1), 1) - 1) // page_size + 1
+    return browse_page(file, page, page_size, member)
 
 
-def export_single(file) -> tuple[str, str]:
-    """Ekspor satu file ke Excel"""
+def preview_file(file) -> tuple[pd.DataFrame, str]:
+    """Preview isi file (halaman pertama)"""
+    df, status, _ = browse_page(file, 1, DEFAULT_PAGE_SIZE)
+    return df, status
+
+
+# Batas proses paralel saat membuat sheet ekspor multi-file
+MAX_EXPORT_WORKERS = 8
+
+
+def _sheet_part(
+    source, part_path: Path, sort_by: list[str] | None = None
+) -> xlsx.SheetPart:
+    """Baca satu sumber dan tulis sebagai worksheet XML terkompresi
+
+    Dengan sort_by, file dBase ditulis terurut lewat extsort (memori terbatas);
+    format lain tetap dalam urutan asli.
+    """
+    if sort_by and Path(_source_name(source)).suffix.upper() == ".DTA":
+        import extsort
+
+        header = dbase.read_header(source)
+        rows = extsort.sorted_rows(source, header, sort_by)
+        return xlsx.write_sheet(part_path, header.field_names, rows)
+    df, info = detect_and_read(source)
+    return xlsx.write_sheet(
+        part_path, list(df.columns), df.itertuples(index=False, name=None)
+    )
+
+
+def _sheet_parts(sources: list, parts_dir: Path, sort_by: list[str] | None = None):
+    """(part atau exception) per sumber; beberapa sumber dikerjakan paralel"""
+    jobs = [
+        (source, parts_dir / f"sheet{i}.xml", sort_by)
+        for i, source in enumerate(sources)
+    ]
+    workers = min(len(jobs), os.cpu_count() or 1, MAX_EXPORT_WORKERS)
+    if workers <= 1:
+        for job in jobs:
+            try:
+                yield _sheet_part(*job)
+            except blockio.READ_ERRORS as e:
+                yield e
+        return
+    # spawn: server Gradio berjalan multi-thread, fork tidak aman di sini
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(_sheet_part, *job) for job in jobs]
+        for future in futures:
+            try:
+                yield future.result()
+            except blockio.READ_ERRORS as e:
+                yield e
+
+
+def _write_workbook(
+    sources: list, output_path: Path, sort_by: list[str] | None = None
+) -> tuple[int, list[str]]:
+    """Tulis setiap sumber ke sheet sendiri: (total baris, baris status)"""
+    names = xlsx.sheet_names([Path(_source_name(s)).stem for s in sources])
+    results = []
+    sheets = []
+    with tempfile.TemporaryDirectory(prefix="datexp_") as parts_dir:
+        parts = _sheet_parts(sources, Path(parts_dir), sort_by)
+        for source, name, part in zip(sources, names, parts):
+            if isinstance(part, Exception):
+                results.append(f"[ERROR] {_source_name(source)}: {str(part)}")
+            elif part.rows:
+                sheets.append((name, part))
+                results.append(f"[OK] {name}: {part.rows:,} baris")
+            else:
+                results.append(f"[WARN] {_source_name(source)}: kosong")
+        if sheets:
+            xlsx.assemble(output_path, sheets)
+    return sum(part.rows for _, part in sheets), results
+
+
+def _sort_fields(sort_by: str | None) -> list[str] | None:
+    """Isian "Urutkan berdasarkan" -> daftar kolom (None jika kosong)"""
+    if not sort_by or not sort_by.strip():
+        return None
+    import extsort
+
+    return extsort.parse_fields(sort_by)
+
+
+def export_single(file, sort_by: str | None = None) -> tuple[str, str]:
+    """Ekspor satu file ke Excel (arsip berisi beberapa file: satu sheet per file)"""
     if file is None:
         return None, "[ERROR] Silakan upload file terlebih dahulu"
 
     try:
-        df, info = detect_and_read(file.name)
-        if len(df) == 0:
-            return None, "[ERROR] File kosong atau tidak dapat dibaca"
-
-        # Buat file output
+        sources = upload_sources(file.name)
         output_name = Path(file.name).stem + "_export.xlsx"
         output_path = Path(tempfile.gettempdir()) / output_name
 
-        df.to_excel(output_path, index=False, engine="openpyxl")
+        total, results = _write_workbook(sources, output_path, _sort_fields(sort_by))
+        if len(sources) > 1:
+            status = "\n".join(results)
+            return str(output_path) if total else None, f"Hasil ekspor:\n{status}"
 
-        return str(output_path), f"[OK] Berhasil! {len(df):,} baris diekspor"
+        if total == 0:
+            return None, "[ERROR] File kosong atau tidak dapat dibaca"
+        return str(output_path), f"[OK] Berhasil! {total:,} baris diekspor"
     except Exception as e:
         return None, f"[ERROR] {str(e)}"
 
 
-def export_multiple(files) -> tuple[str, str]:
-    """Ekspor multiple files ke satu Excel (multi-sheet)"""
+def export_multiple(files, sort_by: str | None = None) -> tuple[str, str]:
+    """Ekspor multiple files ke satu Excel (multi-sheet, sheet dibuat paralel)"""
     if not files:
         return None, "[ERROR] Silakan upload minimal satu file"
 
@@ -208,117 +461,203 @@ def export_multiple(files) -> tuple[str, str]:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_path = Path(tempfile.gettempdir()) / f"export_all_{timestamp}.xlsx"
 
-        results = []
-        with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-            for file in files:
-                try:
-                    df, info = detect_and_read(file.name)
-                    if len(df) > 0:
-                        sheet_name = Path(file.name).stem[:31]
-                        df.to_excel(writer, sheet_name=sheet_name, index=False)
-                        results.append(f"[OK] {sheet_name}: {len(df):,} baris")
-                    else:
-                        results.append(f"[WARN] {Path(file.name).name}: kosong")
-                except Exception as e:
-                    results.append(f"[ERROR] {Path(file.name).name}: {str(e)}")
+        # Arsip dari beberapa upload: awali nama sheet dengan nama arsip
+        sources = archive.expand([Path(file.name) for file in files])
+        total, results = _write_workbook(sources, output_path, _sort_fields(sort_by))
 
         status = "\n".join(results)
-        return str(output_path), f"Hasil ekspor:\n{status}"
+        return str(output_path) if total else None, f"Hasil ekspor:\n{status}"
     except Exception as e:
         return None, f"[ERROR] {str(e)}"
 
 
 # ============== GRADIO UI ==============
 
-with gr.Blocks(title="DAT/DTA Exporter") as app:
-    gr.Markdown("""
-    # DAT/DTA to Excel Exporter
-
-    Aplikasi untuk mengkonversi file database legacy (`.DAT`, `.DTA`) ke format Excel (`.xlsx`).
-
-    **Format yang didukung:**
-    - `TJUAL.DTA` - Data transaksi penjualan (dBase III)
-    - `STOCK1.DAT` - Data stok/barcode
-    - `TPRODUK1.DAT` - Data produk
-    """)
-
-    with gr.Tabs():
-        # Tab 1: Single File
-        with gr.TabItem("Satu File"):
-            with gr.Row():
-                with gr.Column(scale=1):
-                    single_file = gr.File(
-                        label="Upload File DAT/DTA",
-                        file_types=[".dat", ".dta", ".DAT", ".DTA"],
-                    )
-                    with gr.Row():
-                        btn_preview = gr.Button("Preview", variant="secondary")
-                        btn_export = gr.Button("Export ke Excel", variant="primary")
 
-                with gr.Column(scale=2):
-                    status_single = gr.Textbox(
-                        label="Status", interactive=False, elem_classes=["status-box"]
+def build_app():
+    """Bangun UI Gradio (gradio baru diimpor di sini)"""
+    import gradio as gr
+
+    with gr.Blocks(title="DAT/DTA Exporter") as app:
+        gr.Markdown("""
+        # DAT/DTA to Excel Exporter
+
+        Aplikasi untuk mengkonversi file database legacy (`.DAT`, `.DTA`) ke format Excel (`.xlsx`).
+
+        **Format yang didukung:**
+        - `TJUAL.DTA` - Data transaksi penjualan (dBase III)
+        - `STOCK1.DAT` - Data stok/barcode
+        - `TPRODUK1.DAT` - Data produk
+        """)
+
+        with gr.Tabs():
+            # Tab 1: Single File
+            with gr.TabItem("Satu File"):
+                with gr.Row():
+                    with gr.Column(scale=1):
+                        single_file = gr.File(
+                            label="Upload File DAT/DTA",
+                            file_types=[".dat", ".dta", ".DAT", ".DTA", ".zip", ".gz"],
+                        )
+                        archive_member = gr.Dropdown(
+                            label="File di arsip",
+                            choices=[],
+                            visible=False,
+                        )
+                        sort_single = gr.Textbox(
+                            label="Urutkan berdasarkan (opsional, file .DTA)",
+                            placeholder="TANGGAL,NOTA",
+                        )
+                        with gr.Row():
+                            btn_preview = gr.Button("Preview", variant="secondary")
+                            btn_export = gr.Button("Export ke Excel", variant="primary")
+
+                    with gr.Column(scale=2):
+                        status_single = gr.Textbox(
+                            label="Status",
+                            interactive=False,
+                            elem_classes=["status-box"],
+                        )
+                        output_single = gr.File(label="Download Excel")
+
+                preview_table = gr.Dataframe(
+                    label="Preview Data", wrap=True, max_height=400
+                )
+
+                with gr.Row():
+                    btn_prev = gr.Button("< Sebelumnya", size="sm")
+                    page_number = gr.Number(
+                        label="Halaman", value=1, precision=0, minimum=1
                     )
-                    output_single = gr.File(label="Download Excel")
-
-            preview_table = gr.Dataframe(
-                label="Preview Data (100 baris pertama)", wrap=True, max_height=400
-            )
-
-            btn_preview.click(
-                fn=preview_file,
-                inputs=[single_file],
-                outputs=[preview_table, status_single],
-            )
-
-            btn_export.click(
-                fn=export_single,
-                inputs=[single_file],
-                outputs=[output_single, status_single],
-            )
-
-        # Tab 2: Multiple Files
-        with gr.TabItem("Multiple Files"):
-            gr.Markdown("""
-            Upload beberapa file sekaligus. Setiap file akan menjadi **sheet terpisah** dalam satu file Excel.
-            """)
-
-            with gr.Row():
-                with gr.Column(scale=1):
-                    multi_files = gr.File(
-                        label="Upload Files (bisa multiple)",
-                        file_count="multiple",
-                        file_types=[".dat", ".dta", ".DAT", ".DTA"],
+                    page_size = gr.Dropdown(
+                        choices=PAGE_SIZES,
+                        value=DEFAULT_PAGE_SIZE,
+                        label="Baris per halaman",
                     )
-                    btn_export_multi = gr.Button(
-                        "Export Semua ke Excel", variant="primary", size="lg"
+                    btn_next = gr.Button("Berikutnya >", size="sm")
+                    jump_record = gr.Number(
+                        label="Lompat ke record", precision=0, minimum=1
                     )
-
-                with gr.Column(scale=1):
-                    status_multi = gr.Textbox(
-                        label="Status Ekspor",
-                        interactive=False,
-                        lines=10,
-                        elem_classes=["status-box"],
+                    btn_jump = gr.Button("Lompat", size="sm")
+
+                page_inputs = [single_file, page_number, page_size, archive_member]
+                page_outputs = [preview_table, status_single, page_number]
+
+                def show_members(file):
+                    # Arsip berisi beberapa DAT/DTA: pilih anggota yang di-preview
+                    try:
+                        choices = member_choices(file.name if file else None)
+                    except (OSError, ValueError):
+                        choices = []
+                    return gr.update(
+                        choices=choices,
+                        value=choices[0] if choices else None,
+                        visible=len(choices) > 1,
                     )
-                    output_multi = gr.File(label="Download Excel")
 
-            btn_export_multi.click(
-                fn=export_multiple,
-                inputs=[multi_files],
-                outputs=[output_multi, status_multi],
-            )
+                single_file.change(
+                    fn=show_members, inputs=single_file, outputs=archive_member
+                )
+                btn_preview.click(
+                    fn=lambda file, size, member: browse_page(file, 1, size, member),
+                    inputs=[single_file, page_size, archive_member],
+                    outputs=page_outputs,
+                )
+                archive_member.input(
+                    fn=lambda file, size, member: browse_page(file, 1, size, member),
+                    inputs=[single_file, page_size, archive_member],
+                    outputs=page_outputs,
+                )
+                btn_prev.click(fn=prev_page, inputs=page_inputs, outputs=page_outputs)
+                btn_next.click(fn=next_page, inputs=page_inputs, outputs=page_outputs)
+                page_number.submit(
+                    fn=browse_page, inputs=page_inputs, outputs=page_outputs
+                )
+                page_size.change(
+                    fn=lambda file, size, member: browse_page(file, 1, size, member),
+                    inputs=[single_file, page_size, archive_member],
+                    outputs=page_outputs,
+                )
+                btn_jump.click(
+                    fn=jump_to_record,
+                    inputs=[single_file, jump_record, page_size, archive_member],
+                    outputs=page_outputs,
+                )
+                jump_record.submit(
+                    fn=jump_to_record,
+                    inputs=[single_file, jump_record, page_size, archive_member],
+                    outputs=page_outputs,
+                )
+
+                btn_export.click(
+                    fn=export_single,
+                    inputs=[single_file, sort_single],
+                    outputs=[output_single, status_single],
+                )
+
+            # Tab 2: Multiple Files
+            with gr.TabItem("Multiple Files"):
+                gr.Markdown("""
+                Upload beberapa file sekaligus. Setiap file akan menjadi **sheet terpisah** dalam satu file Excel.
+                """)
+
+                with gr.Row():
+                    with gr.Column(scale=1):
+                        multi_files = gr.File(
+                            label="Upload Files (bisa multiple)",
+                            file_count="multiple",
+                            file_types=[".dat", ".dta", ".DAT", ".DTA", ".zip", ".gz"],
+                        )
+                        sort_multi = gr.Textbox(
+                            label="Urutkan berdasarkan (opsional, file .DTA)",
+                            placeholder="TANGGAL,NOTA",
+                        )
+                        btn_export_multi = gr.Button(
+                            "Export Semua ke Excel", variant="primary", size="lg"
+                        )
+
+                    with gr.Column(scale=1):
+                        status_multi = gr.Textbox(
+                            label="Status Ekspor",
+                            interactive=False,
+                            lines=10,
+                            elem_classes=["status-box"],
+                        )
+                        output_multi = gr.File(label="Download Excel")
+
+                btn_export_multi.click(
+                    fn=export_multiple,
+                    inputs=[multi_files, sort_multi],
+                    outputs=[output_multi, status_multi],
+                )
+
+        gr.Markdown("""
+        ---
+        **Catatan:**
+        - File Excel yang dihasilkan kompatibel dengan Microsoft Excel, LibreOffice, dan Google Sheets
+        - Untuk file besar (>100rb baris), proses ekspor mungkin memakan waktu beberapa detik
+        """)
+
+    return app
+
 
-    gr.Markdown("""
-    ---
-    **Catatan:**
-    - File Excel yang dihasilkan kompatibel dengan Microsoft Excel, LibreOffice, dan Google Sheets
-    - Untuk file besar (>100rb baris), proses ekspor mungkin memakan waktu beberapa detik
-    """)
+_app = None
+
+
+def __getattr__(name):
+    # `app` dibangun saat pertama diakses (mis. entry point app:app.launch)
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = build_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
-    app.launch(
+    import gradio as gr
+
+    build_app().launch(
         server_name="0.0.0.0",  # Accessible dari network
         server_port=7860,
         share=False,  # Set True untuk membuat public link
@@ -0,0 +1,168 @@
+"""
+Baca file DAT/DTA langsung dari arsip backup .zip/.gz (hanya stdlib)
+Anggota arsip dibaca sebagai stream terkompresi (tanpa ekstraksi ke disk);
+salinan sementara anonim hanya dibuat bila perlu akses acak (mmap).
+"""
+
+import contextlib
+import dataclasses
+import functools
+import gzip
+import shutil
+import struct
+import tempfile
+import zipfile
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+
+ARCHIVE_SUFFIXES = (".zip", ".gz")
+MEMBER_SUFFIXES = (".dat", ".dta")
+SPOOL_BLOCK = 8 * 1024 * 1024
+# Rasio kompresi maksimum deflate: gzip yang lebih kecil dari 4 GB / rasio ini
+# pasti berukuran asli < 4 GB, jadi ISIZE (modulo 2**32) bisa dipercaya
+DEFLATE_MAX_RATIO = 1032
+ISIZE_LIMIT = 2**32
+
+
+def is_archive(path) -> bool:
+    return isinstance(path, (str, Path)) and Path(path).suffix.lower() in (
+        ARCHIVE_SUFFIXES
+    )
+
+
+@dataclass(frozen=True)
+class ArchiveMember:
+    """Satu file data di dalam arsip
+
+    Meniru bagian Path yang dipakai exporter (name, stem, exists) sehingga bisa
+    menjadi input di mana saja; reader membukanya lewat blockio.open_source.
+    """
+
+    archive: Path
+    member: str  # Nama di dalam zip; untuk .gz sama dengan name
+    known_size: int | None  # Ukuran setelah dekompresi; None = belum diketahui
+    prefix: str = ""  # Pembeda nama output bila ada beberapa arsip
+
+    @functools.cached_property
+    def size(self) -> int:
+        """Ukuran setelah dekompresi; jika belum diketahui dihitung dengan streaming"""
+        if self.known_size is not None:
+            return self.known_size
+        size = 0
+        with self.open() as src:
+            while block := src.read(SPOOL_BLOCK):
+                size += len(block)
+        return size
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.member).name
+
+    @property
+    def stem(self) -> str:
+        return self.prefix + PurePosixPath(self.member).stem
+
+    @property
+    def suffix(self) -> str:
+        return PurePosixPath(self.member).suffix
+
+    def exists(self) -> bool:
+        return self.archive.exists()
+
+    def open(self):
+        """Stream biner hasil dekompresi (seek maju murah, mundur = ulang dari awal)"""
+        if self.archive.suffix.lower() == ".gz":
+            return gzip.open(self.archive, "rb")
+        zf = zipfile.ZipFile(self.archive)
+        try:
+            stream = zf.open(self.member)
+        except BaseException:
+            zf.close()
+            raise
+        # ZipFile ikut ditutup bersama stream anggota
+        zf.close()
+        return stream
+
+    def spool(self):
+        """Salin ke file sementara anonim (terhapus saat ditutup) untuk akses acak"""
+        with contextlib.ExitStack() as stack:
+            spooled = stack.enter_context(tempfile.TemporaryFile())
+            with self.open() as src:
+                shutil.copyfileobj(src, spooled, SPOOL_BLOCK)
+            spooled.seek(0)
+            # Berhasil: file sementara diserahkan (tetap terbuka) ke pemanggil
+            stack.pop_all()
+        return spooled
+
+    def __str__(self) -> str:
+        return f"{self.archive}:{self.member}"
+
+
+def _gzip_size(path: Path) -> int | None:
+    """Ukuran asli dari trailer ISIZE gzip
+
+    ISIZE hanya menyimpan ukuran modulo 4 GB. Jika ukuran terkompresi
+    memungkinkan data asli >= 4 GB, hasilnya None (diukur saat dibutuhkan).
+    """
+    with open(path, "rb") as f:
+        f.seek(-4, 2)
+        if f.tell() * DEFLATE_MAX_RATIO >= ISIZE_LIMIT:
+            return None
+        return struct.unpack("<I", f.read(4))[0]
+
+
+def members(path: Path | str, prefix: str = "") -> list[ArchiveMember]:
+    """Anggota arsip berformat DAT/DTA (urutan seperti di dalam arsip)"""
+    path = Path(path)
+    if path.suffix.lower() == ".gz":
+        # TJUAL.DTA.gz -> TJUAL.DTA
+        return [ArchiveMember(path, path.stem, _gzip_size(path), prefix)]
+    with zipfile.ZipFile(path) as zf:
+        return [
+            ArchiveMember(path, info.filename, info.file_size, prefix)
+            for info in zf.infolist()
+            if not info.is_dir()
+            and PurePosixPath(info.filename).suffix.lower() in MEMBER_SUFFIXES
+        ]
+
+
+def _labels(path: Path) -> list[str]:
+    """Calon awalan pembeda untuk anggota arsip, dari yang paling pendek
+
+    Nama .gz sudah sama dengan anggotanya (TJUAL.DTA.gz), jadi backup harian
+    seperti senin/TJUAL.DTA.gz dibedakan dengan nama foldernya.
+    """
+    folder = path.resolve().parent.name
+    if path.suffix.lower() == ".gz":
+        return [folder]
+    return [path.stem, f"{folder}_{path.stem}"]
+
+
+def _stem(item) -> str:
+    return item.stem if isinstance(item, ArchiveMember) else Path(item).stem
+
+
+def expand(paths: list) -> list:
+    """Ganti setiap arsip di daftar input dengan anggotanya
+
+    Anggota arsip (zip maupun .gz) yang namanya bentrok dengan input lain
+    diberi awalan nama arsip atau foldernya, agar sheet/tabel/CSV dari tiap
+    arsip tidak saling menimpa.
+    """
+    expanded = []
+    for path in paths:
+        # Arsip yang tidak ada dibiarkan agar dilaporkan SKIP oleh pemanggil
+        if is_archive(path) and Path(path).exists():
+            expanded += members(path)
+        else:
+            expanded.append(path)
+
+    for level in range(2):
+        counts = Counter(_stem(item).upper() for item in expanded)
+        for i, item in enumerate(expanded):
+            if isinstance(item, ArchiveMember) and counts[item.stem.upper()] > 1:
+                labels = _labels(item.archive)
+                label = labels[min(level, len(labels) - 1)]
+                expanded[i] = dataclasses.replace(item, prefix=f"{label}_")
+    return expanded
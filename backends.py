@@ -0,0 +1,572 @@
+"""
+Backend pembaca file dBase III dan pemilihan otomatis
+Setiap backend menyatakan kemampuannya (memo, hasil bertipe, kolom kategori,
+butuh file biasa / lebih dari satu core). Throughput-nya diukur sekali per host
+(`exporter.py calibrate`) lalu backend tercepat dipilih per file berdasarkan
+ukuran, tipe field dan jumlah core yang tersedia.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import platform
+import struct
+import tempfile
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import blockio
+import dbase
+import stock
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# pandas, numpy (columnar) dan dbfread diimpor di dalam reader masing-masing
+
+AUTO = "auto"
+MODES = ("frame", "rows")  # DataFrame penuh / iterator baris (streaming)
+MB = blockio.MB
+
+PROFILE_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "dat-exporter"
+    / "backends.json"
+)
+# Backend parallel: jumlah record per tugas dan batas proses
+PARALLEL_RANGE = 131_072
+MAX_PARALLEL_WORKERS = 8
+# File kalibrasi: record sintetis dengan campuran tipe field
+CALIBRATION_RECORDS = 50_000
+CALIBRATION_TINY = 200
+CALIBRATION_FIELDS = [
+    ("KODE", "C", 10, 0),
+    ("NAMA", "C", 24, 0),
+    ("QTY", "N", 8, 0),
+    ("HARGA", "N", 12, 2),
+    ("TGL", "D", 8, 0),
+    ("AKTIF", "L", 1, 0),
+]
+
+# Profil bawaan sebelum kalibrasi: (byte/detik, overhead detik) per mode.
+# Throughput parallel dihitung per core.
+DEFAULT_PROFILE = {
+    "dbfread": {"frame": (4 * MB, 0.01), "rows": (5 * MB, 0.01)},
+    "manual": {"frame": (25 * MB, 0.005), "rows": (30 * MB, 0.002)},
+    "vectorized": {"frame": (50 * MB, 0.02), "rows": (45 * MB, 0.01)},
+    "parallel": {"frame": (30 * MB, 0.2), "rows": (25 * MB, 0.2)},
+}
+
+
+@dataclass(frozen=True)
+class ReadOptions:
+    """Pilihan pembacaan satu file (dari --backend/--stats/--stock-layout/--sort-by)"""
+
+    backend: str = AUTO
+    stats: bool = False  # Cetak backend terpilih, alasan dan throughput
+    cores: int | None = None  # Core untuk file ini (None = semua)
+    stock_layout: stock.StockLayout | None = None  # None = stock.DEFAULT_LAYOUT
+    sort_by: tuple[str, ...] = ()  # Urutkan baris dBase (lihat extsort)
+
+
+@dataclass(frozen=True)
+class Backend:
+    """Satu cara membaca file dBase beserta kemampuannya"""
+
+    name: str
+    description: str
+    module: str | None = None  # Dependensi opsional
+    memo: bool = False  # Membaca isi field memo dari file .DBT
+    typed: bool = False  # Nilai bertipe (angka/tanggal), bukan teks
+    categorical: bool = False  # Mendukung kolom pd.Categorical
+    needs_path: bool = False  # Tidak bisa membaca anggota arsip (stream)
+    parallel: bool = False  # Butuh lebih dari satu core
+
+    def available(self) -> bool:
+        return self.module is None or importlib.util.find_spec(self.module) is not None
+
+    def frame(
+        self,
+        filepath,
+        header: dbase.DbfHeader,
+        io_config: blockio.IOConfig | None = None,
+        encoding: str | None = None,
+        categorical=None,
+        progress=None,
+        cores: int | None = None,
+    ) -> pd.DataFrame:
+        """Baca seluruh file menjadi DataFrame"""
+        return _FRAME_READERS[self.name](
+            filepath, header, io_config, encoding, categorical, progress, cores
+        )
+
+    def rows(
+        self,
+        filepath,
+        header: dbase.DbfHeader,
+        io_config: blockio.IOConfig | None = None,
+        encoding: str | None = None,
+        cores: int | None = None,
+    ) -> tuple[list[str], Iterator]:
+        """Kolom dan iterator baris (streaming)"""
+        return _ROW_READERS[self.name](filepath, header, io_config, encoding, cores)
+
+
+BACKENDS = {
+    b.name: b
+    for b in [
+        Backend(
+            "dbfread",
+            "dbfread, satu OrderedDict per record",
+            module="dbfread",
+            memo=True,
+            typed=True,
+            needs_path=True,
+        ),
+        Backend("manual", "decode Python per chunk (tanpa numpy)"),
+        Backend("vectorized", "numpy per kolom", categorical=True),
+        Backend(
+            "parallel",
+            "numpy, rentang record di beberapa proses",
+            needs_path=True,
+            parallel=True,
+        ),
+    ]
+}
+NAMES = tuple(BACKENDS)
+
+
+# ============== READERS ==============
+
+
+def _dbf_table(filepath, encoding: str | None):
+    from dbfread import DBF
+
+    encoding = encoding or dbase.read_header(filepath).encoding
+    return DBF(str(filepath), encoding=encoding, ignore_missing_memofile=True)
+
+
+def _dbfread_frame(filepath, header, io_config, encoding, categorical, progress, cores):
+    import pandas as pd
+
+    return pd.DataFrame(iter(_dbf_table(filepath, encoding)))
+
+
+def _dbfread_rows(filepath, header, io_config, encoding, cores):
+    table = _dbf_table(filepath, encoding)
+    return list(table.field_names), (tuple(r.values()) for r in table)
+
+
+def _manual_frame(filepath, header, io_config, encoding, categorical, progress, cores):
+    import pandas as pd
+
+    columns = [[] for _ in header.fields]
+    done = 0
+    for chunk in dbase.iter_column_chunks(filepath, header, io_config, encoding):
+        for column, values in zip(columns, chunk):
+            column.extend(values)
+        done += len(chunk[0]) if chunk else 0
+        if progress:
+            progress(done, header.num_records)
+    return pd.DataFrame(dict(zip(header.field_names, columns)))
+
+
+def _manual_rows(filepath, header, io_config, encoding, cores):
+    return header.field_names, dbase.iter_rows(filepath, header, io_config, encoding)
+
+
+def _vectorized_frame(
+    filepath, header, io_config, encoding, categorical, progress, cores
+):
+    import columnar
+
+    table = columnar.load_dbase(filepath, header, io_config, encoding, progress)
+    return table.to_pandas(categorical)
+
+
+def _vectorized_rows(filepath, header, io_config, encoding, cores):
+    import columnar
+
+    def rows():
+        for chunk in dbase.iter_record_chunks(filepath, header, io_config):
+            columns = columnar.decode_chunk(chunk, header, encoding)
+            yield from zip(*(c.tolist() for c in columns))
+
+    return header.field_names, rows()
+
+
+def decode_range(
+    filepath: Path | str,
+    header: dbase.DbfHeader,
+    start: int,
+    stop: int,
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+) -> tuple[list, int]:
+    """Decode record [start, stop) di proses worker: (array per field, jumlah)"""
+    import numpy as np
+
+    import columnar
+
+    parts = [[] for _ in header.fields]
+    count = 0
+    for chunk in dbase.iter_record_chunks(filepath, header, io_config, start, stop):
+        for part, column in zip(parts, columnar.decode_chunk(chunk, header, encoding)):
+            part.append(column)
+        count += len(chunk) // header.record_size
+    return [np.concatenate(p) if p else np.array([], dtype="U1") for p in parts], count
+
+
+def _ranges(
+    header: dbase.DbfHeader, workers: int, io_config: blockio.IOConfig | None = None
+) -> list[tuple[int, int]]:
+    step = max(PARALLEL_RANGE, -(-header.num_records // (workers * 4)))
+    if io_config and io_config.max_memory:
+        # Hasil 2 x workers rentang ditahan sekaligus (lihat _parallel_parts)
+        fits = io_config.max_memory // (2 * workers * header.decoded_size)
+        step = max(1, min(step, fits))
+    return [
+        (start, min(start + step, header.num_records))
+        for start in range(0, header.num_records, step)
+    ]
+
+
+def _parallel_parts(filepath, header, io_config, encoding, cores) -> Iterator[list]:
+    """Array per field untuk setiap rentang, berurutan
+
+    Paling banyak 2 x workers rentang dikerjakan sekaligus, jadi memori tetap
+    terbatas saat hasilnya dialirkan.
+    """
+    workers = max(1, min(cores or os.cpu_count() or 1, MAX_PARALLEL_WORKERS))
+    workers = blockio.budget_workers(io_config, workers)
+    pending = []
+    ranges = iter(_ranges(header, workers, io_config))
+    io_config = blockio.share_memory(io_config, workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+
+        def submit():
+            job = next(ranges, None)
+            if job is not None:
+                args = (filepath, header, *job, io_config, encoding)
+                pending.append((job[1] - job[0], pool.submit(decode_range, *args)))
+
+        for _ in range(workers * 2):
+            submit()
+        while pending:
+            expected, future = pending.pop(0)
+            arrays, count = future.result()
+            yield arrays
+            # EOF (0x1A) atau file terpotong di rentang ini: sisanya bukan data,
+            # sama seperti pembacaan berurutan
+            if count < expected:
+                for _, rest in pending:
+                    rest.cancel()
+                return
+            submit()
+
+
+def _parallel_frame(
+    filepath, header, io_config, encoding, categorical, progress, cores
+):
+    import numpy as np
+    import pandas as pd
+
+    parts = [[] for _ in header.fields]
+    done = 0
+    for arrays in _parallel_parts(filepath, header, io_config, encoding, cores):
+        for part, array in zip(parts, arrays):
+            part.append(array)
+        done += len(arrays[0]) if arrays else 0
+        if progress:
+            progress(done, header.num_records)
+    return pd.DataFrame(
+        {
+            f.name: pd.Series(np.concatenate(p) if p else np.array([], dtype="U1"))
+            for f, p in zip(header.fields, parts)
+        }
+    )
+
+
+def _parallel_rows(filepath, header, io_config, encoding, cores):
+    def rows():
+        for arrays in _parallel_parts(filepath, header, io_config, encoding, cores):
+            yield from zip(*(a.tolist() for a in arrays))
+
+    return header.field_names, rows()
+
+
+_FRAME_READERS = {
+    "dbfread": _dbfread_frame,
+    "manual": _manual_frame,
+    "vectorized": _vectorized_frame,
+    "parallel": _parallel_frame,
+}
+_ROW_READERS = {
+    "dbfread": _dbfread_rows,
+    "manual": _manual_rows,
+    "vectorized": _vectorized_rows,
+    "parallel": _parallel_rows,
+}
+
+
+# ============== PROFIL & PEMILIHAN ==============
+
+
+@dataclass
+class Profile:
+    """Throughput (byte/detik) dan overhead (detik) per backend dan mode"""
+
+    backends: dict[str, dict[str, tuple[float, float]]]
+    created: str | None = None  # None = profil bawaan
+    cpu_count: int = 1
+
+    def estimate(self, name: str, mode: str, size: int, cores: int) -> float:
+        throughput, overhead = self.backends[name][mode]
+        if BACKENDS[name].parallel:
+            throughput *= min(cores, MAX_PARALLEL_WORKERS)
+        return overhead + size / max(throughput, 1.0)
+
+    @property
+    def source(self) -> str:
+        if self.created is None:
+            return "profil bawaan (jalankan 'exporter.py calibrate')"
+        return f"profil kalibrasi {self.created}"
+
+
+def default_profile() -> Profile:
+    return Profile({name: dict(modes) for name, modes in DEFAULT_PROFILE.items()})
+
+
+def load_profile(path: Path | None = None) -> Profile:
+    """Profil kalibrasi host ini; bawaan jika belum ada atau jumlah core berubah"""
+    path = path or PROFILE_PATH
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data["cpu_count"] != (os.cpu_count() or 1):
+            return default_profile()
+        backends = default_profile().backends
+        for name, modes in data["backends"].items():
+            if name in backends:
+                backends[name].update({m: tuple(v) for m, v in modes.items()})
+        return Profile(backends, data["created"], data["cpu_count"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return default_profile()
+
+
+def save_profile(profile: Profile, path: Path | None = None):
+    path = Path(path or PROFILE_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "created": profile.created,
+        "cpu_count": profile.cpu_count,
+        "platform": platform.platform(),
+        "backends": profile.backends,
+    }
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+@dataclass
+class Choice:
+    """Backend terpilih, perkiraan waktu kandidat dan alasan pemilihan"""
+
+    backend: Backend
+    estimates: dict[str, float] = field(default_factory=dict)
+    reasons: list[str] = field(default_factory=list)
+
+    def describe(self) -> list[str]:
+        lines = [f"Backend: {self.backend.name} ({self.backend.description})"]
+        if self.estimates:
+            ranked = sorted(self.estimates.items(), key=lambda item: item[1])
+            lines.append("Perkiraan: " + ", ".join(f"{n} {t:.2f} s" for n, t in ranked))
+        lines += self.reasons
+        return lines
+
+
+def has_memo(filepath, header: dbase.DbfHeader) -> bool:
+    """Ada field memo dan file .DBT pendampingnya (isi memo bisa dibaca)"""
+    if not blockio.is_path(filepath) or not any(f.type == "M" for f in header.fields):
+        return False
+    path = Path(filepath)
+    return any(path.with_suffix(s).exists() for s in (".DBT", ".dbt"))
+
+
+def _unsupported(
+    backend: Backend, filepath, cores: int, categorical: bool, memo: bool
+) -> str | None:
+    """Alasan backend tidak bisa dipakai untuk file ini, None jika bisa"""
+    if not backend.available():
+        return f"modul {backend.module} tidak terpasang"
+    if backend.needs_path and not blockio.is_path(filepath):
+        return "butuh file biasa (bukan anggota arsip)"
+    if backend.parallel and cores < 2:
+        return f"hanya {cores} core tersedia"
+    if categorical and not backend.categorical:
+        return "tidak mendukung kolom kategori"
+    if memo and not backend.memo:
+        return "tidak membaca isi memo (.DBT)"
+    return None
+
+
+def choose(
+    filepath,
+    header: dbase.DbfHeader | None = None,
+    mode: str = "frame",
+    requested: str = AUTO,
+    cores: int | None = None,
+    categorical: bool = False,
+    profile: Profile | None = None,
+) -> Choice:
+    """Pilih backend untuk satu file
+
+    Otomatis: backend dengan perkiraan waktu terkecil (overhead + ukuran /
+    throughput dari profil) di antara yang mendukung file ini. Backend bertipe
+    (dbfread) hanya dipilih otomatis untuk field memo, karena nilainya bukan
+    teks seperti backend lain.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Mode tidak dikenal: {mode}")
+    header = header or dbase.read_header(filepath)
+    cores = cores or os.cpu_count() or 1
+    memo = has_memo(filepath, header)
+
+    if requested != AUTO:
+        if requested not in BACKENDS:
+            raise ValueError(f"Backend tidak dikenal: {requested}")
+        backend = BACKENDS[requested]
+        reason = _unsupported(backend, filepath, cores, categorical, False)
+        if reason:
+            raise ValueError(f"Backend {requested}: {reason}")
+        return Choice(backend, reasons=["Dipilih manual (--backend)"])
+
+    profile = profile or load_profile()
+    size = blockio.source_size(filepath)
+    reasons = []
+    estimates = {}
+    if memo and not any(
+        b.memo and not _unsupported(b, filepath, cores, categorical, memo)
+        for b in BACKENDS.values()
+    ):
+        reasons.append("Field memo: tidak ada backend yang bisa membaca isinya")
+        memo = False
+    for backend in BACKENDS.values():
+        reason = _unsupported(backend, filepath, cores, categorical, memo)
+        if reason is None and backend.typed and not memo:
+            reason = "hasil bertipe (angka/tanggal), hanya otomatis untuk memo"
+        if reason:
+            reasons.append(f"  {backend.name} dilewati: {reason}")
+            continue
+        estimates[backend.name] = profile.estimate(backend.name, mode, size, cores)
+
+    if not estimates:
+        raise ValueError("Tidak ada backend yang mendukung file ini")
+    if memo:
+        reasons.insert(0, "Ada field memo dengan file .DBT")
+    reasons.append(f"{size / MB:,.1f} MB, {cores} core, {profile.source}")
+    return Choice(BACKENDS[min(estimates, key=estimates.get)], estimates, reasons)
+
+
+# ============== KALIBRASI ==============
+
+
+def write_sample(path: Path | str, records: int):
+    """Tulis file dBase III sintetis untuk kalibrasi"""
+    fields = CALIBRATION_FIELDS
+    record_size = 1 + sum(length for _, _, length, _ in fields)
+    header_size = 32 + 32 * len(fields) + 1
+    today = datetime.now()
+    header = struct.pack(
+        "<4BIHH20x",
+        0x03,
+        today.year - 1900,
+        today.month,
+        today.day,
+        records,
+        header_size,
+        record_size,
+    )
+    for name, ftype, length, decimals in fields:
+        header += (
+            name.encode().ljust(11, b"\x00")
+            + ftype.encode()
+            + bytes(4)
+            + bytes([length, decimals])
+            + bytes(14)
+        )
+    header += dbase.HEADER_TERMINATOR
+
+    with open(path, "wb") as f:
+        f.write(header)
+        # Ditulis per 10.000 record agar memori tetap kecil
+        f.writelines(
+            b"".join(
+                b" %-10s%-24s%8d%12.2f%8s%1s"
+                % (
+                    b"P%07d" % (i % 3000),
+                    b"Barang contoh %d" % i,
+                    i % 1000,
+                    i * 1.25,
+                    b"2024%02d%02d" % (i % 12 + 1, i % 28 + 1),
+                    b"TF"[i % 2 : i % 2 + 1],
+                )
+                for i in range(start, min(start + 10_000, records))
+            )
+            for start in range(0, records, 10_000)
+        )
+        f.write(dbase.EOF_MARKER)
+
+
+def _run(backend: Backend, mode: str, path: Path, cores: int) -> float:
+    header = dbase.read_header(path)
+    started = time.perf_counter()
+    if mode == "frame":
+        backend.frame(path, header, cores=cores)
+    else:
+        for _ in backend.rows(path, header, cores=cores)[1]:
+            pass
+    return time.perf_counter() - started
+
+
+def calibrate(
+    records: int = CALIBRATION_RECORDS,
+    workdir: Path | str | None = None,
+    progress=None,
+) -> Profile:
+    """Ukur throughput dan overhead setiap backend yang tersedia di host ini
+
+    Setiap backend membaca file kecil dan file besar sintetis; overhead dan
+    throughput diturunkan dari dua titik ukur itu (waktu = overhead + ukuran /
+    throughput). Backend parallel diukur per core.
+    """
+    cores = os.cpu_count() or 1
+    profile = default_profile()
+    profile.created = datetime.now().isoformat(timespec="seconds")
+    profile.cpu_count = cores
+
+    with tempfile.TemporaryDirectory(prefix="datexp_", dir=workdir) as tmp:
+        tiny, big = Path(tmp) / "TINY.DTA", Path(tmp) / "BIG.DTA"
+        write_sample(tiny, CALIBRATION_TINY)
+        write_sample(big, records)
+        tiny_size, big_size = tiny.stat().st_size, big.stat().st_size
+
+        for backend in BACKENDS.values():
+            if _unsupported(backend, big, cores, False, False):
+                continue
+            for mode in MODES:
+                # Putaran pertama memanaskan impor modul dan cache file
+                t_tiny = min(_run(backend, mode, tiny, cores) for _ in range(2))
+                t_big = _run(backend, mode, big, cores)
+                throughput = (big_size - tiny_size) / max(t_big - t_tiny, 1e-6)
+                overhead = max(t_tiny - tiny_size / throughput, 0.0)
+                if backend.parallel:
+                    throughput /= min(cores, MAX_PARALLEL_WORKERS)
+                profile.backends[backend.name][mode] = (throughput, overhead)
+                if progress:
+                    progress(backend.name, mode, throughput, overhead)
+    return profile
@@ -0,0 +1,272 @@
+"""
+Mode batch berbasis manifest dengan checkpoint per file (bisa dilanjutkan)
+Manifest JSON berisi pola input, opsi per kelompok file dan pola nama output.
+Setiap file diekspor terpisah di worker pool dan ditulis secara atomik; file
+yang selesai dicatat di jurnal checkpoint sehingga run ulang melewatinya.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import glob
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import archive
+import backends
+import blockio
+import dbase
+import exporter
+
+FORMATS = ("csv", "xlsx")
+DEFAULT_OUTPUT = "{stem}.{format}"
+CHECKPOINT_SUFFIX = ".checkpoint.jsonl"
+# Opsi yang boleh ada di "defaults" dan setiap entri "jobs"
+JOB_OPTIONS = ("format", "output", "encoding", "backend")
+
+
+@dataclass(frozen=True)
+class Task:
+    """Satu file input dan output-nya"""
+
+    input: Path | archive.ArchiveMember
+    output: Path
+    format: str = "csv"
+    encoding: str | None = None
+    backend: str = backends.AUTO
+
+
+@dataclass
+class TaskResult:
+    task: Task
+    rows: int = 0
+    error: str | None = None
+    log: str = ""
+
+
+def _expand_pattern(pattern: str, base: Path) -> list:
+    """File yang cocok dengan pola glob (relatif ke folder manifest)"""
+    path = Path(pattern)
+    if not path.is_absolute():
+        path = base / path
+    matches = sorted(glob.glob(str(path), recursive=True))
+    return archive.expand([Path(m) for m in matches if Path(m).is_file()])
+
+
+def _parent_name(source) -> str:
+    if isinstance(source, archive.ArchiveMember):
+        return source.archive.stem
+    return source.parent.name
+
+
+def load_manifest(path: Path | str) -> list[Task]:
+    """Baca manifest dan ekspansi pola input menjadi daftar Task
+
+    Format:
+        {"output_dir": "hasil",
+         "defaults": {"format": "csv", "encoding": null, "backend": "auto"},
+         "jobs": [{"input": "arsip/*/TJUAL.DTA", "output": "{parent}_{stem}.csv"},
+                  {"input": ["2023/*.zip"], "format": "xlsx"}]}
+
+    Pola output memakai {stem}, {name}, {parent} dan {format}. Output yang
+    bertabrakan ditolak agar tidak ada file yang saling menimpa.
+    """
+    path = Path(path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except ValueError as e:
+        raise ValueError(f"Manifest {path.name} bukan JSON valid: {e}")
+
+    base = path.parent
+    output_dir = base / manifest.get("output_dir", ".")
+    defaults = manifest.get("defaults", {})
+    tasks = []
+    for i, job in enumerate(manifest.get("jobs", []), 1):
+        unknown = set(job) - {"input", *JOB_OPTIONS}
+        if unknown or "input" not in job:
+            raise ValueError(
+                f"Manifest job {i}: butuh 'input', opsi yang dikenal: "
+                f"{', '.join(JOB_OPTIONS)}"
+            )
+        options = {**defaults, **job}
+        fmt = options.get("format", "csv")
+        if fmt not in FORMATS:
+            raise ValueError(f"Manifest job {i}: format {fmt} tidak didukung")
+        backend = options.get("backend", backends.AUTO)
+        if backend != backends.AUTO and backend not in backends.BACKENDS:
+            raise ValueError(f"Manifest job {i}: backend {backend} tidak dikenal")
+        encoding = options.get("encoding")
+        if encoding:
+            try:
+                encoding = dbase.check_encoding(encoding)
+            except LookupError:
+                raise ValueError(f"Manifest job {i}: encoding {encoding} tidak dikenal")
+
+        patterns = job["input"]
+        for pattern in [patterns] if isinstance(patterns, str) else patterns:
+            for source in _expand_pattern(pattern, base):
+                output = options.get("output", DEFAULT_OUTPUT).format(
+                    stem=source.stem,
+                    name=source.name,
+                    parent=_parent_name(source),
+                    format=fmt,
+                )
+                tasks.append(Task(source, output_dir / output, fmt, encoding, backend))
+
+    seen = {}
+    for task in tasks:
+        other = seen.setdefault(task.output, task)
+        if other is not task:
+            raise ValueError(
+                f"Output {task.output} dipakai oleh {other.input} dan {task.input} "
+                "(tambahkan {parent} di pola output)"
+            )
+    return tasks
+
+
+def source_stamp(source) -> list:
+    """Identitas isi input untuk checkpoint: ukuran dan mtime (arsip: file arsip)"""
+    path = source.archive if isinstance(source, archive.ArchiveMember) else source
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class Checkpoint:
+    """Jurnal JSONL file yang sudah selesai (satu baris per file)
+
+    Baris ditambahkan dan di-fsync setelah output di-rename, jadi baris yang
+    tercatat selalu berarti output lengkap. Baris terakhir yang terpotong
+    (proses mati saat menulis) diabaikan; file itu diekspor ulang.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.done: dict[str, dict] = {}
+        if not self.path.exists():
+            return
+        text = self.path.read_text(encoding="utf-8", errors="replace")
+        for line in text.splitlines():
+            try:
+                entry = json.loads(line)
+                self.done[entry["output"]] = entry
+            except (ValueError, KeyError, TypeError):
+                continue
+        if text and not text.endswith("\n"):
+            # Tutup baris terpotong agar catatan berikutnya tidak ikut rusak
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n")
+
+    def is_done(self, task: Task) -> bool:
+        """Selesai sebelumnya, input tidak berubah dan output masih ada"""
+        entry = self.done.get(str(task.output))
+        try:
+            return (
+                entry is not None
+                and entry["input"] == str(task.input)
+                and entry["stamp"] == source_stamp(task.input)
+                and task.output.exists()
+            )
+        except OSError:
+            return False
+
+    def record(self, task: Task, rows: int):
+        entry = {
+            "input": str(task.input),
+            "output": str(task.output),
+            "stamp": source_stamp(task.input),
+            "rows": rows,
+            "finished": datetime.now().isoformat(timespec="seconds"),
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.done[entry["output"]] = entry
+
+    def reset(self):
+        self.path.unlink(missing_ok=True)
+        self.done.clear()
+
+
+def checkpoint_path(manifest: Path | str) -> Path:
+    manifest = Path(manifest)
+    return manifest.with_name(manifest.stem + CHECKPOINT_SUFFIX)
+
+
+def run_task(
+    task: Task,
+    io_config: blockio.IOConfig | None = None,
+    read_options: backends.ReadOptions | None = None,
+) -> TaskResult:
+    """Ekspor satu Task (dijalankan di proses worker)"""
+    read_options = dataclasses.replace(
+        read_options or backends.ReadOptions(), backend=task.backend
+    )
+    result = TaskResult(task)
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        try:
+            task.output.parent.mkdir(parents=True, exist_ok=True)
+            result.rows = exporter.convert_file(
+                task.input,
+                task.output,
+                task.format,
+                io_config,
+                task.encoding,
+                read_options,
+            )
+        except blockio.READ_ERRORS as e:
+            result.error = str(e) or type(e).__name__
+    result.log = log.getvalue()
+    return result
+
+
+def run(
+    tasks: list[Task],
+    checkpoint: Checkpoint,
+    workers: int | None = None,
+    io_config: blockio.IOConfig | None = None,
+    read_options: backends.ReadOptions | None = None,
+    progress=None,
+) -> list[TaskResult]:
+    """Jalankan Task yang belum selesai; checkpoint dicatat begitu tiap file selesai
+
+    progress(result) dipanggil di proses utama untuk setiap file, sesuai urutan
+    selesai (bukan urutan manifest).
+    """
+    pending = [task for task in tasks if not checkpoint.is_done(task)]
+    read_options = exporter.job_options(len(pending), workers, read_options, io_config)
+    workers = exporter.job_workers(len(pending), workers, io_config)
+    io_config = exporter.job_config(len(pending), workers, io_config)
+
+    def finish(result: TaskResult):
+        if result.error is None:
+            checkpoint.record(result.task, result.rows)
+        if progress:
+            progress(result)
+        return result
+
+    if workers <= 1 or len(pending) <= 1:
+        return [finish(run_task(task, io_config, read_options)) for task in pending]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(run_task, task, io_config, read_options) for task in pending
+        ]
+        try:
+            for future in as_completed(futures):
+                results.append(finish(future.result()))
+        except BaseException:
+            # Dihentikan (Ctrl+C): batalkan antrian, yang selesai sudah tercatat
+            for future in futures:
+                future.cancel()
+            raise
+    return results
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark waktu startup CLI dan waktu import modul
+Setiap skenario dijalankan di proses Python baru agar cache import tidak ikut terukur.
+
+    uv run benchmarks/bench_startup.py [--repeat 10]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "python (baseline)": ["-c", "pass"],
+    "import exporter": ["-c", "import exporter"],
+    "exporter.py --help": [str(ROOT / "exporter.py"), "--help"],
+    "import app": ["-c", "import app"],
+    "import pandas": ["-c", "import pandas"],
+}
+
+# Modul berat yang tidak boleh ikut terimpor oleh `import exporter` / `import app`
+HEAVY_MODULES = ["pandas", "numpy", "dbfread", "gradio", "openpyxl"]
+
+
+def time_scenario(args: list[str], repeat: int) -> list[float]:
+    """Waktu (detik) setiap run dari satu skenario"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args],
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def heavy_imports(module: str) -> list[str]:
+    """Modul berat yang ikut terimpor saat `module` diimpor"""
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return [m for m in out.stdout.strip().split(",") if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark waktu startup")
+    parser.add_argument("--repeat", type=int, default=10, help="Jumlah run")
+    args = parser.parse_args()
+
+    print(f"{'Skenario':<24} {'median':>10} {'min':>10}")
+    print("-" * 46)
+    for name, scenario in SCENARIOS.items():
+        try:
+            timings = time_scenario(scenario, args.repeat)
+        except subprocess.CalledProcessError:
+            print(f"{name:<24} {'gagal':>10}")
+            continue
+        median = statistics.median(timings) * 1000
+        best = min(timings) * 1000
+        print(f"{name:<24} {median:>8.1f}ms {best:>8.1f}ms")
+
+    print()
+    for module in ("exporter", "app"):
+        heavy = heavy_imports(module)
+        print(f"Modul berat saat import {module}: {', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
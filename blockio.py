@@ -0,0 +1,332 @@
+"""
+Lapisan I/O blok besar untuk file DAT/DTA
+Dioptimalkan untuk share jaringan (SMB) dengan latensi tinggi: baca sekuensial
+dalam blok besar, read-ahead di thread terpisah, dan opsi salin ke lokal dulu.
+"""
+
+import dataclasses
+import os
+import queue
+import re
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+MB = 1024 * 1024
+
+DEFAULT_BLOCK_SIZE = 8 * MB
+DEFAULT_READAHEAD = 2
+
+# Ukuran sampel untuk mengukur throughput sumber
+PROBE_SIZE = 4 * MB
+# Di bawah throughput ini (byte/detik) file disalin ke scratch lokal dulu
+LOCAL_COPY_THRESHOLD = 40 * MB
+
+STRATEGIES = ("auto", "direct", "local")
+
+# Blok terkecil saat diperkecil oleh max_memory
+MIN_BLOCK_SIZE = 64 * 1024
+# Perkiraan memori satu proses worker (interpreter, numpy, buffer output)
+WORKER_MEMORY = 64 * MB
+SIZE_UNITS = {"": MB, "K": 1024, "M": MB, "G": 1024 * MB}
+
+# Error yang wajar saat membaca satu sumber: file hilang/terkunci, isi rusak atau
+# terpotong (termasuk arsip .zip/.gz rusak); error lain tetap diteruskan
+READ_ERRORS = (OSError, ValueError, EOFError, zipfile.BadZipFile, zlib.error)
+
+
+@dataclass
+class IOConfig:
+    """Konfigurasi pembacaan file"""
+
+    block_size: int = DEFAULT_BLOCK_SIZE
+    readahead: int = DEFAULT_READAHEAD
+    strategy: str = "direct"
+    scratch_dir: Path | None = None
+    max_memory: int | None = None  # Batas byte buffer baca + hasil decode
+
+
+def parse_size(value: str) -> int:
+    """'512M', '2G', '800K' -> byte; angka tanpa satuan dianggap MB"""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*", value, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Ukuran tidak valid: {value} (contoh: 512M, 2G)")
+    number, unit = match.groups()
+    return int(float(number) * SIZE_UNITS[unit.upper()])
+
+
+def fit_block_size(
+    config: IOConfig | None, record_size: int, decoded_size: int
+) -> IOConfig | None:
+    """Perkecil blok agar buffer read-ahead + satu chunk hasil decode muat di max_memory
+
+    decoded_size adalah perkiraan byte satu record setelah di-decode; tanpa
+    max_memory config dikembalikan apa adanya.
+    """
+    if config is None or not config.max_memory or record_size <= 0:
+        return config
+    # Blok di antrian read-ahead, blok yang sedang di-decode, dan hasil decode-nya
+    per_record = (config.readahead + 1) * record_size + decoded_size
+    block_size = config.max_memory // per_record * record_size
+    block_size = max(MIN_BLOCK_SIZE, min(config.block_size, block_size))
+    return dataclasses.replace(config, block_size=block_size)
+
+
+def budget_workers(config: IOConfig | None, workers: int) -> int:
+    """Batasi jumlah proses agar setiap worker kebagian WORKER_MEMORY"""
+    if config is None or not config.max_memory:
+        return workers
+    return max(1, min(workers, config.max_memory // WORKER_MEMORY))
+
+
+def share_memory(config: IOConfig | None, parts: int) -> IOConfig | None:
+    """Config untuk satu dari parts proses yang berjalan bersamaan"""
+    if config is None or not config.max_memory or parts <= 1:
+        return config
+    return dataclasses.replace(config, max_memory=config.max_memory // parts)
+
+
+_SENTINEL = object()
+
+
+def is_path(source) -> bool:
+    """True untuk path file biasa (bukan anggota arsip atau file object)"""
+    return isinstance(source, (str, os.PathLike))
+
+
+@contextmanager
+def open_source(source):
+    """File object biner di posisi 0 dari path, anggota arsip, atau file object
+
+    Path dibuka tanpa buffer; anggota arsip (punya open()) dibuka sebagai stream
+    dekompresi; file object yang sudah terbuka dipakai apa adanya (tidak ditutup).
+    """
+    if is_path(source):
+        with open(source, "rb", buffering=0) as f:
+            yield f
+    elif hasattr(source, "read"):
+        source.seek(0)
+        yield source
+    else:
+        with source.open() as f:
+            yield f
+
+
+def source_size(source) -> int:
+    """Ukuran data (untuk arsip: ukuran setelah dekompresi)"""
+    if is_path(source):
+        return os.path.getsize(source)
+    if hasattr(source, "fileno"):
+        return os.fstat(source.fileno()).st_size
+    return source.size
+
+
+class BlockReader:
+    """Membaca file secara sekuensial dalam blok besar dengan read-ahead"""
+
+    def __init__(
+        self,
+        filepath,
+        start: int = 0,
+        length: int | None = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        readahead: int = DEFAULT_READAHEAD,
+    ):
+        if block_size <= 0:
+            raise ValueError("block_size harus lebih dari 0")
+        self.filepath = Path(filepath) if is_path(filepath) else filepath
+        self.start = start
+        self.length = length
+        self.block_size = block_size
+        self.readahead = readahead
+        self._queue: queue.Queue | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _blocks(self):
+        """Generator blok dari disk (tanpa thread)"""
+        remaining = self.length
+        with open_source(self.filepath) as f:
+            if self.start:
+                f.seek(self.start)
+            while remaining is None or remaining > 0:
+                size = self.block_size
+                if remaining is not None:
+                    size = min(size, remaining)
+                block = f.read(size)
+                if not block:
+                    break
+                if remaining is not None:
+                    remaining -= len(block)
+                yield block
+
+    def _put(self, item) -> bool:
+        """Masukkan item ke antrian; False jika reader sudah dihentikan"""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _producer(self):
+        try:
+            for block in self._blocks():
+                if not self._put(block):
+                    return
+            self._put(_SENTINEL)
+        except Exception as e:  # diteruskan ke consumer
+            self._put(e)
+
+    def __iter__(self):
+        if self.readahead <= 0:
+            yield from self._blocks()
+            return
+
+        self._queue = queue.Queue(maxsize=self.readahead)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._producer, daemon=True)
+        self._thread.start()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _SENTINEL:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            self.close()
+
+    def close(self):
+        """Hentikan thread read-ahead"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_record_chunks(
+    filepath: Path | str,
+    offset: int,
+    record_size: int,
+    count: int | None = None,
+    config: IOConfig | None = None,
+):
+    """Yield potongan bytes berisi record utuh (kelipatan record_size)"""
+    config = config or IOConfig()
+    if record_size <= 0:
+        return
+    length = count * record_size if count is not None else None
+    # Blok dibulatkan ke kelipatan record agar jarang ada sisa
+    block_size = max(record_size, config.block_size // record_size * record_size)
+
+    carry = b""
+    reader = BlockReader(
+        filepath,
+        start=offset,
+        length=length,
+        block_size=block_size,
+        readahead=config.readahead,
+    )
+    for block in reader:
+        if carry:
+            block = carry + block
+            carry = b""
+        usable = len(block) // record_size * record_size
+        if usable < len(block):
+            carry = block[usable:]
+            block = block[:usable]
+        if block:
+            yield block
+
+
+def read_all(filepath: Path | str, config: IOConfig | None = None) -> bytearray:
+    """Baca seluruh file memakai blok besar (bukan satu read() tanpa batas)"""
+    config = config or IOConfig()
+    buf = bytearray()
+    for block in BlockReader(
+        filepath, block_size=config.block_size, readahead=config.readahead
+    ):
+        buf += block
+    return buf
+
+
+def measure_throughput(filepath: Path | str, probe_size: int = PROBE_SIZE) -> float:
+    """Ukur throughput baca sekuensial (byte/detik) dari awal file"""
+    start = time.perf_counter()
+    total = 0
+    with open(filepath, "rb", buffering=0) as f:
+        while total < probe_size:
+            block = f.read(min(MB, probe_size - total))
+            if not block:
+                break
+            total += len(block)
+    elapsed = time.perf_counter() - start
+    if total == 0:
+        return float("inf")
+    return total / max(elapsed, 1e-9)
+
+
+def choose_strategy(filepath: Path | str, config: IOConfig) -> str:
+    """Tentukan 'direct' atau 'local' untuk file ini"""
+    if config.strategy != "auto":
+        return config.strategy
+    size = Path(filepath).stat().st_size
+    # File kecil tidak perlu disalin
+    if size <= PROBE_SIZE:
+        return "direct"
+    throughput = measure_throughput(filepath)
+    return "local" if throughput < LOCAL_COPY_THRESHOLD else "direct"
+
+
+@contextmanager
+def staged(filepath: Path | str, config: IOConfig | None = None):
+    """Context manager: yield path yang siap dibaca (asli atau salinan lokal)
+
+    Anggota arsip dikembalikan apa adanya: stream dekompresi sudah sekuensial.
+    """
+    config = config or IOConfig()
+    if config.strategy not in STRATEGIES:
+        raise ValueError(f"Strategi I/O tidak dikenal: {config.strategy}")
+    if not is_path(filepath):
+        yield filepath
+        return
+    path = Path(filepath)
+
+    if choose_strategy(path, config) == "direct":
+        yield path
+        return
+
+    scratch = tempfile.mkdtemp(prefix="datexp_", dir=config.scratch_dir)
+    local_path = Path(scratch) / path.name
+    try:
+        with open(path, "rb") as src, open(local_path, "wb") as dst:
+            shutil.copyfileobj(src, dst, length=config.block_size)
+        yield local_path
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def config_from_args(args) -> IOConfig:
+    """Bangun IOConfig dari argumen CLI"""
+    return IOConfig(
+        block_size=int(args.block_size * MB),
+        readahead=args.readahead,
+        strategy=args.io_strategy,
+        scratch_dir=Path(args.scratch_dir) if args.scratch_dir else None,
+        max_memory=args.max_memory,
+    )
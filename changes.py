@@ -0,0 +1,408 @@
+"""
+Change data capture antar dua snapshot tabel yang sama (hash per blok record)
+Record dikelompokkan ke blok berukuran tetap dan setiap blok di-hash; hash
+disimpan di sidecar JSON sehingga snapshot lama tidak perlu dibaca ulang. Hanya
+blok yang hash-nya berbeda yang dibaca dan di-decode menjadi record baru/ubah/hapus.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import blockio
+import dbase
+import formats
+import stock
+
+# Record per blok hash: kecil = baca ulang lebih sedikit, sidecar lebih besar
+BLOCK_RECORDS = 1024
+DIGEST_SIZE = 16
+SIDECAR_SUFFIX = ".blocks.json"
+SIDECAR_VERSION = 1
+# Cukup untuk menemukan dua barcode pertama STOCK1.DAT
+PROBE_BYTES = 4096
+
+INSERTED = "BARU"
+UPDATED = "UBAH"
+DELETED = "HAPUS"
+CHANGE_COLUMNS = ["PERUBAHAN", "RECNO"]
+
+
+@dataclass(frozen=True)
+class Layout:
+    """Letak record di file: offset data, ukuran dan jumlah record, struktur"""
+
+    format: str
+    start: int
+    record_size: int
+    count: int
+    columns: tuple[str, ...]
+    schema: str
+    header: dbase.DbfHeader | None = field(default=None, compare=False)
+    stock_layout: stock.StockLayout | None = field(default=None, compare=False)
+
+    def key(self) -> list:
+        """Pembanding untuk validasi sidecar"""
+        return [self.format, self.start, self.record_size, self.count, self.schema]
+
+
+def read_layout(filepath, stock_layout: stock.StockLayout | None = None) -> Layout:
+    """Layout file dBase III atau STOCK1.DAT (format lain tidak didukung)
+
+    stock_layout menentukan field STOCK1.DAT (default stock.DEFAULT_LAYOUT).
+    Hash blok hanya bergantung pada letak record, jadi tidak ikut di schema.
+    """
+    size = blockio.source_size(filepath)
+    with blockio.open_source(filepath) as f:
+        probe = f.read(PROBE_BYTES)
+    version = probe[0] if probe else None
+    fmt = formats.detect_format(filepath.name, version)
+
+    if fmt == "stock":
+        stock_layout = stock_layout or stock.DEFAULT_LAYOUT
+        start = stock.find_start(probe)
+        record_size = stock_layout.record_size or stock.detect_record_size(probe, start)
+        count = stock.record_count(size, start, record_size)
+        return Layout(
+            fmt,
+            start,
+            record_size,
+            count,
+            tuple(stock_layout.columns),
+            f"stock:{record_size}",
+            stock_layout=stock_layout,
+        )
+    if fmt != "dbase3" and version not in (0x03, 0x83):
+        raise ValueError(f"Format {filepath.name} tidak didukung untuk diff")
+
+    header = dbase.read_header(filepath)
+    physical = max(size - header.header_size, 0) // max(header.record_size, 1)
+    schema = json.dumps([[f.name, f.type, f.length, f.decimals] for f in header.fields])
+    return Layout(
+        "dbase3",
+        header.header_size,
+        header.record_size,
+        min(header.num_records, physical),
+        tuple(header.field_names),
+        schema,
+        header,
+    )
+
+
+def sidecar_path(filepath: Path | str) -> Path:
+    filepath = Path(filepath)
+    return filepath.with_name(filepath.name + SIDECAR_SUFFIX)
+
+
+def _stamp(filepath: Path | str) -> list[int]:
+    stat = os.stat(filepath)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_hashes(filepath, layout: Layout, block_records: int) -> list[str] | None:
+    """Hash blok dari sidecar; None jika tidak ada atau file sudah berubah"""
+    if not blockio.is_path(filepath):
+        return None
+    try:
+        with open(sidecar_path(filepath), encoding="utf-8") as f:
+            saved = json.load(f)
+        valid = (
+            saved.get("version") == SIDECAR_VERSION
+            and saved.get("stamp") == _stamp(filepath)
+            and saved.get("layout") == layout.key()
+            and saved.get("block_records") == block_records
+        )
+    except (OSError, ValueError):
+        return None
+    return saved["hashes"] if valid else None
+
+
+def save_hashes(filepath, layout: Layout, block_records: int, hashes: list[str]):
+    """Simpan sidecar di samping file (dilewati jika folder tidak bisa ditulis)"""
+    if not blockio.is_path(filepath):
+        return
+    saved = {
+        "version": SIDECAR_VERSION,
+        "stamp": _stamp(filepath),
+        "layout": layout.key(),
+        "block_records": block_records,
+        "hashes": hashes,
+    }
+    target = sidecar_path(filepath)
+    temp = target.with_name(target.name + ".tmp")
+    try:
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(saved, f)
+        os.replace(temp, target)
+    except OSError:
+        pass
+
+
+def compute_hashes(
+    filepath,
+    layout: Layout,
+    block_records: int = BLOCK_RECORDS,
+    io_config: blockio.IOConfig | None = None,
+) -> list[str]:
+    """Hash setiap blok record (dibaca sekuensial dalam blok besar)"""
+    block_size = block_records * layout.record_size
+    hashes = []
+    pending = bytearray()
+    for chunk in blockio.iter_record_chunks(
+        filepath, layout.start, layout.record_size, layout.count, io_config
+    ):
+        pending += chunk
+        full = len(pending) // block_size * block_size
+        with memoryview(pending) as view:
+            hashes += [
+                hashlib.blake2b(
+                    view[pos : pos + block_size], digest_size=DIGEST_SIZE
+                ).hexdigest()
+                for pos in range(0, full, block_size)
+            ]
+        del pending[:full]
+    if pending:
+        hashes.append(hashlib.blake2b(pending, digest_size=DIGEST_SIZE).hexdigest())
+    return hashes
+
+
+def snapshot_hashes(
+    filepath,
+    layout: Layout,
+    block_records: int = BLOCK_RECORDS,
+    io_config: blockio.IOConfig | None = None,
+    save: bool = False,
+) -> tuple[list[str], bool]:
+    """(hash blok, dari sidecar?); hash baru disimpan ke sidecar jika save"""
+    hashes = load_hashes(filepath, layout, block_records)
+    if hashes is not None:
+        return hashes, True
+    stamp = _stamp(filepath) if blockio.is_path(filepath) else None
+    hashes = compute_hashes(filepath, layout, block_records, io_config)
+    # File yang berubah selama dibaca tidak disimpan (hash bisa campuran)
+    if save and stamp and stamp == _stamp(filepath):
+        save_hashes(filepath, layout, block_records, hashes)
+    return hashes, False
+
+
+def block_count(layout: Layout, block_records: int) -> int:
+    return -(-layout.count // block_records)
+
+
+def read_blocks(filepath, layout: Layout, blocks: list[int], block_records: int):
+    """Yield bytes blok terpilih, urut maju (stream arsip cukup seek maju)"""
+    block_size = block_records * layout.record_size
+    end = layout.start + layout.count * layout.record_size
+    with blockio.open_source(filepath) as f:
+        for index in blocks:
+            offset = layout.start + index * block_size
+            if offset >= end:
+                return
+            f.seek(offset)
+            yield f.read(min(block_size, end - offset))
+
+
+def _decoder(layout: Layout, encoding: str | None):
+    """Fungsi bytes blok -> list (terlihat?, nilai) per record"""
+    record_size = layout.record_size
+    if layout.format == "stock":
+        parse = layout.stock_layout.parse
+        raw = layout.stock_layout.raw
+
+        def decode(block: bytes) -> list[tuple[bool, tuple | None]]:
+            result = []
+            for pos in range(0, len(block), record_size):
+                values = parse(block[pos : pos + record_size], encoding)
+                if values and raw:
+                    # RAW_DATA sebagai hex di CSV perubahan
+                    values = (*values[:-1], values[-1].hex())
+                result.append((values is not None, values))
+            return result
+
+        return decode
+
+    header = layout.header
+    hidden = (dbase.DELETED_FLAG[0], dbase.EOF_MARKER[0])
+
+    def decode(block: bytes) -> list[tuple[bool, tuple | None]]:
+        rows = zip(*dbase.decode_columns(block, header, encoding))
+        return [
+            (flag not in hidden, row) for flag, row in zip(block[::record_size], rows)
+        ]
+
+    return decode
+
+
+@dataclass
+class DiffResult:
+    """Record yang berubah antar snapshot dan statistik blok yang dibaca"""
+
+    columns: list[str]
+    rows: list[tuple] = field(default_factory=list)
+    blocks: int = 0
+    changed_blocks: int = 0
+    cached: bool = False  # Hash snapshot lama diambil dari sidecar
+
+    def counts(self) -> dict[str, int]:
+        counts = dict.fromkeys([INSERTED, UPDATED, DELETED], 0)
+        for row in self.rows:
+            counts[row[0]] += 1
+        return counts
+
+
+def _changed_records(old, new, layouts, blocks, block_records, decode):
+    """Yield (posisi, (terlihat, nilai) lama, (terlihat, nilai) baru) per record beda
+
+    Blok lama dan baru dibaca bersamaan dan masing-masing di-decode sekali.
+    """
+    record_size = layouts[1].record_size
+    old_count, new_count = (block_count(lay, block_records) for lay in layouts)
+    old_blocks = read_blocks(old, layouts[0], blocks, block_records)
+    new_blocks = read_blocks(new, layouts[1], blocks, block_records)
+    missing = (False, None)
+    for index in blocks:
+        old_block = next(old_blocks) if index < old_count else b""
+        new_block = next(new_blocks) if index < new_count else b""
+        old_rows, new_rows = decode(old_block), decode(new_block)
+        for i in range(max(len(old_rows), len(new_rows))):
+            pos = i * record_size
+            if old_block[pos : pos + record_size] != new_block[pos : pos + record_size]:
+                yield (
+                    index * block_records + i,
+                    old_rows[i] if i < len(old_rows) else missing,
+                    new_rows[i] if i < len(new_rows) else missing,
+                )
+
+
+def diff(
+    old,
+    new,
+    block_records: int = BLOCK_RECORDS,
+    key: list[str] | None = None,
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+    snapshot_dir: Path | str | None = None,
+    stock_layout: stock.StockLayout | None = None,
+    cache_hashes: bool = False,
+) -> DiffResult:
+    """Bandingkan dua snapshot; hanya blok dengan hash berbeda yang di-decode
+
+    Tanpa key, record dicocokkan per posisi (RECNO): cocok untuk update di
+    tempat, append dan deletion flag. Dengan key (harus unik), record yang
+    berubah dicocokkan lewat nilai kolom kunci sehingga pack/urut ulang tidak
+    dilaporkan sebagai ubah. snapshot_dir menyimpan salinan snapshot baru beserta
+    sidecar-nya untuk diff berikutnya.
+
+    Diff hanya membaca: sidecar snapshot lama ditulis hanya jika snapshot itu
+    berada di snapshot_dir atau cache_hashes=True, bukan di folder data sumber.
+    """
+    save_old = cache_hashes or (
+        snapshot_dir is not None
+        and blockio.is_path(old)
+        and Path(old).resolve().parent == Path(snapshot_dir).resolve()
+    )
+    target = None
+    if snapshot_dir:
+        # Salin dulu: snapshot baru yang dibandingkan = salinan yang disimpan,
+        # walaupun file sumber ditulis program kasir selama diff berjalan
+        target = Path(snapshot_dir) / new.name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(target.name + ".tmp")
+        with blockio.open_source(new) as src, open(temp, "wb") as dst:
+            shutil.copyfileobj(src, dst, blockio.DEFAULT_BLOCK_SIZE)
+        new = temp
+
+    try:
+        old_layout = read_layout(old, stock_layout)
+        new_layout = read_layout(new, stock_layout)
+        if (old_layout.format, old_layout.record_size, old_layout.schema) != (
+            new_layout.format,
+            new_layout.record_size,
+            new_layout.schema,
+        ):
+            raise ValueError(
+                "Struktur record kedua snapshot berbeda; diff per blok tidak bisa "
+                "dipakai (ekspor ulang penuh)"
+            )
+        key_index = [_column_index(new_layout, name) for name in key or []]
+        encoding = encoding or (new_layout.header and new_layout.header.encoding)
+
+        old_hashes, cached = snapshot_hashes(
+            old, old_layout, block_records, io_config, save_old
+        )
+        new_hashes = compute_hashes(new, new_layout, block_records, io_config)
+        blocks = [
+            i
+            for i in range(max(len(old_hashes), len(new_hashes)))
+            if i >= len(old_hashes)
+            or i >= len(new_hashes)
+            or old_hashes[i] != new_hashes[i]
+        ]
+
+        result = DiffResult(
+            [*CHANGE_COLUMNS, *new_layout.columns],
+            blocks=len(new_hashes),
+            changed_blocks=len(blocks),
+            cached=cached,
+        )
+        decode = _decoder(new_layout, encoding)
+        changed = _changed_records(
+            old, new, (old_layout, new_layout), blocks, block_records, decode
+        )
+        if key_index:
+            result.rows = _keyed_changes(changed, key_index)
+        else:
+            result.rows = _positional_changes(changed)
+    except BaseException:
+        if target:
+            new.unlink(missing_ok=True)
+        raise
+
+    if target:
+        os.replace(new, target)
+        save_hashes(target, new_layout, block_records, new_hashes)
+    return result
+
+
+def _column_index(layout: Layout, name: str) -> int:
+    names = [c.upper() for c in layout.columns]
+    if name.upper() not in names:
+        raise ValueError(f"Kolom kunci {name} tidak ada di {', '.join(layout.columns)}")
+    return names.index(name.upper())
+
+
+def _positional_changes(changed) -> list[tuple]:
+    rows = []
+    for pos, (old_visible, old_values), (new_visible, new_values) in changed:
+        if old_visible and new_visible:
+            rows.append((UPDATED, pos + 1, *new_values))
+        elif new_visible:
+            rows.append((INSERTED, pos + 1, *new_values))
+        elif old_visible:
+            rows.append((DELETED, pos + 1, *old_values))
+    return rows
+
+
+def _keyed_changes(changed, key_index: list[int]) -> list[tuple]:
+    old_by_key, new_by_key = {}, {}
+    for pos, old, new in changed:
+        for (visible, values), by_key in ((old, old_by_key), (new, new_by_key)):
+            if visible:
+                by_key[tuple(values[i] for i in key_index)] = (pos, values)
+
+    rows = []
+    for key, (pos, values) in new_by_key.items():
+        old = old_by_key.pop(key, None)
+        if old is None:
+            rows.append((INSERTED, pos + 1, *values))
+        # Nilai sama di posisi lain: record hanya pindah (pack/urut ulang)
+        elif old[1] != values:
+            rows.append((UPDATED, pos + 1, *values))
+    for pos, values in old_by_key.values():
+        rows.append((DELETED, pos + 1, *values))
+    return rows
@@ -0,0 +1,438 @@
+"""
+Penyimpanan record kolumnar yang ringkas
+Pengganti list[dict]: satu array praalokasi per kolom (teks disimpan sebagai
+bytes lebar tetap), dikonversi ke pandas/Arrow tanpa salinan perantara.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+import blockio
+import dbase
+import stock
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# categorical="auto": kolom teks dijadikan kategori bila nilai unik pada
+# sampel <= rasio ini dari jumlah baris sampel
+AUTO_CATEGORY_RATIO = 0.1
+CATEGORY_SAMPLE = 65536
+# Baris per potongan saat iter_rows mengubah kolom menjadi nilai Python
+ROW_CHUNK = 65536
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """Definisi kolom: bytes lebar tetap (width) atau numerik (dtype)
+
+    Kolom bytes di-decode sebagai teks, kecuali binary=True (bytes apa adanya,
+    hex hanya untuk tampilan/output teks).
+    """
+
+    name: str
+    width: int = 0
+    dtype: str | None = None
+    binary: bool = False
+
+    @property
+    def is_text(self) -> bool:
+        return self.dtype is None and not self.binary
+
+    @property
+    def numpy_dtype(self) -> np.dtype:
+        if self.binary:
+            # V: byte NUL di akhir tetap ada (S memotongnya)
+            return np.dtype(f"V{max(self.width, 1)}")
+        if self.dtype is None:
+            return np.dtype(f"S{max(self.width, 1)}")
+        return np.dtype(self.dtype)
+
+
+class RowView:
+    """Tampilan satu baris tabel (tanpa dict per baris)"""
+
+    __slots__ = ("_index", "_table")
+
+    def __init__(self, table: ColumnarTable, index: int):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, name: str):
+        return self._table.value(name, self._index)
+
+    def __iter__(self):
+        for name in self._table.names:
+            yield self[name]
+
+    def __len__(self) -> int:
+        return len(self._table.names)
+
+    def __repr__(self) -> str:
+        return f"RowView({self.as_dict()!r})"
+
+    def as_dict(self) -> dict:
+        return {name: self[name] for name in self._table.names}
+
+
+class ColumnarTable:
+    """Tabel kolumnar dengan array praalokasi sebesar capacity"""
+
+    def __init__(
+        self,
+        specs: list[ColumnSpec],
+        capacity: int = 0,
+        encoding: str = dbase.DEFAULT_ENCODING,
+    ):
+        self.specs = specs
+        self.encoding = encoding
+        self._arrays = {s.name: np.empty(capacity, dtype=s.numpy_dtype) for s in specs}
+        self._length = 0
+
+    @property
+    def names(self) -> list[str]:
+        return [s.name for s in self.specs]
+
+    @property
+    def capacity(self) -> int:
+        return len(next(iter(self._arrays.values()))) if self._arrays else 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> RowView:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("index record di luar jangkauan")
+        return RowView(self, index)
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield RowView(self, i)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a[: self._length].nbytes for a in self._arrays.values())
+
+    def _reserve(self, needed: int):
+        """Perbesar array jika kapasitas kurang (mis. num_records di header salah)"""
+        if needed <= self.capacity:
+            return
+        new_capacity = max(needed, self.capacity * 2)
+        for name, array in self._arrays.items():
+            grown = np.empty(new_capacity, dtype=array.dtype)
+            grown[: self._length] = array[: self._length]
+            self._arrays[name] = grown
+
+    def append(self, columns: dict[str, np.ndarray]):
+        """Tambahkan satu chunk kolom (semua kolom harus sama panjang)"""
+        count = len(next(iter(columns.values()))) if columns else 0
+        self._reserve(self._length + count)
+        end = self._length + count
+        for name, values in columns.items():
+            self._arrays[name][self._length : end] = values
+        self._length = end
+
+    def raw(self, name: str) -> np.ndarray:
+        """Array mentah satu kolom (view, tanpa salinan)"""
+        return self._arrays[name][: self._length]
+
+    def spec(self, name: str) -> ColumnSpec:
+        return next(s for s in self.specs if s.name == name)
+
+    def value(self, name: str, index: int):
+        """Nilai satu sel (teks di-decode dan di-strip, binary sebagai bytes)"""
+        spec = self.spec(name)
+        value = self._arrays[name][index]
+        if spec.binary:
+            return value.tobytes()
+        if spec.is_text:
+            return value.decode(self.encoding, errors="replace").strip()
+        return value.item()
+
+    def text(self, name: str) -> np.ndarray:
+        """Decode satu kolom teks menjadi array str numpy (sudah di-strip)"""
+        return decode_text(self.raw(name), self.encoding)
+
+    def column(self, name: str) -> np.ndarray:
+        """Kolom siap pakai: teks sebagai array str, binary sebagai hex"""
+        spec = self.spec(name)
+        if spec.binary:
+            return hex_column(self.raw(name))
+        return self.text(name) if spec.is_text else self.raw(name)
+
+    def iter_rows(self, binary: bool = False, chunk_rows: int = ROW_CHUNK):
+        """Yield tuple nilai Python per baris, dikonversi per potongan kolom
+
+        binary=False: kolom binary sebagai hex (untuk CSV/xlsx), selain itu bytes.
+        """
+        for start in range(0, self._length, chunk_rows):
+            stop = min(start + chunk_rows, self._length)
+            columns = []
+            for spec in self.specs:
+                raw = self._arrays[spec.name][start:stop]
+                if spec.binary and not binary:
+                    raw = hex_column(raw)
+                elif spec.is_text:
+                    raw = decode_text(raw, self.encoding)
+                columns.append(raw.tolist())
+            yield from zip(*columns)
+
+    def dictionary(self, name: str) -> tuple[np.ndarray, np.ndarray]:
+        """Kolom teks sebagai (codes, categories); hanya nilai unik yang di-decode"""
+        return dictionary_encode(self.raw(name), self.encoding)
+
+    def categorical_names(self, categorical=None) -> list[str]:
+        """Kolom teks yang dijadikan kategori
+
+        categorical: None (tidak ada), "auto" (berdasarkan jumlah nilai unik)
+        atau daftar nama kolom.
+        """
+        if categorical is None:
+            return []
+        text_names = [s.name for s in self.specs if s.is_text]
+        if categorical == "auto":
+            return [n for n in text_names if low_cardinality(self.raw(n))]
+        unknown = [n for n in categorical if n not in text_names]
+        if unknown:
+            raise ValueError(f"Bukan kolom teks: {', '.join(unknown)}")
+        return [n for n in text_names if n in categorical]
+
+    def to_pandas(self, categorical=None) -> pd.DataFrame:
+        """Konversi ke DataFrame; kolom numerik memakai buffer yang sama
+
+        Kolom di categorical (lihat categorical_names) menjadi pd.Categorical:
+        satu string per nilai unik, bukan per sel.
+        """
+        import pandas as pd
+
+        categories = set(self.categorical_names(categorical))
+        data = {}
+        for spec in self.specs:
+            if spec.dtype is not None:
+                data[spec.name] = pd.Series(self.raw(spec.name), copy=False)
+            elif spec.binary:
+                data[spec.name] = pd.Series(self.raw(spec.name).tolist(), dtype=object)
+            elif spec.name in categories:
+                codes, values = self.dictionary(spec.name)
+                data[spec.name] = pd.Categorical.from_codes(codes, values)
+            else:
+                data[spec.name] = pd.Series(self.column(spec.name))
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self, decode: bool = True, categorical=None):
+        """Konversi ke pyarrow.Table
+
+        Kolom numerik dibungkus tanpa salinan. Kolom binary (dan kolom teks jika
+        decode=False) menjadi fixed_size_binary di atas buffer bytes yang sama. Kolom di
+        categorical menjadi dictionary array.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("pyarrow belum terpasang (pip install pyarrow)") from e
+
+        categories = set(self.categorical_names(categorical))
+        arrays = []
+        for spec in self.specs:
+            raw = self.raw(spec.name)
+            if spec.dtype is not None:
+                arrays.append(pa.array(raw))
+            elif spec.name in categories:
+                codes, values = self.dictionary(spec.name)
+                arrays.append(
+                    pa.DictionaryArray.from_arrays(
+                        pa.array(codes.astype(np.int32)),
+                        pa.array(values.tolist(), pa.string()),
+                    )
+                )
+            elif decode and not spec.binary:
+                arrays.append(pa.array(self.column(spec.name).tolist(), pa.string()))
+            else:
+                arrays.append(
+                    pa.FixedSizeBinaryArray.from_buffers(
+                        pa.binary(raw.dtype.itemsize),
+                        len(raw),
+                        [None, pa.py_buffer(raw.view(np.uint8))],
+                    )
+                )
+        return pa.Table.from_arrays(arrays, names=self.names)
+
+
+def record_matrix(chunk: bytes, record_size: int) -> np.ndarray:
+    """View 2D (n_record x record_size) di atas bytes chunk, tanpa salinan"""
+    return np.frombuffer(chunk, dtype=np.uint8).reshape(-1, record_size)
+
+
+def fixed_width(matrix: np.ndarray, start: int, width: int) -> np.ndarray:
+    """Ambil kolom byte [start, start+width) dari semua record sebagai array S{width}"""
+    column = np.ascontiguousarray(matrix[:, start : start + width])
+    return column.view(f"S{width}").ravel()
+
+
+def decode_chunk(
+    chunk: bytes, header: dbase.DbfHeader, encoding: str | None = None
+) -> list[np.ndarray]:
+    """Decode satu chunk record menjadi array str per field (vektor per kolom)"""
+    matrix = record_matrix(chunk, header.record_size)
+    encoding = encoding or header.encoding
+    return [
+        decode_text(fixed_width(matrix, f.offset, f.length), encoding)
+        for f in header.fields
+    ]
+
+
+def parse_numeric(raw: np.ndarray) -> np.ndarray:
+    """Parse kolom angka dBase (teks ASCII lebar tetap) ke float64 secara vektor
+
+    Sel kosong dan sel yang tidak bisa dibaca (mis. '*****' overflow) menjadi NaN.
+    """
+    width = max(raw.dtype.itemsize, 3)
+    values = np.strings.strip(raw.astype(f"S{width}"))
+    values[values == b""] = b"nan"
+    try:
+        return values.astype(np.float64)
+    except ValueError:
+        # Jalur lambat hanya bila ada sel rusak
+        return np.array([_to_float(v) for v in values.tolist()], dtype=np.float64)
+
+
+def _to_float(value: bytes) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return float("nan")
+
+
+def decode_text(raw: np.ndarray, encoding: str) -> np.ndarray:
+    """Decode array bytes lebar tetap menjadi array str numpy (sudah di-strip)"""
+    width = raw.dtype.itemsize
+    if not len(raw):
+        return np.array([], dtype="U1")
+    if dbase.is_single_byte(encoding):
+        # Satu decode untuk seluruh buffer kolom; lebar karakter = lebar byte
+        decoded = raw.tobytes().decode(encoding, errors="replace")
+        text = np.frombuffer(decoded.encode("utf-32-le"), dtype=f"<U{width}")
+    else:
+        text = np.array(
+            [v.decode(encoding, errors="replace") for v in raw.tolist()],
+            dtype=f"<U{width}",
+        )
+    return np.strings.strip(text)
+
+
+def unique_bytes(raw: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """np.unique(raw, return_inverse=True) untuk kolom bytes lebar tetap
+
+    Kolom sampai 8 byte dibandingkan sebagai uint64 (jauh lebih cepat daripada
+    mengurutkan string).
+    """
+    width = raw.dtype.itemsize
+    if width > 8 or not len(raw):
+        return np.unique(raw, return_inverse=True)
+    padded = np.zeros((len(raw), 8), dtype=np.uint8)
+    padded[:, :width] = np.ascontiguousarray(raw).view(np.uint8).reshape(-1, width)
+    keys, inverse = np.unique(padded.view(">u8").ravel(), return_inverse=True)
+    uniques = keys.view(np.uint8).reshape(-1, 8)[:, :width]
+    return np.ascontiguousarray(uniques).view(f"S{width}").ravel(), inverse
+
+
+def dictionary_encode(raw: np.ndarray, encoding: str) -> tuple[np.ndarray, np.ndarray]:
+    """(codes, categories) dari byte mentah: unique + inverse, decode nilai unik saja"""
+    uniques, inverse = unique_bytes(raw)
+    # Nilai mentah berbeda bisa sama setelah strip (mis. 'AB ' dan ' AB')
+    categories, remap = np.unique(decode_text(uniques, encoding), return_inverse=True)
+    return remap[inverse], categories
+
+
+def low_cardinality(raw: np.ndarray, ratio: float = AUTO_CATEGORY_RATIO) -> bool:
+    """Perkiraan dari sampel merata: nilai unik <= ratio x jumlah baris"""
+    if not len(raw):
+        return False
+    sample = raw[:: max(1, len(raw) // CATEGORY_SAMPLE)]
+    return len(unique_bytes(sample)[0]) <= ratio * len(sample)
+
+
+def load_dbase(
+    filepath: Path | str,
+    header: dbase.DbfHeader | None = None,
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+    progress=None,
+) -> ColumnarTable:
+    """Baca file dBase III ke ColumnarTable (praalokasi dari num_records)"""
+    header = header or dbase.read_header(filepath)
+    specs = [ColumnSpec(f.name, width=f.length) for f in header.fields]
+    table = ColumnarTable(specs, header.num_records, encoding or header.encoding)
+
+    for chunk in dbase.iter_record_chunks(filepath, header, io_config):
+        matrix = record_matrix(chunk, header.record_size)
+        table.append(
+            {f.name: fixed_width(matrix, f.offset, f.length) for f in header.fields}
+        )
+        if progress:
+            progress(len(table), header.num_records)
+
+    return table
+
+
+def stock_specs(layout: stock.StockLayout, record_size: int) -> list[ColumnSpec]:
+    """ColumnSpec untuk setiap field layout STOCK (teks: S{size}, angka: dtype numpy)"""
+    specs = [
+        ColumnSpec(f.name, width=f.size)
+        if f.is_text
+        else ColumnSpec(f.name, dtype=np.dtype(f.type.replace("!", ">")).str)
+        for f in layout.fields
+    ]
+    if layout.raw:
+        width = record_size - stock.BARCODE_LEN
+        specs.append(ColumnSpec(stock.RAW_COLUMN, width=width, binary=True))
+    return specs
+
+
+def load_stock(
+    data: bytes,
+    encoding: str | None = None,
+    layout: stock.StockLayout = stock.DEFAULT_LAYOUT,
+) -> ColumnarTable:
+    """Parse STOCK1.DAT ke ColumnarTable, satu kolom bertipe per field layout"""
+    pos, record_size, count = stock.locate(data, layout)
+    specs = stock_specs(layout, record_size)
+    table = ColumnarTable(specs, count, encoding or dbase.DEFAULT_ENCODING)
+    if not count:
+        return table
+
+    matrix = np.frombuffer(data, dtype=np.uint8, count=count * record_size, offset=pos)
+    matrix = matrix.reshape(count, record_size)
+
+    # Lewati record yang barcode-nya hanya spasi/NUL
+    barcode = matrix[:, : stock.BARCODE_LEN]
+    matrix = matrix[((barcode != 0x20) & (barcode != 0x00)).any(axis=1)]
+
+    columns = {}
+    for f, spec in zip(layout.fields, specs):
+        if f.offset + f.size > record_size:
+            columns[f.name] = np.zeros(len(matrix), dtype=spec.numpy_dtype)
+        else:
+            raw = fixed_width(matrix, f.offset, f.size)
+            columns[f.name] = raw if f.is_text else raw.view(spec.numpy_dtype)
+    if layout.raw:
+        raw = fixed_width(matrix, stock.BARCODE_LEN, record_size - stock.BARCODE_LEN)
+        columns[stock.RAW_COLUMN] = raw.view(specs[-1].numpy_dtype)
+    table.append(columns)
+    return table
+
+
+def hex_column(raw: np.ndarray) -> np.ndarray:
+    """Representasi hex untuk kolom bytes lebar tetap (satu .hex() per kolom)"""
+    width = raw.dtype.itemsize * 2
+    if not len(raw):
+        return np.array([], dtype="U1")
+    encoded = raw.tobytes().hex().encode("utf-32-le")
+    return np.frombuffer(encoded, dtype=f"<U{width}")
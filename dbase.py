@@ -0,0 +1,503 @@
+"""
+Inti pembaca dBase III (hanya stdlib)
+Dipakai bersama oleh CLI, GUI, dan jalur CSV tanpa pandas
+"""
+
+import codecs
+import contextlib
+import mmap
+import struct
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+import blockio
+
+HEADER_PREFIX_SIZE = 32
+FIELD_DESCRIPTOR_SIZE = 32
+HEADER_TERMINATOR = b"\x0d"
+# Batas pencarian terminator: dBase III/IV paling banyak 255 field
+MAX_FIELDS = 255
+MAX_HEADER_SIZE = HEADER_PREFIX_SIZE + MAX_FIELDS * FIELD_DESCRIPTOR_SIZE + 1
+EOF_MARKER = b"\x1a"
+DELETED_FLAG = b"*"
+# Perkiraan memori per sel setelah decode: objek str (~50-75 byte) + sampai
+# 2 byte per karakter, ditambah array numpy U (4 byte per karakter) dan salinan
+# antara di jalur vectorized; per record: tuple baris (40 + 8 byte per kolom).
+# Diukur pada ekspor CSV: memori data tetap di bawah --max-memory
+CELL_OVERHEAD = 96
+CELL_BYTES_PER_CHAR = 10
+ROW_OVERHEAD = 40
+LANGUAGE_DRIVER_OFFSET = 29
+
+# Codepage default bila language driver byte = 0 (umum pada file dBase III DOS)
+DEFAULT_ENCODING = "cp437"
+
+# Language driver ID (byte 29 header) -> codec Python
+LANGUAGE_DRIVERS = {
+    0x01: "cp437",  # US MS-DOS
+    0x02: "cp850",  # International MS-DOS
+    0x03: "cp1252",  # Windows ANSI
+    0x04: "mac_roman",  # Standard Macintosh
+    0x08: "cp865",  # Danish OEM
+    0x09: "cp437",  # Dutch OEM
+    0x0A: "cp850",  # Dutch OEM*
+    0x0B: "cp437",  # Finnish OEM
+    0x0D: "cp437",  # French OEM
+    0x0E: "cp850",  # French OEM*
+    0x0F: "cp437",  # German OEM
+    0x10: "cp850",  # German OEM*
+    0x11: "cp437",  # Italian OEM
+    0x12: "cp850",  # Italian OEM*
+    0x13: "cp932",  # Japanese Shift-JIS
+    0x14: "cp850",  # Spanish OEM*
+    0x15: "cp437",  # Swedish OEM
+    0x16: "cp850",  # Swedish OEM*
+    0x17: "cp865",  # Norwegian OEM
+    0x18: "cp437",  # Spanish OEM
+    0x19: "cp437",  # English OEM (Britain)
+    0x1A: "cp850",  # English OEM (Britain)*
+    0x1B: "cp437",  # English OEM (US)
+    0x1C: "cp863",  # French OEM (Canada)
+    0x1D: "cp850",  # French OEM*
+    0x1F: "cp852",  # Czech OEM
+    0x22: "cp852",  # Hungarian OEM
+    0x23: "cp852",  # Polish OEM
+    0x24: "cp860",  # Portuguese OEM
+    0x25: "cp850",  # Portuguese OEM*
+    0x26: "cp866",  # Russian OEM
+    0x37: "cp850",  # English OEM (US)*
+    0x40: "cp852",  # Romanian OEM
+    0x4D: "cp936",  # Chinese GBK (PRC)
+    0x4E: "cp949",  # Korean (ANSI/OEM)
+    0x4F: "cp950",  # Chinese Big5 (Taiwan)
+    0x50: "cp874",  # Thai (ANSI/OEM)
+    0x57: "cp1252",  # ANSI
+    0x58: "cp1252",  # Western European ANSI
+    0x59: "cp1252",  # Spanish ANSI
+    0x64: "cp852",  # Eastern European MS-DOS
+    0x65: "cp866",  # Russian MS-DOS
+    0x66: "cp865",  # Nordic MS-DOS
+    0x67: "cp861",  # Icelandic MS-DOS
+    0x6A: "cp737",  # Greek MS-DOS (437G)
+    0x6B: "cp857",  # Turkish MS-DOS
+    0x78: "cp950",  # Chinese (Hong Kong SAR, Taiwan) Windows
+    0x79: "cp949",  # Korean Windows
+    0x7A: "cp936",  # Chinese (PRC, Singapore) Windows
+    0x7B: "cp932",  # Japanese Windows
+    0x7C: "cp874",  # Thai Windows
+    0x7D: "cp1255",  # Hebrew Windows
+    0x7E: "cp1256",  # Arabic Windows
+    0x96: "mac_cyrillic",  # Russian Macintosh
+    0x97: "mac_latin2",  # Macintosh EE
+    0x98: "mac_greek",  # Greek Macintosh
+    0xC8: "cp1250",  # Eastern European Windows
+    0xC9: "cp1251",  # Russian Windows
+    0xCA: "cp1254",  # Turkish Windows
+    0xCB: "cp1253",  # Greek Windows
+}
+
+
+class DbfField(NamedTuple):
+    """Deskriptor satu kolom dBase"""
+
+    name: str
+    type: str
+    length: int
+    offset: int  # Posisi di dalam record (byte 0 = deletion flag)
+    decimals: int = 0
+
+
+@dataclass
+class DbfHeader:
+    """Header file dBase III"""
+
+    version: int
+    year: int
+    month: int
+    day: int
+    num_records: int
+    header_size: int
+    record_size: int
+    fields: list[DbfField]
+    language_driver: int = 0
+
+    @property
+    def field_names(self) -> list[str]:
+        return [f.name for f in self.fields]
+
+    @property
+    def encoding(self) -> str:
+        """Codec dari language driver byte (DEFAULT_ENCODING jika tidak dikenal)"""
+        return LANGUAGE_DRIVERS.get(self.language_driver, DEFAULT_ENCODING)
+
+    @property
+    def last_update(self) -> date | None:
+        """Tanggal update terakhir dari header, None jika tidak valid
+
+        Tahun disimpan sebagai YY sejak 1900, tapi banyak program DOS menulis
+        dua digit saja; nilai < 80 dianggap 20YY.
+        """
+        year = self.year + 1900 if self.year >= 80 else self.year + 2000
+        try:
+            return date(year, self.month, self.day)
+        except ValueError:
+            return None
+
+    @property
+    def decoded_size(self) -> int:
+        """Perkiraan byte satu record setelah di-decode menjadi baris Python"""
+        return ROW_OVERHEAD + sum(
+            CELL_OVERHEAD + 8 + CELL_BYTES_PER_CHAR * f.length for f in self.fields
+        )
+
+    @property
+    def expected_size(self) -> int:
+        """Ukuran file menurut header (tanpa byte EOF 0x1A)"""
+        return self.header_size + self.num_records * self.record_size
+
+
+def check_encoding(encoding: str) -> str:
+    """Validasi nama encoding, kembalikan nama kanonik codec"""
+    return codecs.lookup(encoding).name
+
+
+@lru_cache
+def is_single_byte(encoding: str) -> bool:
+    """True jika setiap byte langsung menghasilkan tepat satu karakter"""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    # Codec multi-byte menahan lead byte (output kosong) menunggu byte berikutnya
+    return all(len(decoder.decode(bytes([b]))) == 1 for b in range(256))
+
+
+def parse_header(data: bytes) -> DbfHeader:
+    """Parse header dari bytes awal file (minimal 32 byte + deskriptor)"""
+    if len(data) < HEADER_PREFIX_SIZE:
+        raise ValueError("Header dBase terlalu pendek")
+
+    version = data[0]
+    year, month, day = struct.unpack("3B", data[1:4])
+    num_records = struct.unpack("<I", data[4:8])[0]
+    header_size = struct.unpack("<H", data[8:10])[0]
+    record_size = struct.unpack("<H", data[10:12])[0]
+    language_driver = data[LANGUAGE_DRIVER_OFFSET]
+
+    fields = []
+    pos = HEADER_PREFIX_SIZE
+    offset = 1  # Skip deletion flag
+    while pos < len(data) and data[pos : pos + 1] != HEADER_TERMINATOR:
+        field_data = data[pos : pos + FIELD_DESCRIPTOR_SIZE]
+        if len(field_data) < FIELD_DESCRIPTOR_SIZE:
+            break
+        name = field_data[0:11].replace(b"\x00", b"").decode("latin-1").strip()
+        ftype = chr(field_data[11])
+        length = field_data[16]
+        decimals = field_data[17]
+        fields.append(DbfField(name, ftype, length, offset, decimals))
+        offset += length
+        pos += FIELD_DESCRIPTOR_SIZE
+
+    return DbfHeader(
+        version=version,
+        year=year,
+        month=month,
+        day=day,
+        num_records=num_records,
+        header_size=header_size,
+        record_size=record_size,
+        fields=fields,
+        language_driver=language_driver,
+    )
+
+
+def find_terminator(data: bytes, start: int = HEADER_PREFIX_SIZE) -> int:
+    """Posisi terminator header di batas deskriptor mulai start (-1 jika tidak ada)"""
+    for pos in range(start, len(data), FIELD_DESCRIPTOR_SIZE):
+        if data[pos : pos + 1] == HEADER_TERMINATOR:
+            return pos
+    return -1
+
+
+def read_header(filepath) -> DbfHeader:
+    """Baca header file dBase III (path, anggota arsip, atau file object)
+
+    header_size bisa salah, jadi deskriptor dibaca sampai terminator, tetapi
+    paling banyak MAX_HEADER_SIZE byte; tanpa terminator -> ValueError.
+    """
+    with blockio.open_source(filepath) as f:
+        data = f.read(HEADER_PREFIX_SIZE)
+        if len(data) < HEADER_PREFIX_SIZE:
+            raise ValueError("Header dBase terlalu pendek")
+        header_size = struct.unpack("<H", data[8:10])[0]
+        size = min(max(header_size, HEADER_PREFIX_SIZE), MAX_HEADER_SIZE)
+        data += f.read(size - HEADER_PREFIX_SIZE)
+        pos = HEADER_PREFIX_SIZE
+        while find_terminator(data, pos) == -1:
+            # Batas deskriptor sebelum len(data) sudah diperiksa
+            pos += (
+                -(-(len(data) - pos) // FIELD_DESCRIPTOR_SIZE) * FIELD_DESCRIPTOR_SIZE
+            )
+            descriptor = b""
+            if len(data) < MAX_HEADER_SIZE:
+                descriptor = f.read(
+                    min(FIELD_DESCRIPTOR_SIZE, MAX_HEADER_SIZE - len(data))
+                )
+            if not descriptor:
+                raise ValueError("Terminator header dBase tidak ditemukan")
+            data += descriptor
+    return parse_header(data)
+
+
+def iter_record_chunks(
+    filepath: Path | str,
+    header: DbfHeader,
+    io_config: blockio.IOConfig | None = None,
+    start: int = 0,
+    stop: int | None = None,
+):
+    """Yield potongan bytes berisi record utuh sampai num_records atau EOF (0x1A)
+
+    start/stop membatasi ke rentang record [start, stop) (untuk pembagian kerja).
+    Dengan io_config.max_memory, ukuran chunk mengikuti anggaran memori.
+    """
+    record_size = header.record_size
+    stop = header.num_records if stop is None else min(stop, header.num_records)
+    if start >= stop:
+        return
+    io_config = blockio.fit_block_size(io_config, record_size, header.decoded_size)
+    for chunk in blockio.iter_record_chunks(
+        filepath,
+        header.header_size + start * record_size,
+        record_size,
+        stop - start,
+        io_config,
+    ):
+        # Deletion flag semua record dalam satu slice; cari EOF marker di sana
+        eof = chunk[::record_size].find(EOF_MARKER)
+        if eof != -1:
+            if eof:
+                yield chunk[: eof * record_size]
+            return
+        yield chunk
+
+
+def visible_records(
+    chunk: bytes, record_size: int, include_deleted: bool = False
+) -> tuple[range | list[int], bytes]:
+    """Buang record terhapus/EOF dari chunk: (index yang dipertahankan, chunk baru)"""
+    flags = chunk[::record_size]
+    keep = range(len(flags))
+    # Jalur cepat: tanpa record terhapus/EOF tidak perlu cek per record
+    if EOF_MARKER in flags or (not include_deleted and DELETED_FLAG in flags):
+        keep = [
+            i
+            for i in keep
+            if flags[i : i + 1] != EOF_MARKER
+            and (include_deleted or flags[i : i + 1] != DELETED_FLAG)
+        ]
+        chunk = b"".join(chunk[i * record_size : (i + 1) * record_size] for i in keep)
+    return keep, chunk
+
+
+def iter_records(
+    filepath: Path | str,
+    header: DbfHeader,
+    io_config: blockio.IOConfig | None = None,
+):
+    """Yield bytes tiap record sampai num_records atau EOF marker (0x1A)"""
+    record_size = header.record_size
+    for chunk in iter_record_chunks(filepath, header, io_config):
+        for start in range(0, len(chunk), record_size):
+            yield chunk[start : start + record_size]
+
+
+def decode_columns(
+    chunk: bytes, header: DbfHeader, encoding: str | None = None
+) -> list[list[str]]:
+    """Decode satu chunk record menjadi list kolom string (sudah di-strip)
+
+    Untuk codepage satu-byte seluruh chunk di-decode dalam satu panggilan;
+    offset byte sama dengan offset karakter sehingga kolom cukup di-slice.
+    """
+    encoding = encoding or header.encoding
+    record_size = header.record_size
+    starts = range(0, len(chunk), record_size)
+
+    if is_single_byte(encoding):
+        text = chunk.decode(encoding, errors="replace")
+        return [
+            [
+                text[base + f.offset : base + f.offset + f.length].strip()
+                for base in starts
+            ]
+            for f in header.fields
+        ]
+
+    # Codepage multi-byte (mis. cp932): decode per sel
+    return [
+        [
+            chunk[base + f.offset : base + f.offset + f.length]
+            .decode(encoding, errors="replace")
+            .strip()
+            for base in starts
+        ]
+        for f in header.fields
+    ]
+
+
+def iter_column_chunks(
+    filepath: Path | str,
+    header: DbfHeader,
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+):
+    """Yield list kolom hasil decode untuk setiap chunk record"""
+    for chunk in iter_record_chunks(filepath, header, io_config):
+        yield decode_columns(chunk, header, encoding)
+
+
+def iter_rows(
+    filepath: Path | str,
+    header: DbfHeader,
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+):
+    """Yield tuple nilai string (sudah di-strip) per record"""
+    for columns in iter_column_chunks(filepath, header, io_config, encoding):
+        yield from zip(*columns)
+
+
+class DbfTable:
+    """Akses acak O(1) ke record dBase III lewat mmap
+
+    Record i selalu berada di header_size + i * record_size, sehingga
+    table[i], table[a:b] dan take() hanya membaca byte yang dibutuhkan.
+    Record yang ditandai hapus (flag '*') dilewati kecuali include_deleted=True;
+    index tetap nomor record fisik (0-based).
+    """
+
+    def __init__(
+        self,
+        filepath,
+        encoding: str | None = None,
+        include_deleted: bool = False,
+    ):
+        # File object yang sudah terbuka (mis. salinan anggota arsip) diambil alih
+        with contextlib.ExitStack() as stack:
+            if blockio.is_path(filepath):
+                self.filepath = Path(filepath)
+                self._file = stack.enter_context(open(self.filepath, "rb"))
+            else:
+                self.filepath = filepath
+                self._file = filepath
+            self.header = read_header(self._file)
+            self.encoding = encoding or self.header.encoding
+            self.include_deleted = include_deleted
+
+            size = blockio.source_size(self._file)
+            self._mmap = (
+                mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                if size
+                else None
+            )
+
+            # Jangan percaya num_records melebihi isi file (mis. file terpotong)
+            record_size = self.header.record_size
+            available = (
+                max(size - self.header.header_size, 0) // record_size
+                if record_size
+                else 0
+            )
+            self._length = min(self.header.num_records, available)
+            # Berhasil: file tetap terbuka sampai close()
+            stack.pop_all()
+
+    @property
+    def field_names(self) -> list[str]:
+        return self.header.field_names
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def _offset(self, index: int) -> int:
+        return self.header.header_size + index * self.header.record_size
+
+    def _normalize(self, index: int) -> int:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(f"record {index} di luar jangkauan (0-{self._length - 1})")
+        return index
+
+    def _visible(self, flag: bytes) -> bool:
+        if flag == EOF_MARKER:
+            return False
+        return self.include_deleted or flag != DELETED_FLAG
+
+    def is_deleted(self, index: int) -> bool:
+        """True jika record ditandai hapus"""
+        index = self._normalize(index)
+        offset = self._offset(index)
+        return self._mmap[offset : offset + 1] == DELETED_FLAG
+
+    def read_range(self, start: int, stop: int) -> tuple[list[int], list[list[str]]]:
+        """Decode record fisik [start, stop): (nomor record, list kolom)"""
+        start = max(start, 0)
+        stop = min(stop, self._length)
+        if start >= stop:
+            return [], [[] for _ in self.header.fields]
+
+        chunk = self._mmap[self._offset(start) : self._offset(stop)]
+        keep, chunk = visible_records(
+            chunk, self.header.record_size, self.include_deleted
+        )
+
+        columns = decode_columns(chunk, self.header, self.encoding)
+        return [start + i for i in keep], columns
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                return self.take(range(start, stop, step))
+            _, columns = self.read_range(start, stop)
+            return list(zip(*columns))
+
+        index = self._normalize(key)
+        offset = self._offset(index)
+        record = self._mmap[offset : offset + self.header.record_size]
+        if not self._visible(record[:1]):
+            raise KeyError(f"record {index} sudah dihapus")
+        return next(zip(*decode_columns(record, self.header, self.encoding)), ())
+
+    def take(self, indices) -> list[tuple]:
+        """Ambil record pada index tertentu (record terhapus dilewati)"""
+        record_size = self.header.record_size
+        records = []
+        for index in indices:
+            offset = self._offset(self._normalize(index))
+            record = self._mmap[offset : offset + record_size]
+            if self._visible(record[:1]):
+                records.append(record)
+        if not records:
+            return []
+        return list(zip(*decode_columns(b"".join(records), self.header, self.encoding)))
+
+    def __iter__(self):
+        step = max(blockio.DEFAULT_BLOCK_SIZE // max(self.header.record_size, 1), 1)
+        for start in range(0, self._length, step):
+            yield from self[start : start + step]
@@ -4,18 +4,54 @@ DAT/DTA to Excel Exporter
 Mengekspor file database legacy (.DAT, .DTA) ke format Excel (.xlsx)
 """
 
-import struct
+from __future__ import annotations
+
 import argparse
+import contextlib
+import csv
+import dataclasses
+import io
+import math
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from collections.abc import Iterator
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+import archive
+import backends
+import blockio
+import dbase
+import stock
+import xlsx
+from formats import detect_format, read_version
+
+# pandas, numpy (columnar) dan dbfread diimpor di dalam fungsi yang membutuhkan
+# agar CLI cepat
+# start (--help dan jalur CSV tidak pernah mengimpor pandas)
+if TYPE_CHECKING:
+    import pandas as pd
 
-import pandas as pd
-from dbfread import DBF
 
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+# Batas proses paralel untuk ekspor CSV/xlsx beberapa file/anggota arsip
+MAX_EXPORT_WORKERS = 8
+# Pola file input untuk -d dan folder default (arsip backup ikut dibaca)
+INPUT_PATTERNS = ("*.DAT", "*.DTA", "*.dat", "*.dta", "*.zip", "*.ZIP", "*.gz", "*.GZ")
 
-def read_dbf_file(filepath: Path) -> pd.DataFrame:
+
+def read_dbf_file(filepath: Path, encoding: str | None = None) -> pd.DataFrame:
     """Membaca file dBase/DBF standar (.DTA)"""
+    import pandas as pd
+    from dbfread import DBF
+
     try:
-        table = DBF(str(filepath), encoding="latin-1", ignore_missing_memofile=True)
+        encoding = encoding or dbase.read_header(filepath).encoding
+        table = DBF(str(filepath), encoding=encoding, ignore_missing_memofile=True)
         df = pd.DataFrame(iter(table))
         return df
     except Exception as e:
@@ -23,225 +59,1072 @@ def read_dbf_file(filepath: Path) -> pd.DataFrame:
         return None
 
 
-def read_dbase3_manual(filepath: Path) -> pd.DataFrame:
-    """Membaca file dBase III secara manual"""
-    with open(filepath, "rb") as f:
-        # Header
-        _version = struct.unpack("B", f.read(1))[0]  # noqa: F841
-        _year, _month, _day = struct.unpack("3B", f.read(3))
-        num_records = struct.unpack("<I", f.read(4))[0]
-        header_size = struct.unpack("<H", f.read(2))[0]
-        record_size = struct.unpack("<H", f.read(2))[0]
-        f.read(20)  # reserved
-
-        # Field descriptors
-        fields = []
-        while True:
-            first_byte = f.read(1)
-            if first_byte == b"\r" or first_byte == b"\x0d":
-                break
-            f.seek(-1, 1)
-            field_data = f.read(32)
-            name = field_data[0:11].replace(b"\x00", b"").decode("latin-1").strip()
-            ftype = chr(field_data[11])
-            length = field_data[16]
-            fields.append((name, ftype, length))
-
-        # Read records
-        f.seek(header_size)
-        records = []
-        for i in range(num_records):
-            record = f.read(record_size)
-            if not record or record[0:1] == b"\x1a":
-                break
-            row = {}
-            offset = 1  # Skip deletion flag
-            for name, ftype, length in fields:
-                value = (
-                    record[offset : offset + length]
-                    .decode("latin-1", errors="ignore")
-                    .strip()
-                )
-                row[name] = value
-                offset += length
-            records.append(row)
+def _print_progress(done: int, total: int):
+    print(f"  Membaca record {done:,}/{total:,}...")
 
-            # Progress indicator
-            if (i + 1) % 50000 == 0:
-                print(f"  Membaca record {i + 1:,}/{num_records:,}...")
 
-        return pd.DataFrame(records)
+def _warn_integrity(filepath: Path, header: dbase.DbfHeader):
+    """Cek ukuran file vs header (O(1)) dan cetak peringatan bila tidak cocok"""
+    import integrity
 
+    report = integrity.size_check(filepath, header)
+    for message in report.warnings():
+        print(f"  PERINGATAN: {message}")
+    if not report.ok:
+        print(f"  Periksa/pulihkan dengan: exporter.py check --recover DIR {filepath}")
+    return report
 
-def read_stock_dat(filepath: Path) -> pd.DataFrame:
-    """Membaca file STOCK1.DAT (format custom binary)"""
-    with open(filepath, "rb") as f:
-        data = f.read()
 
-    # Cari posisi awal data (barcode pertama)
-    pos = 0
-    for i in range(len(data) - 13):
-        chunk = data[i : i + 13]
-        try:
-            if chunk.isdigit():
-                pos = i
-                break
-        except Exception:
-            continue
+def _print_choice(choice: backends.Choice):
+    for line in choice.describe():
+        print(f"  {line}")
 
-    # Deteksi record size
-    record_size = 23  # Default
-    first_pos = pos
-    next_pos = pos + 13
-    while next_pos < len(data) - 13:
-        chunk = data[next_pos : next_pos + 13]
-        if chunk.isdigit():
-            record_size = next_pos - first_pos
-            break
-        next_pos += 1
-
-    # Parse records
-    records = []
-    current = pos
-    total_estimated = (len(data) - pos) // record_size
-
-    while current < len(data) - record_size:
-        record = data[current : current + record_size]
-        barcode = record[:13].decode("latin-1", errors="ignore").strip()
-
-        # Extract additional data (bytes after barcode)
-        extra_bytes = record[13:]
-
-        if barcode.replace(" ", "").replace("\x00", ""):
-            # Try to decode extra data as numbers
-            try:
-                if len(extra_bytes) >= 4:
-                    value1 = (
-                        struct.unpack("<I", extra_bytes[4:8])[0]
-                        if len(extra_bytes) >= 8
-                        else 0
-                    )
-                else:
-                    value1 = 0
-            except Exception:
-                value1 = 0
-
-            records.append(
-                {
-                    "BARCODE": barcode.strip(),
-                    "VALUE": value1,
-                    "RAW_DATA": extra_bytes.hex(),
-                }
-            )
 
-        current += record_size
+def _print_rate(count: int, elapsed: float, size: int):
+    rate = count / max(elapsed, 1e-9)
+    print(
+        f"  Statistik: {count:,} baris dalam {elapsed:.2f} s "
+        f"({rate:,.0f} baris/s, {size / blockio.MB / max(elapsed, 1e-9):,.1f} MB/s)"
+    )
 
-        # Progress indicator
-        if len(records) % 50000 == 0:
-            print(f"  Membaca record {len(records):,}/{total_estimated:,}...")
 
-    return pd.DataFrame(records)
+def read_dbase3_manual(
+    filepath: Path,
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+    categorical=None,
+    read_options: backends.ReadOptions | None = None,
+) -> pd.DataFrame:
+    """Membaca file dBase III secara manual
 
+    categorical: "auto" atau daftar field teks yang dijadikan pd.Categorical
+    (lihat columnar.ColumnarTable.categorical_names). Backend pembaca dipilih
+    otomatis kecuali ditentukan di read_options (lihat backends.choose).
+    """
+    read_options = read_options or backends.ReadOptions()
+    header = dbase.read_header(filepath)
+    encoding = encoding or header.encoding
+    print(f"  Encoding: {encoding} (language driver 0x{header.language_driver:02X})")
+    report = _warn_integrity(filepath, header)
+
+    choice = backends.choose(
+        filepath,
+        header,
+        "frame",
+        read_options.backend,
+        read_options.cores,
+        categorical=bool(categorical),
+    )
+    if read_options.stats:
+        _print_choice(choice)
+    started = time.perf_counter()
+    df = choice.backend.frame(
+        filepath,
+        header,
+        io_config,
+        encoding,
+        categorical,
+        _print_progress,
+        read_options.cores,
+    )
+    if read_options.stats:
+        elapsed = time.perf_counter() - started
+        _print_rate(len(df), elapsed, blockio.source_size(filepath))
+
+    expected = min(header.num_records, report.records_in_file)
+    if len(df) < expected:
+        print(
+            f"  PERINGATAN: pembacaan berhenti di record {len(df):,} dari "
+            f"{expected:,} (EOF 0x1A lebih awal)"
+        )
+    return df
 
-def read_tproduk_dat(filepath: Path) -> pd.DataFrame:
-    """Membaca file TPRODUK1.DAT"""
-    with open(filepath, "rb") as f:
-        data = f.read()
 
+def read_stock_dat(
+    filepath: Path,
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+    layout: stock.StockLayout | None = None,
+) -> pd.DataFrame:
+    """Membaca file STOCK1.DAT (format custom binary, field menurut layout)"""
+    import columnar
+
+    data = blockio.read_all(filepath, io_config)
+    table = columnar.load_stock(data, encoding, layout or stock.DEFAULT_LAYOUT)
+    return table.to_pandas()
+
+
+def _tproduk_rows(data: bytes, encoding: str | None = None) -> list[list]:
+    """Baris TPRODUK1.DAT: cari pattern "nota" dan data terkait"""
     # File ini sangat kecil, kemungkinan index atau config
     # Parse sebagai raw data
-    records = []
-
-    # Cari pattern "nota" dan data terkait
     pos = data.find(b"nota")
-    if pos != -1:
-        # Ada field "nota" - parse sekitarnya
-        records.append(
-            {
-                "TYPE": "INDEX/CONFIG",
-                "SIZE": len(data),
-                "CONTENT": data[pos : pos + 50].decode("latin-1", errors="ignore"),
-            }
-        )
+    if pos == -1:
+        return []
+    content = data[pos : pos + 50].decode(
+        encoding or dbase.DEFAULT_ENCODING, errors="ignore"
+    )
+    return [["INDEX/CONFIG", len(data), content]]
+
+
+TPRODUK_COLUMNS = ["TYPE", "SIZE", "CONTENT"]
+
 
-    return pd.DataFrame(records)
+def read_tproduk_dat(
+    filepath: Path,
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+) -> pd.DataFrame:
+    """Membaca file TPRODUK1.DAT"""
+    import pandas as pd
+
+    data = blockio.read_all(filepath, io_config)
+    rows = _tproduk_rows(data, encoding)
+    return pd.DataFrame(rows, columns=TPRODUK_COLUMNS if rows else None)
 
 
-def detect_and_read(filepath: Path) -> tuple[pd.DataFrame, str]:
-    """Deteksi format file dan baca dengan parser yang sesuai"""
-    with open(filepath, "rb") as f:
-        header = f.read(10)
+def detect_and_read(
+    filepath: Path,
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+    categorical=None,
+    read_options: backends.ReadOptions | None = None,
+) -> tuple[pd.DataFrame, str]:
+    """Deteksi format file dan baca dengan parser yang sesuai
 
-    version = header[0]
-    filename = filepath.name.upper()
+    categorical dan read_options diteruskan ke read_dbase3_manual (file dBase).
+    """
+    version = read_version(filepath)
+    fmt = detect_format(filepath.name, version)
 
     print(f"\n  File: {filepath.name}")
-    print(f"  Size: {filepath.stat().st_size:,} bytes")
+    print(f"  Size: {blockio.source_size(filepath):,} bytes")
     print(f"  Version byte: {version}")
 
-    # Deteksi berdasarkan ekstensi dan header
-    if filename.endswith(".DTA") and version == 0x03:
+    # Salin ke scratch lokal dulu jika sumber lambat (mis. share SMB)
+    with blockio.staged(filepath, io_config) as local_path:
+        if local_path != filepath:
+            print(f"  Disalin ke lokal: {local_path}")
+        return _read_detected(
+            local_path, fmt, io_config, encoding, categorical, read_options
+        )
+
+
+def _read_detected(
+    filepath: Path,
+    fmt: str,
+    io_config: blockio.IOConfig | None,
+    encoding: str | None,
+    categorical=None,
+    read_options: backends.ReadOptions | None = None,
+) -> tuple[pd.DataFrame, str]:
+    read_options = read_options or backends.ReadOptions()
+    if fmt == "dbase3":
         print("  Format: dBase III")
-        df = read_dbase3_manual(filepath)
+        df = read_dbase3_manual(
+            filepath, io_config, encoding, categorical, read_options
+        )
         return df, "dBase III"
 
-    elif filename == "STOCK1.DAT":
+    elif fmt == "stock":
         print("  Format: Custom Binary (Stock Data)")
-        df = read_stock_dat(filepath)
+        df = read_stock_dat(filepath, io_config, encoding, read_options.stock_layout)
         return df, "Custom Binary"
 
-    elif filename == "TPRODUK1.DAT":
+    elif fmt == "tproduk":
         print("  Format: Index/Config File")
-        df = read_tproduk_dat(filepath)
+        df = read_tproduk_dat(filepath, io_config, encoding)
         return df, "Index File"
 
     else:
-        # Coba DBF standar dulu
-        print("  Format: Mencoba dBase...")
-        df = read_dbf_file(filepath)
-        if df is not None and len(df) > 0:
-            return df, "dBase"
+        # Coba DBF standar dulu (dbfread mengenal varian dBase lain), kecuali
+        # backend lain diminta secara eksplisit
+        if read_options.backend in (backends.AUTO, "dbfread"):
+            print("  Format: Mencoba dBase...")
+            df = read_dbf_file(filepath, encoding)
+            if df is not None and len(df) > 0:
+                return df, "dBase"
 
         # Fallback ke manual parsing
         print("  Fallback ke manual parsing...")
-        df = read_dbase3_manual(filepath)
+        df = read_dbase3_manual(
+            filepath, io_config, encoding, categorical, read_options
+        )
         return df, "Manual Parse"
 
 
-def export_to_excel(input_files: list[Path], output_file: Path):
-    """Ekspor semua file ke satu Excel dengan multiple sheets"""
+def stream_rows(
+    filepath: Path,
+    fmt: str,
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+    read_options: backends.ReadOptions | None = None,
+    binary: bool = False,
+) -> tuple[list[str], Iterator]:
+    """Kolom dan iterator baris tanpa pandas (untuk jalur streaming)
+
+    File dBase dibaca lewat backend yang dipilih backends.choose (mode rows),
+    atau lewat extsort jika read_options.sort_by diisi. Kolom RAW_DATA STOCK
+    berupa hex, atau bytes jika binary=True (BLOB SQLite).
+    """
+    read_options = read_options or backends.ReadOptions()
+    if read_options.sort_by and fmt in ("stock", "tproduk"):
+        print("  PERINGATAN: --sort-by hanya untuk file dBase, urutan asli dipakai")
+    if fmt == "stock":
+        import columnar
+
+        data = blockio.read_all(filepath, io_config)
+        layout = read_options.stock_layout or stock.DEFAULT_LAYOUT
+        table = columnar.load_stock(data, encoding, layout)
+        return table.names, table.iter_rows(binary)
+    elif fmt == "tproduk":
+        data = blockio.read_all(filepath, io_config)
+        return TPRODUK_COLUMNS, iter(_tproduk_rows(data, encoding))
+
+    # dBase III (juga fallback untuk format tidak dikenal)
+    header = dbase.read_header(filepath)
+    _warn_integrity(filepath, header)
+    if read_options.sort_by:
+        import extsort
+
+        rows = extsort.sorted_rows(
+            filepath, header, list(read_options.sort_by), encoding, io_config
+        )
+        return header.field_names, rows
+    choice = backends.choose(
+        filepath, header, "rows", read_options.backend, read_options.cores
+    )
+    if read_options.stats:
+        _print_choice(choice)
+    return choice.backend.rows(
+        filepath, header, io_config, encoding, read_options.cores
+    )
+
+
+def _csv_targets(input_files: list[Path], output_file: Path) -> list[Path]:
+    """Satu input -> output_file; beberapa input -> <output>_<nama file>.csv
+
+    Nama yang bentrok (mis. a/TJUAL.DTA dan b/TJUAL.DTA) diberi akhiran _2, _3
+    seperti xlsx.sheet_names, agar dua proses tidak menulis file yang sama.
+    """
+    if len(input_files) == 1:
+        return [output_file]
+    targets = []
+    taken = set()
+    for filepath in input_files:
+        base = f"{output_file.stem}_{filepath.stem}"
+        name = base
+        n = 1
+        # Windows tidak membedakan huruf besar/kecil nama file
+        while name.upper() in taken:
+            n += 1
+            name = f"{base}_{n}"
+        taken.add(name.upper())
+        targets.append(output_file.with_name(f"{name}.csv"))
+    return targets
+
+
+def _write_csv(target: Path, columns: list[str], rows) -> int:
+    """Tulis CSV (utf-8-sig agar Excel mengenali encoding), kembalikan jumlah baris"""
+    count = 0
+    with open(target, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _export_csv_file(
+    filepath: Path,
+    target: Path,
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+    read_options: backends.ReadOptions | None = None,
+) -> str:
+    """Ekspor satu file ke CSV; log dikembalikan (agar rapi saat paralel)"""
+    read_options = read_options or backends.ReadOptions()
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        try:
+            fmt = detect_format(filepath.name, read_version(filepath))
+            print(f"\n  File: {filepath.name} ({fmt})")
+
+            started = time.perf_counter()
+            with blockio.staged(filepath, io_config) as local_path:
+                columns, rows = stream_rows(
+                    local_path, fmt, io_config, encoding, read_options
+                )
+                count = _write_csv(target, columns, rows)
+
+            print(f"  Diekspor: {count:,} baris -> {target.name}")
+            if read_options.stats:
+                elapsed = time.perf_counter() - started
+                _print_rate(count, elapsed, blockio.source_size(filepath))
+
+        except blockio.READ_ERRORS as e:
+            print(f"  ERROR: {e}")
+    return log.getvalue()
+
+
+def convert_file(
+    filepath: Path,
+    target: Path,
+    output_format: str = "csv",
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+    read_options: backends.ReadOptions | None = None,
+) -> int:
+    """Ekspor satu file ke CSV atau xlsx satu sheet secara atomik; jumlah baris
+
+    Output ditulis ke <target>.tmp lalu di-rename, sehingga proses yang terhenti
+    tidak pernah meninggalkan file setengah jadi dengan nama akhir.
+    """
+    read_options = read_options or backends.ReadOptions()
+    fmt = detect_format(filepath.name, read_version(filepath))
+    temp = target.with_name(target.name + ".tmp")
+    scratch = io_config.scratch_dir if io_config else None
+    try:
+        with blockio.staged(filepath, io_config) as local_path:
+            columns, rows = stream_rows(
+                local_path, fmt, io_config, encoding, read_options
+            )
+            if output_format == "csv":
+                count = _write_csv(temp, columns, rows)
+            else:
+                with tempfile.TemporaryDirectory(
+                    prefix="datexp_", dir=scratch
+                ) as parts_dir:
+                    part = xlsx.write_sheet(
+                        Path(parts_dir) / "sheet1.xml", columns, rows
+                    )
+                    name = xlsx.sheet_names([filepath.stem])[0]
+                    xlsx.assemble(temp, [(name, part)])
+                count = part.rows
+        os.replace(temp, target)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    return count
+
+
+def job_workers(
+    count: int, workers: int | None = None, io_config: blockio.IOConfig | None = None
+) -> int:
+    """Jumlah proses untuk count file (default: sebanyak core, maks 8)
+
+    Dengan max_memory, dibatasi agar setiap proses kebagian blockio.WORKER_MEMORY.
+    """
+    workers = max(1, workers or min(count, os.cpu_count() or 1, MAX_EXPORT_WORKERS))
+    return blockio.budget_workers(io_config, workers)
+
+
+def job_options(
+    count: int,
+    workers: int | None,
+    read_options: backends.ReadOptions | None,
+    io_config: blockio.IOConfig | None = None,
+) -> backends.ReadOptions:
+    """Bagi core antar file yang diproses bersamaan (untuk backend parallel)"""
+    read_options = read_options or backends.ReadOptions()
+    busy = min(count, job_workers(count, workers, io_config)) or 1
+    cores = max(1, (os.cpu_count() or 1) // busy)
+    return dataclasses.replace(read_options, cores=read_options.cores or cores)
+
+
+def job_config(
+    count: int, workers: int | None, io_config: blockio.IOConfig | None
+) -> blockio.IOConfig | None:
+    """Bagi anggaran memori antar file yang diproses bersamaan"""
+    busy = min(count, job_workers(count, workers, io_config)) or 1
+    return blockio.share_memory(io_config, busy)
+
+
+def _run_jobs(
+    func,
+    jobs: list[tuple],
+    workers: int | None = None,
+    io_config: blockio.IOConfig | None = None,
+) -> Iterator:
+    """Hasil func(*job) sesuai urutan jobs; paralel antar proses bila > 1 job"""
+    workers = job_workers(len(jobs), workers, io_config)
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(func, *job) for job in jobs]
+            for future in futures:
+                yield future.result()
+    else:
+        for job in jobs:
+            yield func(*job)
+
+
+def export_to_csv(
+    input_files: list[Path],
+    output_file: Path,
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+    workers: int | None = None,
+    read_options: backends.ReadOptions | None = None,
+):
+    """Ekspor ke CSV secara streaming (tanpa pandas, memori konstan)
+
+    Satu file input ditulis ke output_file; beberapa file input masing-masing
+    ditulis ke <output>_<nama file>.csv di folder yang sama, diproses paralel
+    (workers proses, default otomatis) karena tiap file/anggota arsip independen.
+    """
+
+    print("=" * 60)
+    print("DAT/DTA to CSV Exporter")
+    print("=" * 60)
+
+    found = [
+        (filepath, target)
+        for filepath, target in zip(input_files, _csv_targets(input_files, output_file))
+        if filepath.exists()
+    ]
+    for filepath in input_files:
+        if not filepath.exists():
+            print(f"\n  SKIP: {filepath} tidak ditemukan")
+    read_options = job_options(len(found), workers, read_options, io_config)
+    job_io = job_config(len(found), workers, io_config)
+    jobs = [
+        (filepath, target, job_io, encoding, read_options) for filepath, target in found
+    ]
+
+    for log in _run_jobs(_export_csv_file, jobs, workers, io_config):
+        print(log, end="")
+
+    print("\n" + "=" * 60)
+    print("Selesai!")
+    print("=" * 60)
+
+
+def _export_sheet_part(
+    filepath: Path,
+    part_path: Path,
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+    read_options: backends.ReadOptions | None = None,
+) -> tuple[xlsx.SheetPart | None, str]:
+    """Tulis satu file sebagai worksheet XML terkompresi; (part, log)"""
+    read_options = read_options or backends.ReadOptions()
+    log = io.StringIO()
+    part = None
+    with contextlib.redirect_stdout(log):
+        try:
+            fmt = detect_format(filepath.name, read_version(filepath))
+            print(f"\n  File: {filepath.name} ({fmt})")
+
+            started = time.perf_counter()
+            with blockio.staged(filepath, io_config) as local_path:
+                columns, rows = stream_rows(
+                    local_path, fmt, io_config, encoding, read_options
+                )
+                part = xlsx.write_sheet(part_path, columns, rows)
+            if read_options.stats:
+                elapsed = time.perf_counter() - started
+                _print_rate(part.rows, elapsed, blockio.source_size(filepath))
+
+        except blockio.READ_ERRORS as e:
+            print(f"  ERROR: {e}")
+    return part, log.getvalue()
+
+
+def export_to_excel(
+    input_files: list[Path],
+    output_file: Path,
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+    workers: int | None = None,
+    read_options: backends.ReadOptions | None = None,
+):
+    """Ekspor semua file ke satu Excel dengan multiple sheets
+
+    XML setiap sheet dibuat paralel (satu proses per file, tanpa pandas), lalu
+    dirangkai menjadi satu workbook.
+    """
 
     print("=" * 60)
     print("DAT/DTA to Excel Exporter")
     print("=" * 60)
 
-    with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
+    found = [p for p in input_files if p.exists()]
+    for filepath in input_files:
+        if filepath not in found:
+            print(f"\n  SKIP: {filepath} tidak ditemukan")
+    # Nama sheet dari nama file (max 31 char untuk Excel, dibuat unik)
+    names = xlsx.sheet_names([p.stem for p in found])
+    read_options = job_options(len(found), workers, read_options, io_config)
+    job_io = job_config(len(found), workers, io_config)
+
+    scratch = io_config.scratch_dir if io_config else None
+    with tempfile.TemporaryDirectory(prefix="datexp_", dir=scratch) as parts_dir:
+        jobs = [
+            (
+                filepath,
+                Path(parts_dir) / f"sheet{i}.xml",
+                job_io,
+                encoding,
+                read_options,
+            )
+            for i, filepath in enumerate(found, 1)
+        ]
+        sheets = []
+        for name, (part, log) in zip(
+            names, _run_jobs(_export_sheet_part, jobs, workers, io_config)
+        ):
+            print(log, end="")
+            if part is None:
+                continue
+            if part.rows:
+                sheets.append((name, part))
+                print(f"  Diekspor: {part.rows:,} baris -> sheet '{name}'")
+            else:
+                print("  SKIP: Tidak ada data")
+
+        if sheets:
+            xlsx.assemble(output_file, sheets)
+
+    print("\n" + "=" * 60)
+    if sheets:
+        print(f"Selesai! Output: {output_file}")
+    else:
+        print("Tidak ada data yang diekspor")
+    print("=" * 60)
+
+
+def export_to_sqlite(
+    input_files: list[Path],
+    output_file: Path,
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+    indexes: list[str] | None = None,
+    append: bool = False,
+    read_options: backends.ReadOptions | None = None,
+):
+    """Ekspor ke satu database SQLite, satu tabel per file input
+
+    dBase III dimuat ke tabel bertipe; dengan append=True hanya record baru
+    (setelah load sebelumnya) yang ditambahkan. Index dibuat setelah load.
+    """
+    import sqlite_export
+
+    print("=" * 60)
+    print("DAT/DTA to SQLite Exporter")
+    print("=" * 60)
+
+    conn = sqlite_export.connect(output_file)
+    try:
         for filepath in input_files:
             if not filepath.exists():
                 print(f"\n  SKIP: {filepath} tidak ditemukan")
                 continue
 
+            table = filepath.stem
             try:
-                df, format_type = detect_and_read(filepath)
+                fmt = detect_format(filepath.name, read_version(filepath))
+                print(f"\n  File: {filepath.name} ({fmt})")
+
+                with blockio.staged(filepath, io_config) as local_path:
+                    if fmt in ("stock", "tproduk"):
+                        columns, rows = stream_rows(
+                            local_path, fmt, io_config, encoding, read_options, True
+                        )
+                        count = sqlite_export.load_rows(
+                            conn, table, columns, rows, filepath
+                        )
+                        appended = False
+                    else:
+                        _warn_integrity(local_path, dbase.read_header(local_path))
+                        count, appended = sqlite_export.load_dbase(
+                            conn, local_path, table, io_config, encoding, append
+                        )
 
-                if df is not None and len(df) > 0:
-                    # Nama sheet dari nama file (max 31 char untuk Excel)
-                    sheet_name = filepath.stem[:31]
+                action = "Ditambahkan" if appended else "Diekspor"
+                print(f"  {action}: {count:,} baris -> tabel '{table}'")
 
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
-                    print(f"  Diekspor: {len(df):,} baris -> sheet '{sheet_name}'")
-                else:
-                    print("  SKIP: Tidak ada data")
+                for name in sqlite_export.create_indexes(conn, table, indexes or []):
+                    print(f"  Index: {name}")
 
-            except Exception as e:
+            except (*blockio.READ_ERRORS, sqlite3.Error) as e:
                 print(f"  ERROR: {e}")
+    finally:
+        sqlite_export.finish(conn)
 
     print("\n" + "=" * 60)
     print(f"Selesai! Output: {output_file}")
     print("=" * 60)
 
 
-def main():
+def _encoding_arg(value: str) -> str:
+    """Tipe argparse untuk --encoding"""
+    try:
+        return dbase.check_encoding(value)
+    except LookupError:
+        raise argparse.ArgumentTypeError(f"encoding tidak dikenal: {value}")
+
+
+def _size_arg(value: str) -> int:
+    """Tipe argparse untuk --max-memory"""
+    try:
+        size = blockio.parse_size(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    if size <= 0:
+        raise argparse.ArgumentTypeError(f"ukuran harus lebih dari 0: {value}")
+    return size
+
+
+def export_aggregate(
+    input_files: list[Path],
+    output_file: Path,
+    output_format: str,
+    group_by: list[str],
+    sums: list[str] | None = None,
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+    workers: int | None = None,
+):
+    """Ekspor ringkasan group-by (COUNT/SUM/MIN/MAX), bukan seluruh record"""
+    import aggregate
+
+    print("=" * 60)
+    print("DAT/DTA Group-By Summary")
+    print("=" * 60)
+
+    results = []
+    targets = _csv_targets(input_files, output_file)
+    for filepath, target in zip(input_files, targets):
+        if not filepath.exists():
+            print(f"\n  SKIP: {filepath} tidak ditemukan")
+            continue
+
+        try:
+            print(f"\n  File: {filepath.name}")
+            with blockio.staged(filepath, io_config) as local_path:
+                result = aggregate.group_by(
+                    local_path, group_by, sums, encoding, io_config, workers
+                )
+            print(f"  Ringkasan: {len(result.rows):,} grup")
+            results.append((filepath, target, result))
+        except blockio.READ_ERRORS as e:
+            print(f"  ERROR: {e}")
+
+    if output_format == "csv":
+        for _, target, result in results:
+            _write_csv(target, result.columns, result.rows)
+            print(f"  Diekspor -> {target.name}")
+    elif results:
+        import pandas as pd
+
+        with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
+            for filepath, _, result in results:
+                sheet_name = filepath.stem[:31]
+                result.to_pandas().to_excel(writer, sheet_name=sheet_name, index=False)
+        print(f"  Diekspor -> {output_file.name}")
+
+    print("\n" + "=" * 60)
+    print("Selesai!")
+    print("=" * 60)
+
+
+def export_join(
+    input_files: list[Path],
+    output_file: Path,
+    output_format: str,
+    stock_file: Path,
+    on: str,
+    how: str = "inner",
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+    read_options: backends.ReadOptions | None = None,
+):
+    """Join record dBase dengan barcode STOCK1.DAT, hasil ditulis langsung
+
+    Indeks barcode dibangun sekali dari stock_file; setiap file input dialirkan
+    chunk demi chunk ke writer (CSV/SQLite streaming, xlsx satu sheet per file).
+    """
+    import join
+
+    print("=" * 60)
+    print("DAT/DTA x STOCK Join")
+    print("=" * 60)
+
+    with blockio.staged(stock_file, io_config) as local_path:
+        index = join.StockIndex.from_file(
+            local_path,
+            io_config,
+            encoding,
+            read_options.stock_layout if read_options else None,
+        )
+    print(f"\n  Indeks STOCK: {len(index):,} barcode ({index.nbytes / 1024:,.0f} KB)")
+    if index.duplicates:
+        print(
+            f"  Peringatan: {index.duplicates:,} barcode ganda (dipakai yang pertama)"
+        )
+
+    conn = parts_dir = None
+    sheets = []
+    if output_format == "xlsx":
+        # Sheet ditulis ke scratch per file lalu dirangkai (tanpa DataFrame)
+        scratch = io_config.scratch_dir if io_config else None
+        parts_dir = tempfile.TemporaryDirectory(prefix="datexp_", dir=scratch)
+    elif output_format == "sqlite":
+        import sqlite_export
+
+        conn = sqlite_export.connect(output_file)
+
+    targets = _csv_targets(input_files, output_file)
+    try:
+        for filepath, target in zip(input_files, targets):
+            if not filepath.exists():
+                print(f"\n  SKIP: {filepath} tidak ditemukan")
+                continue
+            # Dengan -d, file STOCK/TPRODUK ikut terdaftar sebagai input
+            fmt = detect_format(filepath.name, read_version(filepath))
+            if fmt in ("stock", "tproduk"):
+                continue
+
+            try:
+                print(f"\n  File: {filepath.name}")
+                with blockio.staged(filepath, io_config) as local_path:
+                    columns, rows = join.join_rows(
+                        local_path, index, on, how, io_config, encoding
+                    )
+                    if output_format == "csv":
+                        count = _write_csv(target, columns, rows)
+                        destination = target.name
+                    elif output_format == "sqlite":
+                        count = sqlite_export.load_rows(
+                            conn, filepath.stem, columns, rows, filepath
+                        )
+                        destination = f"tabel '{filepath.stem}'"
+                    else:
+                        part_path = Path(parts_dir.name) / f"sheet{len(sheets) + 1}.xml"
+                        part = xlsx.write_sheet(part_path, columns, rows)
+                        sheets.append((filepath.stem, part))
+                        count = part.rows
+                        destination = f"sheet '{filepath.stem[:31]}'"
+                print(f"  Di-join: {count:,} baris -> {destination}")
+            except (*blockio.READ_ERRORS, sqlite3.Error) as e:
+                print(f"  ERROR: {e}")
+        if sheets:
+            names = xlsx.sheet_names([stem for stem, _ in sheets])
+            xlsx.assemble(output_file, list(zip(names, [p for _, p in sheets])))
+    finally:
+        if parts_dir is not None:
+            parts_dir.cleanup()
+        if conn is not None:
+            sqlite_export.finish(conn)
+
+    print("\n" + "=" * 60)
+    print(f"Selesai! Output: {output_file}")
+    print("=" * 60)
+
+
+def inspect_main(argv: list[str]):
+    """Subcommand inspect: inventaris header file tanpa membaca isi record"""
+    import inventory
+
+    parser = argparse.ArgumentParser(
+        prog="exporter.py inspect",
+        description="Scan header file DAT/DTA (format, struktur, jumlah record, "
+        "ukuran) tanpa membaca isi record",
+    )
+    parser.add_argument(
+        "paths", nargs="*", default=["."], help="File atau direktori (default: .)"
+    )
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    parser.add_argument(
+        "--fields", action="store_true", help="Tampilkan struktur field per file"
+    )
+    parser.add_argument(
+        "--no-recursive", action="store_true", help="Jangan masuk ke subdirektori"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=inventory.SCAN_WORKERS,
+        help=f"Jumlah thread scan (default: {inventory.SCAN_WORKERS})",
+    )
+    args = parser.parse_args(argv)
+
+    files = inventory.find_files(args.paths, recursive=not args.no_recursive)
+    infos = inventory.scan(files, args.workers)
+    if args.json:
+        print(inventory.to_json(infos))
+    elif infos:
+        print(inventory.to_table(infos, args.fields))
+    else:
+        print("Tidak ada file DAT/DTA ditemukan!")
+
+
+def check_main(argv: list[str]):
+    """Subcommand check: validasi integritas file dBase dan pemulihan opsional"""
+    import integrity
+    import inventory
+
+    parser = argparse.ArgumentParser(
+        prog="exporter.py check",
+        description="Periksa file dBase III yang terpotong/rusak (ukuran vs header, "
+        "deletion flag setiap record) dan pulihkan record yang valid",
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="File .DTA atau direktori (dicari rekursif)"
+    )
+    parser.add_argument(
+        "--recover",
+        metavar="DIR",
+        help="Tulis salinan file bermasalah ke DIR berisi record valid saja",
+    )
+    args = parser.parse_args(argv)
+
+    problems = 0
+    for filepath in inventory.find_files(args.paths):
+        info = inventory.inspect_file(filepath)
+        if info.format != "dbase3":
+            continue
+        print(f"\n  File: {filepath}")
+        try:
+            header = dbase.read_header(filepath)
+            report = integrity.scan(filepath, header)
+        except (OSError, ValueError) as e:
+            print(f"  ERROR: {e}")
+            problems += 1
+            continue
+
+        if report.ok:
+            print(f"  OK: {report.num_records:,} record")
+            continue
+        problems += 1
+        for message in report.warnings():
+            print(f"  PERINGATAN: {message}")
+
+        if args.recover:
+            out_dir = Path(args.recover)
+            out_dir.mkdir(parents=True, exist_ok=True)
+            target = out_dir / filepath.name
+            if target.resolve() == filepath.resolve():
+                print("  SKIP: direktori pemulihan sama dengan direktori sumber")
+                continue
+            result = integrity.recover(filepath, target, header)
+            print(
+                f"  Dipulihkan: {result.recovered:,} record -> {target} "
+                f"({result.skipped_bytes:,} byte dilewati, "
+                f"{len(result.resyncs)} kali sinkron ulang)"
+            )
+
+    print(f"\n  {problems} file bermasalah")
+    return 1 if problems else 0
+
+
+def _snapshot_source(path: str, name: str):
+    """Path snapshot; arsip backup -> anggota bernama sama dengan file baru"""
+    import archive
+
+    if not archive.is_archive(path):
+        return Path(path)
+    for member in archive.members(path):
+        if member.name.upper() == name.upper():
+            return member
+    raise ValueError(f"{name} tidak ada di arsip {path}")
+
+
+def diff_main(argv: list[str]):
+    """Subcommand diff: record baru/ubah/hapus antara dua snapshot tabel"""
+    import changes
+
+    parser = argparse.ArgumentParser(
+        prog="exporter.py diff",
+        description="Bandingkan snapshot lama dan baru dari tabel yang sama "
+        "(TJUAL.DTA, STOCK1.DAT); hanya blok record yang hash-nya berubah "
+        "yang dibaca dan di-decode",
+    )
+    parser.add_argument("old", help="Snapshot lama (file atau arsip .zip/.gz)")
+    parser.add_argument("new", help="Snapshot baru (file saat ini)")
+    parser.add_argument("-o", "--output", default="perubahan.csv", help="CSV perubahan")
+    parser.add_argument(
+        "--key",
+        type=lambda value: [v.strip() for v in value.split(",") if v.strip()],
+        help="Kolom kunci unik (mis. KODE atau BARCODE); default: per posisi record",
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="DIR",
+        help="Simpan salinan snapshot baru (+ hash blok) ke DIR untuk diff berikutnya",
+    )
+    parser.add_argument(
+        "--block-records",
+        type=int,
+        default=changes.BLOCK_RECORDS,
+        help=f"Record per blok hash (default: {changes.BLOCK_RECORDS})",
+    )
+    parser.add_argument(
+        "--encoding", type=_encoding_arg, help="Codepage teks (default: dari header)"
+    )
+    parser.add_argument(
+        "--stock-layout",
+        metavar="FILE",
+        help="Skema JSON field STOCK1.DAT (sama seperti pada ekspor)",
+    )
+    parser.add_argument(
+        "--cache-hashes",
+        action="store_true",
+        help="Simpan hash blok snapshot lama di sidecar (*.blocks.json) di "
+        "sampingnya; default hanya di folder --snapshot",
+    )
+    args = parser.parse_args(argv)
+    if args.block_records <= 0:
+        parser.error("--block-records harus lebih dari 0")
+    stock_layout = None
+    if args.stock_layout:
+        try:
+            stock_layout = stock.load_layout(args.stock_layout)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+
+    new = Path(args.new)
+    try:
+        old = _snapshot_source(args.old, new.name)
+        result = changes.diff(
+            old,
+            new,
+            args.block_records,
+            args.key,
+            encoding=args.encoding,
+            snapshot_dir=args.snapshot,
+            stock_layout=stock_layout,
+            cache_hashes=args.cache_hashes,
+        )
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    count = _write_csv(Path(args.output), result.columns, result.rows)
+    counts = result.counts()
+    source = "sidecar" if result.cached else "dihitung"
+    print(
+        f"Blok berubah: {result.changed_blocks:,} dari {result.blocks:,} "
+        f"(hash snapshot lama {source})"
+    )
+    print(
+        f"Perubahan: {counts[changes.INSERTED]:,} baru, "
+        f"{counts[changes.UPDATED]:,} diubah, {counts[changes.DELETED]:,} dihapus"
+        f" -> {args.output} ({count:,} baris)"
+    )
+    if args.snapshot:
+        print(f"Snapshot disimpan: {Path(args.snapshot) / new.name}")
+    return 0
+
+
+def _find_inputs(dir_path: Path) -> list[Path]:
+    """File DAT/DTA dan arsip di satu folder (tanpa duplikat di FS case-insensitive)"""
+    found = []
+    for pattern in INPUT_PATTERNS:
+        found += dir_path.glob(pattern)
+    return list(dict.fromkeys(found))
+
+
+def batch_main(argv: list[str]):
+    """Subcommand batch: konversi banyak file dari manifest, bisa dilanjutkan"""
+    import batch
+
+    parser = argparse.ArgumentParser(
+        prog="exporter.py batch",
+        description="Ekspor banyak file sesuai manifest JSON (pola input, opsi dan "
+        "output per file). File yang sudah selesai dicatat di checkpoint sehingga "
+        "run yang terhenti cukup dijalankan ulang",
+    )
+    parser.add_argument("manifest", help="File manifest JSON")
+    parser.add_argument(
+        "--workers", type=int, help="Jumlah proses paralel (default: jumlah core)"
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Abaikan checkpoint dan ekspor ulang semua file",
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=_size_arg,
+        help="Batas memori untuk semua worker, mis. 512M atau 2G",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        tasks = batch.load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        return 1
+    checkpoint = batch.Checkpoint(batch.checkpoint_path(args.manifest))
+    if args.restart:
+        checkpoint.reset()
+
+    skipped = sum(checkpoint.is_done(task) for task in tasks)
+    print(f"{len(tasks):,} file di manifest, {skipped:,} sudah selesai (checkpoint)")
+
+    def report(result):
+        print(result.log, end="")
+        if result.error:
+            print(f"  ERROR: {result.task.input}: {result.error}")
+        else:
+            print(
+                f"  OK: {result.task.input} -> {result.task.output} "
+                f"({result.rows:,} baris)"
+            )
+
+    io_config = blockio.IOConfig(max_memory=args.max_memory)
+    results = batch.run(tasks, checkpoint, args.workers, io_config, progress=report)
+    failed = sum(result.error is not None for result in results)
+    print(
+        f"\nSelesai: {len(results) - failed:,} diekspor, {skipped:,} dilewati, "
+        f"{failed:,} gagal"
+    )
+    return 1 if failed else 0
+
+
+def calibrate_main(argv: list[str]):
+    """Subcommand calibrate: ukur throughput backend pembaca di host ini"""
+    parser = argparse.ArgumentParser(
+        prog="exporter.py calibrate",
+        description="Ukur throughput setiap backend pembaca dBase (sekali per host); "
+        "hasilnya dipakai --backend auto",
+    )
+    parser.add_argument(
+        "--records",
+        type=int,
+        default=backends.CALIBRATION_RECORDS,
+        help=f"Jumlah record file uji (default: {backends.CALIBRATION_RECORDS:,})",
+    )
+    parser.add_argument("--scratch-dir", help="Direktori untuk file uji sementara")
+    args = parser.parse_args(argv)
+
+    def report(name, mode, throughput, overhead):
+        print(
+            f"  {name:<11} {mode:<6} {throughput / blockio.MB:>8,.1f} MB/s"
+            f"  overhead {overhead * 1000:,.1f} ms"
+        )
+
+    print(f"Kalibrasi backend ({os.cpu_count() or 1} core)...")
+    profile = backends.calibrate(args.records, args.scratch_dir, report)
+    backends.save_profile(profile)
+    print(f"Profil disimpan: {backends.PROFILE_PATH}")
+
+
+def main(argv: list[str] | None = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["inspect"]:
+        return inspect_main(argv[1:])
+    if argv[:1] == ["check"]:
+        return check_main(argv[1:])
+    if argv[:1] == ["calibrate"]:
+        return calibrate_main(argv[1:])
+    if argv[:1] == ["diff"]:
+        return diff_main(argv[1:])
+    if argv[:1] == ["batch"]:
+        return batch_main(argv[1:])
+
     parser = argparse.ArgumentParser(
         description="Ekspor file DAT/DTA ke Excel",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -250,38 +1133,169 @@ Contoh penggunaan:
   uv run exporter.py                     # Ekspor semua file di folder saat ini
   uv run exporter.py -i data.DTA         # Ekspor file tertentu
   uv run exporter.py -o hasil.xlsx       # Tentukan nama output
+  uv run exporter.py -i TJUAL.DTA -o jual.csv  # Ekspor cepat ke CSV
+  uv run exporter.py -d Z:\\DATA -o data.db --index TANGGAL  # Ke SQLite
+  uv run exporter.py -i TJUAL.DTA -o data.db --append  # Tambah record baru saja
+  uv run exporter.py -i TJUAL.DTA --group-by TANGGAL --sum JUMLAH  # Total harian
+  uv run exporter.py -i TJUAL.DTA --join-stock STOCK1.DAT --on KODE -o jual.csv
+  uv run exporter.py -i TJUAL.DTA --sort-by TANGGAL,NOTA -o jual.csv  # Terurut
   uv run exporter.py -d /path/to/folder  # Ekspor dari folder tertentu
+  uv run exporter.py inspect Z:\\DATA      # Inventaris header (cepat, tanpa ekspor)
+  uv run exporter.py check Z:\\DATA --recover pulih  # Cek file terpotong/rusak
+  uv run exporter.py calibrate           # Ukur backend pembaca (sekali per host)
+  uv run exporter.py diff kemarin\\TJUAL.DTA Z:\\DATA\\TJUAL.DTA --snapshot kemarin
+                                         # Record baru/ubah/hapus sejak snapshot
+  uv run exporter.py batch bulanan.json  # Banyak file dari manifest (bisa dilanjutkan)
+  uv run exporter.py -d Z:\\DATA --io-strategy auto  # Share lambat: salin lokal dulu
         """,
     )
 
     parser.add_argument("-i", "--input", nargs="+", help="File input (bisa multiple)")
     parser.add_argument(
-        "-o", "--output", default="output.xlsx", help="File output Excel"
+        "-o", "--output", default="output.xlsx", help="File output Excel/CSV/SQLite"
     )
     parser.add_argument("-d", "--directory", help="Direktori berisi file DAT/DTA")
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=["xlsx", "csv", "sqlite"],
+        help="Format output (default: dari ekstensi output, atau xlsx). "
+        "csv dan sqlite ditulis streaming tanpa pandas",
+    )
+    parser.add_argument(
+        "--encoding",
+        type=_encoding_arg,
+        help="Codepage teks (mis. cp437, cp850). Default: dari language driver "
+        f"byte header dBase, atau {dbase.DEFAULT_ENCODING}",
+    )
 
-    args = parser.parse_args()
+    sqlite_group = parser.add_argument_group("SQLite")
+    sqlite_group.add_argument(
+        "--index",
+        nargs="+",
+        metavar="FIELD[,FIELD]",
+        help="Buat index setelah load (koma untuk index gabungan)",
+    )
+    sqlite_group.add_argument(
+        "--append",
+        action="store_true",
+        help="Hanya tambahkan record baru sejak load sebelumnya (file dBase)",
+    )
+
+    agg_group = parser.add_argument_group("Agregasi (hanya tabel ringkasan)")
+    agg_group.add_argument(
+        "--group-by",
+        nargs="+",
+        metavar="FIELD",
+        help="Kelompokkan record berdasarkan kolom ini (COUNT per grup)",
+    )
+    agg_group.add_argument(
+        "--sum",
+        nargs="+",
+        metavar="FIELD",
+        help="Kolom angka untuk SUM/MIN/MAX per grup (butuh --group-by)",
+    )
+    agg_group.add_argument(
+        "--workers",
+        type=int,
+        help="Jumlah proses paralel untuk agregasi dan ekspor CSV/xlsx beberapa "
+        "file/anggota arsip (default: otomatis)",
+    )
+
+    join_group = parser.add_argument_group("Join dengan STOCK1.DAT")
+    join_group.add_argument(
+        "--join-stock",
+        metavar="FILE",
+        help="File STOCK1.DAT yang barcode-nya dicocokkan dengan record input",
+    )
+    join_group.add_argument(
+        "--on", metavar="FIELD", help="Kolom barcode di file input (butuh --join-stock)"
+    )
+    join_group.add_argument(
+        "--left-join",
+        action="store_true",
+        help="Tetap tulis record yang barcode-nya tidak ada di STOCK",
+    )
+
+    backend_group = parser.add_argument_group("Backend pembaca (ekspor CSV/xlsx)")
+    backend_group.add_argument(
+        "--backend",
+        choices=(backends.AUTO, *backends.NAMES),
+        default=backends.AUTO,
+        help="auto: pilih yang tercepat menurut profil 'exporter.py calibrate', "
+        "berdasarkan ukuran file, tipe field dan jumlah core",
+    )
+    backend_group.add_argument(
+        "--stats",
+        action="store_true",
+        help="Tampilkan backend terpilih beserta alasannya dan throughput baca",
+    )
+
+    parser.add_argument(
+        "--sort-by",
+        metavar="FIELD[,FIELD]",
+        help="Urutkan record dBase (CSV/xlsx) dengan external merge sort; memori "
+        "mengikuti --max-memory, run sementara ditulis ke --scratch-dir",
+    )
+    parser.add_argument(
+        "--stock-layout",
+        metavar="FILE",
+        help="Skema JSON field STOCK1.DAT (nama, offset, tipe struct); "
+        'default BARCODE dan VALUE, "raw": true menambah kolom RAW_DATA',
+    )
+
+    io_group = parser.add_argument_group("I/O (untuk share jaringan)")
+    io_group.add_argument(
+        "--block-size",
+        type=float,
+        default=blockio.DEFAULT_BLOCK_SIZE / blockio.MB,
+        help="Ukuran blok baca dalam MB (default: 8)",
+    )
+    io_group.add_argument(
+        "--readahead",
+        type=int,
+        default=blockio.DEFAULT_READAHEAD,
+        help="Jumlah blok yang dibaca lebih dulu di background (0 = nonaktif)",
+    )
+    io_group.add_argument(
+        "--io-strategy",
+        choices=blockio.STRATEGIES,
+        default="direct",
+        help="direct: baca langsung, local: salin ke scratch lokal dulu, "
+        "auto: pilih berdasarkan throughput terukur",
+    )
+    io_group.add_argument("--scratch-dir", help="Direktori scratch untuk salinan lokal")
+    io_group.add_argument(
+        "--max-memory",
+        type=_size_arg,
+        help="Batas memori ekspor, mis. 512M atau 2G: ukuran chunk decode dan "
+        "jumlah proses disesuaikan, data antara ditulis ke --scratch-dir",
+    )
+
+    args = parser.parse_args(argv)
+    if args.sum and not args.group_by:
+        parser.error("--sum membutuhkan --group-by")
+    if bool(args.join_stock) != bool(args.on):
+        parser.error("--join-stock dan --on harus dipakai bersama")
+    if args.join_stock and args.group_by:
+        parser.error("--join-stock tidak bisa digabung dengan --group-by")
+    # NaN/inf lolos type=float; blok di bawah 1 byte membuat read_all gagal
+    block_size = args.block_size * blockio.MB
+    if not math.isfinite(block_size) or block_size < 1:
+        parser.error("--block-size harus lebih dari 0")
+    if args.readahead < 0:
+        parser.error("--readahead tidak boleh negatif")
 
     # Tentukan file input
     if args.input:
         input_files = [Path(f) for f in args.input]
     elif args.directory:
-        dir_path = Path(args.directory)
-        input_files = (
-            list(dir_path.glob("*.DAT"))
-            + list(dir_path.glob("*.DTA"))
-            + list(dir_path.glob("*.dat"))
-            + list(dir_path.glob("*.dta"))
-        )
+        input_files = _find_inputs(Path(args.directory))
     else:
         # Default: cari di parent directory (untuk struktur project uv)
-        parent = Path(__file__).parent.parent
-        input_files = (
-            list(parent.glob("*.DAT"))
-            + list(parent.glob("*.DTA"))
-            + list(parent.glob("*.dat"))
-            + list(parent.glob("*.dta"))
-        )
+        input_files = _find_inputs(Path(__file__).parent.parent)
+    # Arsip .zip/.gz dibaca langsung: setiap anggota DAT/DTA menjadi satu input
+    input_files = archive.expand(input_files)
 
     if not input_files:
         print("Tidak ada file DAT/DTA ditemukan!")
@@ -297,8 +1311,98 @@ Contoh penggunaan:
     if not output_file.is_absolute():
         output_file = Path.cwd() / output_file
 
-    export_to_excel(input_files, output_file)
+    io_config = blockio.config_from_args(args)
+    stock_layout = None
+    if args.stock_layout:
+        try:
+            stock_layout = stock.load_layout(args.stock_layout)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+    sort_by = ()
+    if args.sort_by:
+        import extsort
+
+        try:
+            sort_by = tuple(extsort.parse_fields(args.sort_by))
+        except ValueError as e:
+            parser.error(str(e))
+    read_options = backends.ReadOptions(
+        args.backend, args.stats, stock_layout=stock_layout, sort_by=sort_by
+    )
+    suffix = output_file.suffix.lower()
+    if args.format:
+        output_format = args.format
+    elif suffix == ".csv":
+        output_format = "csv"
+    elif suffix in SQLITE_SUFFIXES:
+        output_format = "sqlite"
+    else:
+        output_format = "xlsx"
+    if output_format == "csv" and suffix != ".csv":
+        output_file = output_file.with_suffix(".csv")
+    elif output_format == "sqlite" and suffix not in SQLITE_SUFFIXES:
+        output_file = output_file.with_suffix(".db")
+    if (args.index or args.append) and output_format != "sqlite":
+        parser.error("--index dan --append hanya untuk output SQLite")
+    if args.group_by and output_format == "sqlite":
+        parser.error("--group-by hanya mendukung output xlsx atau csv")
+    if args.sort_by and (output_format == "sqlite" or args.group_by or args.join_stock):
+        parser.error(
+            "--sort-by hanya untuk ekspor CSV/xlsx (tanpa --group-by/--join-stock)"
+        )
+
+    if args.join_stock:
+        export_join(
+            input_files,
+            output_file,
+            output_format,
+            Path(args.join_stock),
+            args.on,
+            "left" if args.left_join else "inner",
+            io_config,
+            args.encoding,
+            read_options,
+        )
+    elif args.group_by:
+        export_aggregate(
+            input_files,
+            output_file,
+            output_format,
+            args.group_by,
+            args.sum,
+            io_config,
+            args.encoding,
+            args.workers,
+        )
+    elif output_format == "csv":
+        export_to_csv(
+            input_files,
+            output_file,
+            io_config,
+            args.encoding,
+            args.workers,
+            read_options,
+        )
+    elif output_format == "sqlite":
+        export_to_sqlite(
+            input_files,
+            output_file,
+            io_config,
+            args.encoding,
+            args.index,
+            args.append,
+            read_options,
+        )
+    else:
+        export_to_excel(
+            input_files,
+            output_file,
+            io_config,
+            args.encoding,
+            args.workers,
+            read_options,
+        )
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
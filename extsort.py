@@ -0,0 +1,217 @@
+"""
+Ekspor terurut file dBase III dengan external merge sort
+Setiap chunk record diurutkan pada byte mentah field kunci (lebar tetap) lalu
+ditulis sebagai run terurut ke direktori scratch. Run digabung (k-way merge)
+langsung ke writer streaming, jadi memori tetap terbatas berapa pun ukuran file;
+run yang lebih banyak dari MERGE_FAN_IN digabung dulu secara bertahap agar
+jumlah file yang terbuka juga terbatas.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import heapq
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+
+import aggregate
+import blockio
+import columnar
+import dbase
+
+# Anggaran memori sort tanpa --max-memory
+SORT_MEMORY = 256 * blockio.MB
+# Buffer baca maksimum per run saat merge
+MERGE_BUFFER = blockio.MB
+# Run maksimum yang digabung sekaligus (file terbuka); lebih banyak: beberapa tahap
+MERGE_FAN_IN = 64
+# Record per batch decode saat menulis hasil
+OUTPUT_RECORDS = 65536
+# Nomor record (big-endian) setelah kunci: urutan stabil saat kunci sama
+ORDINAL_SIZE = 8
+
+
+def parse_fields(value: str) -> list[str]:
+    """'TANGGAL,NOTA' -> ['TANGGAL', 'NOTA']"""
+    fields = [name.strip() for name in value.split(",") if name.strip()]
+    if not fields:
+        raise ValueError("Minimal satu kolom untuk pengurutan diperlukan")
+    return fields
+
+
+def sort_memory(io_config: blockio.IOConfig | None) -> int:
+    if io_config is not None and io_config.max_memory:
+        return io_config.max_memory
+    return SORT_MEMORY
+
+
+def run_records(memory: int, record_size: int, key_size: int) -> int:
+    """Jumlah record per run agar chunk, item terurut dan indeksnya muat di memory"""
+    item_size = key_size + ORDINAL_SIZE + record_size
+    # Chunk + item + item terurut + argsort
+    per_record = record_size + 2 * item_size + 8
+    return max(1, blockio.MIN_BLOCK_SIZE // record_size, memory // per_record)
+
+
+def sort_chunk(
+    chunk: bytes,
+    header: dbase.DbfHeader,
+    key_fields: list[dbase.DbfField],
+    first: int,
+) -> np.ndarray:
+    """Item terurut (kunci + nomor record + record) untuk satu chunk
+
+    first adalah nomor record pertama chunk. Record bertanda hapus ikut
+    diurutkan, sama seperti ekspor tanpa --sort-by.
+    """
+    matrix = columnar.record_matrix(chunk, header.record_size)
+    ordinals = np.arange(first, first + len(matrix), dtype=">u8")
+
+    keys = aggregate.key_column(matrix, key_fields)
+    key_size = keys.dtype.itemsize
+    items = np.empty(
+        (len(matrix), key_size + ORDINAL_SIZE + header.record_size), dtype=np.uint8
+    )
+    items[:, :key_size] = keys.view(np.uint8).reshape(len(matrix), key_size)
+    items[:, key_size : key_size + ORDINAL_SIZE] = ordinals.view(np.uint8).reshape(
+        -1, ORDINAL_SIZE
+    )
+    items[:, key_size + ORDINAL_SIZE :] = matrix
+    return items[np.argsort(keys, kind="stable")]
+
+
+def _spill(items: np.ndarray, path: Path) -> Path:
+    with open(path, "wb") as f:
+        f.write(items.data)
+    return path
+
+
+def _iter_run(path: Path, item_size: int, buffer_size: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while block := f.read(buffer_size):
+            for pos in range(0, len(block), item_size):
+                yield block[pos : pos + item_size]
+
+
+def _merged(paths: list[Path], item_size: int, memory: int) -> Iterator[bytes]:
+    """k-way merge semua run; item dibandingkan utuh (kunci lalu nomor record)"""
+    buffer_size = min(MERGE_BUFFER, memory // (2 * len(paths)))
+    buffer_size = max(1, buffer_size // item_size) * item_size
+    return heapq.merge(*(_iter_run(p, item_size, buffer_size) for p in paths))
+
+
+def _merge_pass(
+    paths: list[Path], item_size: int, memory: int, tmp: Path, level: int
+) -> list[Path]:
+    """Gabung setiap MERGE_FAN_IN run menjadi satu run baru (run lama dihapus)"""
+    merged = []
+    for start in range(0, len(paths), MERGE_FAN_IN):
+        group = paths[start : start + MERGE_FAN_IN]
+        if len(group) == 1:
+            merged.append(group[0])
+            continue
+        path = tmp / f"merge{level}_{len(merged)}.bin"
+        with open(path, "wb", buffering=MERGE_BUFFER) as f:
+            f.writelines(_merged(group, item_size, memory))
+        for run in group:
+            run.unlink()
+        merged.append(path)
+    return merged
+
+
+def _batches(
+    items: Iterator[bytes], item_size: int, count: int
+) -> Iterator[np.ndarray]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= count:
+            yield np.frombuffer(b"".join(batch), dtype=np.uint8).reshape(-1, item_size)
+            batch = []
+    if batch:
+        yield np.frombuffer(b"".join(batch), dtype=np.uint8).reshape(-1, item_size)
+
+
+def _rows(
+    batches: Iterator[np.ndarray], header: dbase.DbfHeader, prefix: int, encoding: str
+):
+    for items in batches:
+        chunk = np.ascontiguousarray(items[:, prefix:])
+        columns = columnar.decode_chunk(chunk, header, encoding)
+        yield from zip(*(c.tolist() for c in columns))
+
+
+def sorted_rows(
+    filepath,
+    header: dbase.DbfHeader,
+    sort_by: list[str],
+    encoding: str | None = None,
+    io_config: blockio.IOConfig | None = None,
+) -> Iterator[tuple]:
+    """Baris file dBase terurut menurut sort_by (urutan asli jika kunci sama)
+
+    Perbandingan memakai byte mentah: teks, tanggal (YYYYMMDD) dan angka
+    non-negatif (rata kanan) terurut benar. Kolom yang tidak ada langsung
+    menghasilkan ValueError, sebelum file output dibuat.
+    """
+    key_fields = aggregate.resolve_fields(header, sort_by)
+    return _sorted_rows(
+        filepath, header, key_fields, encoding or header.encoding, io_config
+    )
+
+
+def _sorted_rows(filepath, header, key_fields, encoding, io_config):
+    record_size = header.record_size
+    key_size = sum(f.length for f in key_fields)
+    prefix = key_size + ORDINAL_SIZE
+    item_size = prefix + record_size
+    memory = sort_memory(io_config)
+
+    # Satu chunk = satu run; read-ahead dimatikan agar hanya satu chunk di memori
+    records = run_records(memory, record_size, key_size)
+    read_config = dataclasses.replace(
+        io_config or blockio.IOConfig(),
+        block_size=records * record_size,
+        readahead=0,
+        max_memory=None,
+    )
+    output_records = max(
+        1, min(OUTPUT_RECORDS, memory // 4 // (item_size + header.decoded_size))
+    )
+    scratch = io_config.scratch_dir if io_config else None
+
+    with tempfile.TemporaryDirectory(prefix="datexp_sort_", dir=scratch) as tmp:
+        paths = []
+        pending = None  # Run terakhir; ditulis ke disk hanya jika ada run berikutnya
+        first = 0
+        for chunk in dbase.iter_record_chunks(filepath, header, read_config):
+            if pending is not None:
+                paths.append(_spill(pending, Path(tmp) / f"run{len(paths)}.bin"))
+                pending = None
+            pending = sort_chunk(chunk, header, key_fields, first)
+            first += len(chunk) // record_size
+
+        if not paths:
+            # Muat dalam satu run: tidak perlu menulis ke disk
+            if pending is not None:
+                batches = (
+                    pending[start : start + output_records]
+                    for start in range(0, len(pending), output_records)
+                )
+                yield from _rows(batches, header, prefix, encoding)
+            return
+
+        paths.append(_spill(pending, Path(tmp) / f"run{len(paths)}.bin"))
+        pending = None
+        # Batasi file yang terbuka bersamaan: gabung bertahap sampai <= fan-in
+        level = 0
+        while len(paths) > MERGE_FAN_IN:
+            paths = _merge_pass(paths, item_size, memory, Path(tmp), level)
+            level += 1
+        merged = _merged(paths, item_size, memory)
+        yield from _rows(
+            _batches(merged, item_size, output_records), header, prefix, encoding
+        )
@@ -0,0 +1,32 @@
+"""
+Deteksi format file sumber (dBase III, STOCK1.DAT, TPRODUK1.DAT)
+Modul kecil tanpa dependensi CLI agar bisa dipakai inventory/changes tanpa
+memuat exporter.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import blockio
+
+
+def read_version(filepath: Path) -> int | None:
+    """Byte versi (byte pertama file), None jika file kosong"""
+    with blockio.open_source(filepath) as f:
+        header = f.read(10)
+    return header[0] if header else None
+
+
+def detect_format(filename: str, version: int | None) -> str:
+    """Deteksi format: 'dbase3', 'stock', 'tproduk', atau 'unknown'"""
+    filename = filename.upper()
+
+    # Deteksi berdasarkan ekstensi dan header
+    if filename.endswith(".DTA") and version == 0x03:
+        return "dbase3"
+    elif filename == "STOCK1.DAT":
+        return "stock"
+    elif filename == "TPRODUK1.DAT":
+        return "tproduk"
+    return "unknown"
@@ -0,0 +1,348 @@
+"""
+Pemeriksaan integritas dan pemulihan file dBase III
+Cek ukuran vs header (O(1), dipakai setiap baca), validasi deletion flag semua
+record secara vektor, dan pemulihan yang menyinkronkan ulang ke batas record valid.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import blockio
+import dbase
+
+# numpy diimpor di dalam scan/recover agar cek ukuran (dipakai setiap baca,
+# termasuk jalur CSV tanpa pandas/numpy) tetap ringan
+
+# Deletion flag yang sah: spasi (aktif) dan '*' (terhapus)
+VALID_FLAGS = (0x20, 0x2A)
+# Area rusak yang dipisah kurang dari sekian record valid dianggap satu area
+MERGE_GAP = 8
+# Resync: sekian record berturut-turut harus valid di offset baru
+RESYNC_WINDOW = 8
+# Jumlah record yang divalidasi sekaligus saat pemulihan
+RECOVER_BLOCK = 65536
+# Record sehat di awal dan akhir data untuk mempelajari field C
+PROFILE_RECORDS = 256
+MAX_LISTED_REGIONS = 5
+
+# Karakter yang sah per tipe field (isi field C/M tidak dicek, lihat _Validator)
+PLAUSIBLE_BYTES = {
+    "N": b"0123456789 .-+*",
+    "F": b"0123456789 .-+eE*",
+    "D": b"0123456789 ",
+    "L": b"TtFfYyNn? ",
+}
+
+
+@dataclass
+class IntegrityReport:
+    """Hasil pemeriksaan satu file"""
+
+    path: str
+    size: int
+    num_records: int  # Menurut header
+    records_in_file: int  # Record utuh yang ada secara fisik
+    trailing_bytes: int  # Sisa byte setelah record utuh terakhir (tanpa EOF)
+    eof_at: int | None = None  # EOF 0x1A sebelum num_records
+    bad_regions: list[tuple[int, int]] = field(default_factory=list)
+    scanned: bool = False  # True jika flag semua record sudah divalidasi
+
+    @property
+    def truncated(self) -> bool:
+        return self.records_in_file < self.num_records
+
+    @property
+    def ok(self) -> bool:
+        return not self.warnings()
+
+    def warnings(self) -> list[str]:
+        messages = []
+        if self.truncated:
+            missing = self.num_records - self.records_in_file
+            messages.append(
+                f"File terpotong: header mencatat {self.num_records:,} record, "
+                f"hanya {self.records_in_file:,} utuh ({missing:,} hilang)"
+            )
+        elif self.records_in_file > self.num_records:
+            extra = self.records_in_file - self.num_records
+            messages.append(
+                f"Ada {extra:,} record setelah jumlah di header "
+                "(header tidak diperbarui?)"
+            )
+        if self.trailing_bytes:
+            messages.append(
+                f"{self.trailing_bytes:,} byte sisa di akhir file "
+                "(record terakhir tidak utuh)"
+            )
+        if self.eof_at is not None:
+            messages.append(
+                f"EOF (0x1A) di record {self.eof_at:,}: record sesudahnya tidak terbaca"
+            )
+        if self.bad_regions:
+            listed = ", ".join(
+                f"{start:,}-{stop - 1:,}"
+                for start, stop in self.bad_regions[:MAX_LISTED_REGIONS]
+            )
+            more = len(self.bad_regions) - MAX_LISTED_REGIONS
+            if more > 0:
+                listed += f" (+{more} lagi)"
+            messages.append(
+                f"{len(self.bad_regions)} area dengan deletion flag tidak valid "
+                f"(tidak sejajar/rusak), record {listed}"
+            )
+        return messages
+
+
+def size_check(filepath, header: dbase.DbfHeader | None = None) -> IntegrityReport:
+    """Cek O(1): jumlah record di header vs (ukuran - header_size) / record_size"""
+    header = header or dbase.read_header(filepath)
+    size = blockio.source_size(filepath)
+    data_size = max(size - header.header_size, 0)
+    records, trailing = divmod(data_size, max(header.record_size, 1))
+
+    if trailing and not blockio.is_path(filepath):
+        # Stream arsip: seek ke akhir berarti dekompresi penuh; anggap byte EOF
+        trailing -= 1
+    elif trailing:
+        with open(filepath, "rb") as f:
+            f.seek(size - 1)
+            if f.read(1) == dbase.EOF_MARKER:
+                trailing -= 1
+
+    return IntegrityReport(str(filepath), size, header.num_records, records, trailing)
+
+
+def _regions(mask, base: int) -> list[tuple[int, int]]:
+    """Rentang [start, stop) berurutan yang bernilai True"""
+    import numpy as np
+
+    edges = np.flatnonzero(np.diff(mask.astype(np.int8), prepend=0, append=0))
+    return [(base + int(a), base + int(b)) for a, b in zip(edges[::2], edges[1::2])]
+
+
+def _merge_regions(regions: list[tuple[int, int]], gap: int) -> list[tuple[int, int]]:
+    merged = []
+    for start, stop in regions:
+        if merged and start - merged[-1][1] < gap:
+            merged[-1] = (merged[-1][0], stop)
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def scan(
+    filepath: Path | str,
+    header: dbase.DbfHeader | None = None,
+    io_config: blockio.IOConfig | None = None,
+) -> IntegrityReport:
+    """Cek ukuran + validasi deletion flag semua record (satu operasi per chunk)"""
+    import numpy as np
+
+    header = header or dbase.read_header(filepath)
+    report = size_check(filepath, header)
+    record_size = header.record_size
+    valid = np.zeros(256, dtype=bool)
+    valid[list(VALID_FLAGS)] = True
+
+    regions = []
+    base = 0
+    for chunk in blockio.iter_record_chunks(
+        filepath, header.header_size, record_size, report.records_in_file, io_config
+    ):
+        flags = np.frombuffer(chunk, dtype=np.uint8)[::record_size]
+        end_of_data = False
+        # EOF tepat setelah record terakhir: sisanya bukan data
+        if (
+            base <= header.num_records < base + len(flags)
+            and flags[header.num_records - base] == 0x1A
+        ):
+            flags = flags[: header.num_records - base]
+            end_of_data = True
+        if report.eof_at is None:
+            eof = np.flatnonzero(flags[: max(header.num_records - base, 0)] == 0x1A)
+            if len(eof):
+                report.eof_at = base + int(eof[0])
+        regions += _regions(~valid[flags], base)
+        base += len(flags)
+        if end_of_data:
+            break
+
+    report.bad_regions = _merge_regions(regions, MERGE_GAP)
+    report.scanned = True
+    return report
+
+
+@dataclass
+class RecoveryResult:
+    """Hasil pemulihan: record yang diselamatkan dan area yang dilewati"""
+
+    recovered: int
+    skipped_bytes: int
+    # (offset byte rusak, offset byte tempat record valid ditemukan lagi)
+    resyncs: list[tuple[int, int]] = field(default_factory=list)
+
+
+class _Validator:
+    """Cek vektor apakah ada record masuk akal yang dimulai di offset tertentu
+
+    Isi field C bebas, jadi offset yang bergeser ke padding spasi field C
+    terakhir bisa lolos cek karakter. Karena itu field C yang di bagian sehat
+    awal dan akhir file selalu diisi mulai byte pertamanya (kode, nota)
+    dipelajari dulu (learn) dan wajib begitu juga di record lain.
+    """
+
+    def __init__(self, data, header: dbase.DbfHeader):
+        import numpy as np
+
+        self.data = data
+        self.record_size = header.record_size
+        self.flags = np.zeros(256, dtype=bool)
+        self.flags[list(VALID_FLAGS)] = True
+        self.checks = []
+        for f in header.fields:
+            allowed = PLAUSIBLE_BYTES.get(f.type)
+            if allowed:
+                table = np.zeros(256, dtype=bool)
+                table[list(allowed)] = True
+                self.checks.append((f, table))
+        self.text_fields = [f for f in header.fields if f.type == "C"]
+        self.filled = []  # Field C yang byte pertamanya tidak pernah spasi
+
+    def learn(self, start: int, end: int):
+        """Pelajari field C yang selalu terisi dari record sehat di awal dan akhir
+
+        Record di akhir dibaca sejajar dengan akhir data, jadi tetap sejajar
+        walau ada byte tersisip/hilang di tengah. Hanya record sebelum record
+        rusak pertama (dihitung dari masing-masing ujung) yang dipakai.
+        """
+        import numpy as np
+
+        count = min(PROFILE_RECORDS, (end - start) // self.record_size)
+        if count < RESYNC_WINDOW:
+            return
+        steps = np.arange(count) * self.record_size
+        samples = []
+        for positions in (start + steps, end - self.record_size - steps):
+            ok = self(positions)
+            samples.append(positions[: count if ok.all() else int(np.argmin(ok))])
+        healthy = np.concatenate(samples)
+        if min(len(sample) for sample in samples) < RESYNC_WINDOW:
+            return
+        self.filled = [
+            f for f in self.text_fields if (self.data[healthy + f.offset] != 0x20).all()
+        ]
+
+    def __call__(self, positions):
+        """Mask record valid untuk setiap offset awal (harus muat dalam data)"""
+        import numpy as np
+
+        ok = self.flags[self.data[positions]]
+        for f, table in self.checks:
+            seen = np.zeros(len(positions), dtype=bool)  # Ada non-spasi
+            spaces = np.zeros(len(positions), dtype=bool)  # Ada spasi
+            for j in range(f.offset, f.offset + f.length):
+                byte = self.data[positions + j]
+                ok &= table[byte]
+                seen |= byte != 0x20
+                spaces |= byte == 0x20
+            if f.type == "D":
+                # Tanggal: 8 digit atau kosong seluruhnya
+                ok &= ~(seen & spaces)
+        for f in self.filled:
+            ok &= self.data[positions + f.offset] != 0x20
+        return ok
+
+    def resync(self, start: int, end: int) -> int | None:
+        """Offset >= start tempat RESYNC_WINDOW record berturut-turut valid
+
+        Dari kandidat dalam satu record sejak kandidat pertama, yang sejajar
+        dengan akhir data ((end - offset) % record_size == 0) didahulukan:
+        offset yang bergeser ke padding spasi bisa ikut lolos validasi.
+        """
+        import numpy as np
+
+        record_size = self.record_size
+        span = RECOVER_BLOCK
+        while start + record_size <= end:
+            stop = min(start + span, end - record_size + 1)
+            candidates = start + np.flatnonzero(self.flags[self.data[start:stop]])
+            for k in range(RESYNC_WINDOW):
+                shifted = candidates + k * record_size
+                # Mendekati akhir file cukup record yang tersisa
+                fits = shifted + record_size <= end
+                keep = ~fits
+                keep[fits] = self(shifted[fits])
+                candidates = candidates[keep]
+                if not len(candidates):
+                    break
+            if len(candidates):
+                near = candidates[candidates < candidates[0] + record_size]
+                aligned = near[(end - near) % record_size == 0]
+                return int(aligned[0] if len(aligned) else near[0])
+            start = stop
+        return None
+
+
+def recover(
+    filepath: Path | str,
+    output: Path | str,
+    header: dbase.DbfHeader | None = None,
+) -> RecoveryResult:
+    """Tulis salinan file hanya berisi record valid, dengan num_records dikoreksi
+
+    Record dibaca sejajar dari awal data; pada record rusak (flag tidak sah,
+    isi field N/F/D/L tidak masuk akal, atau field C yang biasanya terisi
+    kosong) pencarian dilanjutkan byte demi byte sampai RESYNC_WINDOW record
+    berturut-turut valid lagi. Data setelah EOF
+    0x1A yang terlalu awal juga ikut diselamatkan.
+    """
+    header = header or dbase.read_header(filepath)
+    result = RecoveryResult(0, 0)
+
+    with open(filepath, "rb") as src, open(output, "wb") as dst:
+        dst.write(src.read(header.header_size))
+
+        if os.path.getsize(filepath) > header.header_size:
+            with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                _recover_records(mm, dst, header, result)
+
+        dst.write(dbase.EOF_MARKER)
+        dst.seek(4)
+        dst.write(struct.pack("<I", result.recovered))
+    return result
+
+
+def _recover_records(mm, dst, header: dbase.DbfHeader, result: RecoveryResult):
+    import numpy as np
+
+    data = np.frombuffer(mm, dtype=np.uint8)
+    end = len(data) - 1 if data[-1] == 0x1A else len(data)
+    validate = _Validator(data, header)
+    record_size = header.record_size
+    pos = header.header_size
+    validate.learn(pos, end)
+    while pos + record_size <= end:
+        count = min(RECOVER_BLOCK, (end - pos) // record_size)
+        positions = pos + np.arange(count) * record_size
+        bad = np.flatnonzero(~validate(positions))
+        good = int(bad[0]) if len(bad) else count
+
+        dst.write(mm[pos : pos + good * record_size])
+        result.recovered += good
+        pos += good * record_size
+        if good == count:
+            continue
+
+        found = validate.resync(pos + 1, end)
+        skip_to = end if found is None else found
+        result.skipped_bytes += skip_to - pos
+        if found is not None:
+            result.resyncs.append((pos, found))
+        pos = skip_to
+    # Sisa byte yang tidak cukup untuk satu record
+    result.skipped_bytes += max(end - pos, 0)
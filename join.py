@@ -0,0 +1,141 @@
+"""
+Join streaming barcode STOCK1.DAT dengan record penjualan dBase (mis. TJUAL.DTA)
+Indeks barcode dibangun sekali dari file STOCK (yang kecil), lalu record DTA
+dialirkan chunk demi chunk, dicocokkan secara vektor dan langsung ditulis.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+
+import aggregate
+import blockio
+import columnar
+import dbase
+import stock
+
+STOCK_PREFIX = "STOCK_"
+HOW = ("inner", "left")
+
+
+class StockIndex:
+    """Indeks barcode -> record STOCK yang ringkas (array numpy terurut)
+
+    Bukan dict: kunci unik disimpan terurut dan satu chunk kunci dicari
+    sekaligus dengan searchsorted (seperti np.unique di aggregate), tanpa
+    objek Python per barcode. Setiap kolom STOCK selain BARCODE disimpan
+    sejajar dengan kunci. Barcode ganda: record pertama yang dipakai.
+    """
+
+    def __init__(self, table: columnar.ColumnarTable):
+        barcodes = np.strings.strip(table.raw("BARCODE"))
+        self.keys, first = np.unique(barcodes, return_index=True)
+        self.names = [name for name in table.names if name != "BARCODE"]
+        self.values = [table.column(name)[first] for name in self.names]
+        self.duplicates = len(barcodes) - len(self.keys)
+        self._widened = {self.keys.dtype.itemsize: self.keys}
+
+    @property
+    def columns(self) -> list[str]:
+        """Nama kolom STOCK di output join (STOCK_VALUE, ...)"""
+        return [STOCK_PREFIX + name for name in self.names]
+
+    @classmethod
+    def from_file(
+        cls,
+        filepath: Path | str,
+        io_config: blockio.IOConfig | None = None,
+        encoding: str | None = None,
+        layout: stock.StockLayout | None = None,
+    ) -> StockIndex:
+        layout = layout or stock.DEFAULT_LAYOUT
+        if "BARCODE" not in layout.columns:
+            raise ValueError("Skema STOCK untuk join harus memiliki field BARCODE")
+        data = blockio.read_all(filepath, io_config)
+        return cls(columnar.load_stock(data, encoding, layout))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def nbytes(self) -> int:
+        return self.keys.nbytes + sum(v.nbytes for v in self.values)
+
+    def _keys(self, width: int) -> np.ndarray:
+        """Kunci indeks dengan lebar S yang sama dengan kunci yang dicari"""
+        if width not in self._widened:
+            self._widened[width] = self.keys.astype(f"S{width}")
+        return self._widened[width]
+
+    def lookup(self, raw: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Cocokkan kolom kunci bytes: (mask cocok, posisi di indeks)"""
+        probe = np.strings.strip(raw)
+        width = max(probe.dtype.itemsize, self.keys.dtype.itemsize)
+        probe = probe.astype(f"S{width}")
+        keys = self._keys(width)
+        if not len(keys):
+            return np.zeros(len(probe), dtype=bool), np.zeros(len(probe), dtype=np.intp)
+
+        pos = np.minimum(np.searchsorted(keys, probe), len(keys) - 1)
+        matched = (keys[pos] == probe) & (probe != b"")
+        return matched, pos
+
+    def fields(self, pos: np.ndarray, matched: np.ndarray | None = None) -> list[list]:
+        """Nilai kolom STOCK per posisi indeks; None bila tidak cocok (left join)"""
+        if matched is None:
+            return [v[pos].tolist() for v in self.values]
+        hits = matched.tolist()
+        if not any(hits):
+            return [[None] * len(hits) for _ in self.values]
+        return [
+            [value if hit else None for value, hit in zip(v[pos].tolist(), hits)]
+            for v in self.values
+        ]
+
+
+def join_rows(
+    filepath: Path | str,
+    index: StockIndex,
+    on: str,
+    how: str = "inner",
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+) -> tuple[list[str], Iterator]:
+    """Kolom dan iterator baris hasil join record dBase dengan indeks STOCK
+
+    how='inner' hanya record yang barcode-nya ada di STOCK; how='left' semua
+    record, kolom STOCK_* kosong (None) bila tidak cocok. Record terhapus dilewati.
+    """
+    if how not in HOW:
+        raise ValueError(f"Jenis join tidak dikenal: {how}")
+    header = dbase.read_header(filepath)
+    (key_field,) = aggregate.resolve_fields(header, [on])
+    encoding = encoding or header.encoding
+    record_size = header.record_size
+
+    def rows():
+        for chunk in dbase.iter_record_chunks(filepath, header, io_config):
+            _, chunk = dbase.visible_records(chunk, record_size)
+            if not chunk:
+                continue
+            matrix = columnar.record_matrix(chunk, record_size)
+            matched, pos = index.lookup(
+                columnar.fixed_width(matrix, key_field.offset, key_field.length)
+            )
+
+            if how == "inner":
+                if not matched.all():
+                    matrix = matrix[matched]
+                    chunk = matrix.tobytes()
+                values = index.fields(pos[matched])
+            else:
+                values = index.fields(pos, matched)
+
+            if len(matrix):
+                columns = dbase.decode_columns(chunk, header, encoding)
+                yield from zip(*columns, *values)
+
+    return header.field_names + index.columns, rows()
@@ -0,0 +1,262 @@
+"""
+Ekspor bulk ke SQLite (hanya stdlib)
+Tabel bertipe dari deskriptor field dBase, chunk record dimasukkan dengan
+executemany dalam transaksi besar, index dibuat setelah data masuk, dan file
+yang terus bertambah cukup di-append mulai dari record terakhir yang dimuat.
+"""
+
+import json
+import sqlite3
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+
+import blockio
+import dbase
+
+# Commit setiap sekian baris (satu transaksi besar per batch)
+BATCH_ROWS = 200_000
+# Cache halaman SQLite dalam KiB (nilai negatif = KiB, bukan jumlah halaman)
+CACHE_KIB = 64 * 1024
+# Tabel metadata untuk append inkremental
+META_TABLE = "_dat_exporter_loads"
+
+SQL_TYPES = {"C": "TEXT", "D": "TEXT", "L": "INTEGER", "M": "TEXT", "F": "REAL"}
+
+
+def quote(name: str) -> str:
+    """Quote identifier SQL"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def column_type(field: dbase.DbfField) -> str:
+    """Tipe kolom SQLite untuk field dBase (N tanpa desimal -> INTEGER)"""
+    if field.type == "N":
+        return "REAL" if field.decimals else "INTEGER"
+    return SQL_TYPES.get(field.type, "TEXT")
+
+
+def _number(value: str, cast):
+    if not value:
+        return None
+    try:
+        return cast(value)
+    except ValueError:
+        # Mis. '*****' (overflow) atau angka desimal di field tanpa desimal
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+
+def _date(value: str) -> str | None:
+    """YYYYMMDD -> YYYY-MM-DD (bisa dipakai fungsi tanggal SQLite)"""
+    if not value:
+        return None
+    if len(value) == 8 and value.isdigit():
+        return f"{value[:4]}-{value[4:6]}-{value[6:]}"
+    return value
+
+
+def _logical(value: str) -> int | None:
+    if value in ("T", "t", "Y", "y"):
+        return 1
+    if value in ("F", "f", "N", "n"):
+        return 0
+    return None
+
+
+def convert_column(values: list[str], field: dbase.DbfField) -> list:
+    """Konversi satu kolom hasil decode ke nilai Python sesuai tipe SQLite"""
+    if field.type == "D":
+        return [_date(v) for v in values]
+    if field.type == "L":
+        return [_logical(v) for v in values]
+    sql_type = column_type(field)
+    if sql_type == "INTEGER":
+        return [_number(v, int) for v in values]
+    if sql_type == "REAL":
+        return [_number(v, float) for v in values]
+    return values
+
+
+def connect(path: Path | str) -> sqlite3.Connection:
+    """Buka database dengan pragma untuk bulk load"""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(f"PRAGMA cache_size=-{CACHE_KIB}")
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {META_TABLE} ("
+        "table_name TEXT PRIMARY KEY, source TEXT, records INTEGER, "
+        "record_size INTEGER, schema TEXT, loaded_at TEXT)"
+    )
+    return conn
+
+
+def _schema(header: dbase.DbfHeader) -> str:
+    return json.dumps([[f.name, f.type, f.length, f.decimals] for f in header.fields])
+
+
+def _loaded_records(
+    conn: sqlite3.Connection, table: str, header: dbase.DbfHeader
+) -> int | None:
+    """Jumlah record yang sudah dimuat, atau None jika harus dimuat ulang"""
+    row = conn.execute(
+        f"SELECT records, record_size, schema FROM {META_TABLE} WHERE table_name = ?",
+        (table,),
+    ).fetchone()
+    if row is None:
+        return None
+    records, record_size, schema = row
+    if record_size != header.record_size or schema != _schema(header):
+        return None
+    # File menyusut (mis. di-pack): tidak bisa append
+    if records > header.num_records:
+        return None
+    return records
+
+
+def _create_table(conn: sqlite3.Connection, table: str, columns: list[str]):
+    conn.execute(f"DROP TABLE IF EXISTS {quote(table)}")
+    conn.execute(f"CREATE TABLE {quote(table)} ({', '.join(columns)})")
+
+
+def _save_meta(
+    conn: sqlite3.Connection,
+    table: str,
+    source: Path | str,
+    records: int | None,
+    record_size: int | None = None,
+    schema: str | None = None,
+):
+    conn.execute(
+        f"INSERT OR REPLACE INTO {META_TABLE} VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            table,
+            str(source),
+            records,
+            record_size,
+            schema,
+            datetime.now().isoformat(timespec="seconds"),
+        ),
+    )
+
+
+def load_dbase(
+    conn: sqlite3.Connection,
+    filepath: Path | str,
+    table: str,
+    io_config: blockio.IOConfig | None = None,
+    encoding: str | None = None,
+    append: bool = False,
+    progress=None,
+) -> tuple[int, bool]:
+    """Muat file dBase III ke tabel bertipe: (jumlah baris baru, appended?)
+
+    Dengan append=True, hanya record setelah yang terakhir dimuat yang dibaca,
+    selama struktur field tidak berubah. Record terhapus tidak dimuat.
+    """
+    header = dbase.read_header(filepath)
+    encoding = encoding or header.encoding
+
+    start = _loaded_records(conn, table, header) if append else None
+    appended = start is not None
+    if not appended:
+        start = 0
+        _create_table(
+            conn,
+            table,
+            [f"{quote(f.name)} {column_type(f)}" for f in header.fields],
+        )
+
+    placeholders = ", ".join("?" * len(header.fields))
+    insert = f"INSERT INTO {quote(table)} VALUES ({placeholders})"
+
+    inserted = pending = 0
+    records = start
+    for chunk in dbase.iter_record_chunks(filepath, header, io_config, start):
+        records += len(chunk) // header.record_size
+        _, chunk = dbase.visible_records(chunk, header.record_size)
+        columns = dbase.decode_columns(chunk, header, encoding)
+        converted = [convert_column(c, f) for c, f in zip(columns, header.fields)]
+        rows = len(chunk) // header.record_size
+        conn.executemany(insert, zip(*converted))
+        inserted += rows
+        pending += rows
+        if pending >= BATCH_ROWS:
+            conn.commit()
+            pending = 0
+        if progress:
+            progress(records, header.num_records)
+
+    _save_meta(conn, table, filepath, records, header.record_size, _schema(header))
+    conn.commit()
+    return inserted, appended
+
+
+def load_rows(
+    conn: sqlite3.Connection,
+    table: str,
+    columns: list[str],
+    rows: Iterable,
+    source: Path | str = "",
+) -> int:
+    """Muat baris generik (STOCK/TPRODUK) ke tabel baru, tipe mengikuti nilai"""
+    _create_table(conn, table, [quote(c) for c in columns])
+    insert = f"INSERT INTO {quote(table)} VALUES ({', '.join('?' * len(columns))})"
+
+    count = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_ROWS:
+            conn.executemany(insert, batch)
+            conn.commit()
+            count += len(batch)
+            batch = []
+    conn.executemany(insert, batch)
+    count += len(batch)
+
+    # records=None: format ini selalu dimuat ulang penuh
+    _save_meta(conn, table, source, None)
+    conn.commit()
+    return count
+
+
+def create_indexes(
+    conn: sqlite3.Connection, table: str, indexes: list[str]
+) -> list[str]:
+    """Buat index setelah load; tiap spesifikasi 'FIELD' atau 'FIELD1,FIELD2'"""
+    existing = {
+        row[1].upper(): row[1]
+        for row in conn.execute(f"PRAGMA table_info({quote(table)})")
+    }
+    names = []
+    for spec in indexes:
+        fields = []
+        for name in spec.split(","):
+            column = existing.get(name.strip().upper())
+            if column is None:
+                available = ", ".join(existing.values())
+                raise ValueError(
+                    f"Kolom '{name}' tidak ditemukan. Tersedia: {available}"
+                )
+            fields.append(column)
+        index_name = f"idx_{table}_{'_'.join(fields)}"
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {quote(index_name)} "
+            f"ON {quote(table)} ({', '.join(quote(f) for f in fields)})"
+        )
+        names.append(index_name)
+    conn.commit()
+    return names
+
+
+def finish(conn: sqlite3.Connection):
+    """Kembalikan pragma aman, perbarui statistik planner, lalu tutup"""
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA optimize")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
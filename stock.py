@@ -0,0 +1,176 @@
+"""
+Parser STOCK1.DAT (format custom binary, hanya stdlib)
+Setiap record diawali barcode 13 digit, diikuti byte data tambahan. Isi record
+dijelaskan secara deklaratif oleh StockLayout (nama, offset, tipe struct), yang
+bisa diganti lewat file skema JSON.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import NamedTuple
+
+from dbase import DEFAULT_ENCODING
+
+BARCODE_LEN = 13
+DEFAULT_RECORD_SIZE = 23
+RAW_COLUMN = "RAW_DATA"
+# Tipe struct numerik yang didukung (tanpa prefix dianggap little-endian "<")
+NUMERIC_TYPES = "bBhHiIqQefd?"
+
+_BARCODE_RE = re.compile(rb"\d{13}")
+
+
+class StockField(NamedTuple):
+    """Satu field record: offset dari awal record dan tipe struct ("<I", "13s")"""
+
+    name: str
+    offset: int
+    type: str
+
+    @property
+    def size(self) -> int:
+        return struct.calcsize(self.type)
+
+    @property
+    def is_text(self) -> bool:
+        return self.type.endswith("s")
+
+
+def _normalize_type(value: str) -> str:
+    """Validasi tipe struct satu nilai; tanpa prefix byte order -> '<'"""
+    fmt = value if value[:1] in "<>!=" else "<" + value
+    if not re.fullmatch(rf"[<>!=](\d+s|[{NUMERIC_TYPES}])", fmt):
+        raise ValueError(
+            f"Tipe field tidak didukung: {value} (contoh: <I, <h, <f, 13s)"
+        )
+    return fmt
+
+
+@dataclass(frozen=True)
+class StockLayout:
+    """Daftar field STOCK1.DAT; raw=True menambahkan byte setelah barcode apa adanya
+
+    record_size None berarti dideteksi dari jarak dua barcode pertama. Field
+    yang melewati ukuran record bernilai 0 (teks: kosong).
+    """
+
+    fields: tuple[StockField, ...]
+    raw: bool = False
+    record_size: int | None = None
+
+    def __post_init__(self):
+        fields = tuple(
+            StockField(f.name, f.offset, _normalize_type(f.type)) for f in self.fields
+        )
+        names = [f.name.upper() for f in fields] + ([RAW_COLUMN] if self.raw else [])
+        if len(set(names)) != len(names):
+            raise ValueError("Nama field STOCK ganda")
+        if any(f.offset < 0 for f in fields):
+            raise ValueError("Offset field STOCK tidak boleh negatif")
+        if self.record_size is not None:
+            if self.record_size <= BARCODE_LEN:
+                raise ValueError(f"record_size harus lebih dari {BARCODE_LEN}")
+            for f in fields:
+                if f.offset + f.size > self.record_size:
+                    raise ValueError(
+                        f"Field {f.name} (offset {f.offset}, {f.size} byte) melewati "
+                        f"record_size {self.record_size}"
+                    )
+        object.__setattr__(self, "fields", fields)
+
+    @property
+    def columns(self) -> list[str]:
+        return [f.name for f in self.fields] + ([RAW_COLUMN] if self.raw else [])
+
+    def parse(self, record: bytes, encoding: str | None = None) -> tuple | None:
+        """Nilai semua kolom satu record; None jika barcode kosong"""
+        if not record[:BARCODE_LEN].strip(b" \x00"):
+            return None
+        encoding = encoding or DEFAULT_ENCODING
+        values = []
+        for f in self.fields:
+            if f.offset + f.size > len(record):
+                values.append("" if f.is_text else 0)
+            elif f.is_text:
+                text = record[f.offset : f.offset + f.size]
+                text = text.decode(encoding, errors="replace")
+                values.append(text.rstrip("\x00").strip())
+            else:
+                values.append(struct.unpack_from(f.type, record, f.offset)[0])
+        if self.raw:
+            values.append(record[BARCODE_LEN:])
+        return tuple(values)
+
+
+DEFAULT_LAYOUT = StockLayout(
+    (StockField("BARCODE", 0, f"{BARCODE_LEN}s"), StockField("VALUE", 17, "<I"))
+)
+COLUMNS = DEFAULT_LAYOUT.columns
+
+
+def load_layout(path: Path | str) -> StockLayout:
+    """Baca skema JSON
+
+    Format:
+        {"record_size": 23, "raw": false,
+         "fields": [{"name": "BARCODE", "offset": 0, "type": "13s"},
+                    {"name": "TAHUN", "offset": 13, "type": "<I"},
+                    {"name": "VALUE", "offset": 17, "type": "<I"}]}
+    """
+    path = Path(path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            schema = json.load(f)
+        fields = tuple(
+            StockField(str(f["name"]), int(f["offset"]), str(f["type"]))
+            for f in schema["fields"]
+        )
+        return StockLayout(fields, bool(schema.get("raw")), schema.get("record_size"))
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Skema STOCK {path.name} tidak valid: {e}")
+
+
+def find_start(data: bytes) -> int:
+    """Posisi barcode pertama (0 jika tidak ditemukan)"""
+    match = _BARCODE_RE.search(data, 0, len(data) - 1)
+    return match.start() if match else 0
+
+
+def detect_record_size(data: bytes, pos: int) -> int:
+    """Jarak antara barcode pertama dan barcode berikutnya"""
+    match = _BARCODE_RE.search(data, pos + BARCODE_LEN, len(data) - 1)
+    return match.start() - pos if match else DEFAULT_RECORD_SIZE
+
+
+def estimate_count(data: bytes) -> int:
+    """Perkiraan jumlah record dari ukuran data"""
+    pos = find_start(data)
+    return (len(data) - pos) // detect_record_size(data, pos)
+
+
+def record_count(data_size: int, pos: int, record_size: int) -> int:
+    """Jumlah record menurut iter_records (terakhir harus < data_size - record_size)"""
+    return max(0, -(-(data_size - record_size - pos) // record_size))
+
+
+def locate(data: bytes, layout: StockLayout = DEFAULT_LAYOUT) -> tuple[int, int, int]:
+    """(posisi record pertama, ukuran record, jumlah record)"""
+    pos = find_start(data)
+    record_size = layout.record_size or detect_record_size(data, pos)
+    return pos, record_size, record_count(len(data), pos, record_size)
+
+
+def iter_records(
+    data: bytes, encoding: str | None = None, layout: StockLayout = DEFAULT_LAYOUT
+):
+    """Yield tuple nilai (sesuai layout) untuk setiap record dengan barcode"""
+    pos, record_size, count = locate(data, layout)
+    for current in range(pos, pos + count * record_size, record_size):
+        parsed = layout.parse(data[current : current + record_size], encoding)
+        if parsed:
+            yield parsed
@@ -134,3 +134,59 @@ def invalid_file(temp_dir):
     with open(filepath, "wb") as f:
         f.write(b"This is not a valid DAT file content")
     return filepath
+
+
+def build_dbase3(
+    fields: list[tuple],
+    rows: list[list[bytes]],
+    language_driver: int = 0,
+    deleted: set[int] = frozenset(),
+    eof: bool = True,
+) -> bytes:
+    """Bangun isi file dBase III dari definisi field dan nilai bytes per sel
+
+    Field: (nama, tipe, panjang) atau (nama, tipe, panjang, desimal).
+    """
+    record_size = 1 + sum(f[2] for f in fields)
+    header_size = 32 + 32 * len(fields) + 1
+
+    header = bytearray()
+    header.append(0x03)  # Version: dBase III
+    header.extend([24, 1, 1])  # Date: 2024-01-01
+    header.extend(struct.pack("<I", len(rows)))
+    header.extend(struct.pack("<H", header_size))
+    header.extend(struct.pack("<H", record_size))
+    reserved = bytearray(20)
+    reserved[17] = language_driver  # Byte 29 dari awal header
+    header.extend(reserved)
+
+    for name, ftype, length, *decimals in fields:
+        descriptor = bytearray(32)
+        descriptor[0 : len(name)] = name.encode("ascii")
+        descriptor[11] = ord(ftype)
+        descriptor[16] = length
+        descriptor[17] = decimals[0] if decimals else 0
+        header.extend(descriptor)
+    header.append(0x0D)
+
+    records = bytearray()
+    for i, row in enumerate(rows):
+        records.append(0x2A if i in deleted else 0x20)
+        for field, value in zip(fields, row):
+            records.extend(value.ljust(field[2], b" ")[: field[2]])
+    if eof:
+        records.append(0x1A)
+
+    return bytes(header + records)
+
+
+@pytest.fixture
+def dbase3_factory(temp_dir):
+    """Factory untuk membuat file dBase III dengan isi tertentu"""
+
+    def factory(name="data.DTA", **kwargs):
+        filepath = temp_dir / name
+        filepath.write_bytes(build_dbase3(**kwargs))
+        return filepath
+
+    return factory
@@ -0,0 +1,120 @@
+"""
+Unit tests untuk agregasi group-by streaming (aggregate)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import aggregate
+import columnar
+from blockio import IOConfig
+
+FIELDS = [("TANGGAL", "D", 8), ("KODE", "C", 4), ("QTY", "N", 5), ("HARGA", "N", 8)]
+
+
+@pytest.fixture
+def sales_file(dbase3_factory):
+    rows = []
+    for i in range(60):
+        rows.append(
+            [
+                b"2024010%d" % (i % 3 + 1),
+                b"P%02d" % (i % 4),
+                str(i % 5).rjust(5).encode(),
+                f"{i * 1.5:8.2f}".encode(),
+            ]
+        )
+    # Record terhapus tidak ikut dihitung
+    return dbase3_factory(name="TJUAL.DTA", fields=FIELDS, rows=rows, deleted={0})
+
+
+def expected(rows_filter):
+    """Hitung ekspektasi secara naif"""
+    groups = {}
+    for i in range(1, 60):
+        key = rows_filter(i)
+        qty, harga = i % 5, i * 1.5
+        g = groups.setdefault(key, [0, 0, [], []])
+        g[0] += 1
+        g[1] += qty
+        g[2].append(qty)
+        g[3].append(harga)
+    return groups
+
+
+class TestParseNumeric:
+    """Tests untuk parse_numeric"""
+
+    def test_parses_fixed_width_numbers(self):
+        raw = np.array([b"  12.5", b"    -3", b"      ", b"*****"], dtype="S6")
+        values = columnar.parse_numeric(raw)
+
+        assert values[:2].tolist() == [12.5, -3.0]
+        assert np.isnan(values[2]) and np.isnan(values[3])
+
+
+class TestGroupBy:
+    """Tests untuk group_by"""
+
+    def test_count_sum_min_max(self, sales_file):
+        """Test agregasi satu kolom kunci"""
+        result = aggregate.group_by(sales_file, ["tanggal"], ["QTY"])
+        groups = expected(lambda i: f"2024010{i % 3 + 1}")
+
+        assert result.columns == ["TANGGAL", "COUNT", "SUM_QTY", "MIN_QTY", "MAX_QTY"]
+        assert [r[0] for r in result.rows] == sorted(groups)
+        for row in result.rows:
+            count, total, qtys, _ = groups[row[0]]
+            assert row[1:] == [count, total, min(qtys), max(qtys)]
+
+    def test_multiple_keys_across_chunks(self, sales_file):
+        """Test kunci gabungan dan chunk kecil memberi hasil yang sama"""
+        config = IOConfig(block_size=26 * 7, readahead=0)
+        result = aggregate.group_by(
+            sales_file, ["TANGGAL", "KODE"], ["HARGA"], io_config=config
+        )
+        groups = expected(lambda i: (f"2024010{i % 3 + 1}", f"P{i % 4:02d}"))
+
+        assert len(result.rows) == len(groups)
+        for row in result.rows:
+            _, _, _, hargas = groups[(row[0], row[1])]
+            assert row[2] == len(hargas)
+            assert row[3] == pytest.approx(sum(hargas))
+            assert row[4] == min(hargas)
+            assert row[5] == max(hargas)
+
+    def test_parallel_matches_sequential(self, sales_file):
+        """Test agregat parsial antar proses digabung dengan benar"""
+        sequential = aggregate.group_by(sales_file, ["KODE"], ["QTY", "HARGA"])
+        parallel = aggregate.group_by(sales_file, ["KODE"], ["QTY", "HARGA"], workers=3)
+
+        assert parallel.rows == sequential.rows
+
+    def test_sum_rounded_to_field_decimals(self, dbase3_factory):
+        """Test SUM dibulatkan ke desimal field, tanpa sisa pembulatan float"""
+        rows = [[b"A", b"%8.2f" % 0.1] for _ in range(3)]
+        rows += [[b"B", b"%8.2f" % v] for v in (88000.15, 463.8)]
+        path = dbase3_factory(
+            fields=[("KODE", "C", 2), ("HARGA", "N", 8, 2)], rows=rows
+        )
+
+        result = aggregate.group_by(path, ["KODE"], ["HARGA"])
+
+        assert [r[2] for r in result.rows] == [0.3, 88463.95]
+
+    def test_unknown_field(self, sales_file):
+        """Test kolom tidak dikenal"""
+        with pytest.raises(ValueError, match="tidak ditemukan"):
+            aggregate.group_by(sales_file, ["TIDAKADA"])
+
+    def test_to_pandas(self, sales_file):
+        """Test hasil bisa dijadikan DataFrame"""
+        df = aggregate.group_by(sales_file, ["KODE"]).to_pandas()
+
+        assert df["COUNT"].sum() == 59
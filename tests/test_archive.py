@@ -0,0 +1,164 @@
+"""
+Unit tests untuk pembacaan langsung dari arsip .zip/.gz (archive)
+"""
+
+import gzip
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import archive
+import blockio
+import dbase
+import exporter
+from blockio import IOConfig
+
+FIELDS = [("KODE", "C", 8), ("QTY", "N", 6)]
+
+
+def rows(n: int) -> list[list[bytes]]:
+    return [[b"K%05d" % i, b"%6d" % i] for i in range(n)]
+
+
+@pytest.fixture
+def sales_file(dbase3_factory):
+    return dbase3_factory(name="TJUAL.DTA", fields=FIELDS, rows=rows(50))
+
+
+def make_zip(path: Path, files: dict[str, bytes]) -> Path:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return path
+
+
+class TestMembers:
+    """Tests untuk daftar anggota arsip"""
+
+    def test_zip_members_only_data_files(self, temp_dir, sales_file):
+        data = sales_file.read_bytes()
+        path = make_zip(
+            temp_dir / "backup.zip",
+            {"DATA/TJUAL.DTA": data, "README.txt": b"x", "STOCK1.DAT": b"y"},
+        )
+        found = archive.members(path)
+        assert [m.name for m in found] == ["TJUAL.DTA", "STOCK1.DAT"]
+        assert found[0].size == len(data)
+        assert found[0].stem == "TJUAL"
+
+    def test_gzip_member_name_and_size(self, temp_dir, sales_file):
+        data = sales_file.read_bytes()
+        path = temp_dir / "TJUAL.DTA.gz"
+        path.write_bytes(gzip.compress(data))
+        (member,) = archive.members(path)
+        assert member.name == "TJUAL.DTA"
+        assert member.size == len(data)
+        assert blockio.source_size(member) == len(data)
+
+    def test_gzip_size_past_isize_limit(self, temp_dir, sales_file, monkeypatch):
+        """Test gzip yang mungkin >= 4 GB diukur dengan dekompresi, bukan ISIZE"""
+        data = sales_file.read_bytes()
+        path = temp_dir / "TJUAL.DTA.gz"
+        path.write_bytes(gzip.compress(data))
+        # Batas diperkecil: ISIZE dianggap bisa sudah terpotong modulo 2**32
+        monkeypatch.setattr(archive, "ISIZE_LIMIT", 1)
+        (member,) = archive.members(path)
+        assert member.known_size is None
+        assert member.size == len(data)
+        assert blockio.source_size(member) == len(data)
+
+    def test_expand_prefixes_multiple_zips(self, temp_dir, sales_file):
+        data = sales_file.read_bytes()
+        first = make_zip(temp_dir / "senin.zip", {"TJUAL.DTA": data})
+        second = make_zip(temp_dir / "selasa.zip", {"TJUAL.DTA": data})
+        expanded = archive.expand([first, second, sales_file])
+        assert [m.stem for m in expanded[:2]] == ["senin_TJUAL", "selasa_TJUAL"]
+        assert expanded[2] == sales_file
+
+    def test_expand_prefixes_gzip_with_same_member(self, temp_dir, sales_file):
+        """Test backup harian senin/TJUAL.DTA.gz dan selasa/TJUAL.DTA.gz dibedakan"""
+        data = gzip.compress(sales_file.read_bytes())
+        paths = []
+        for folder in ("senin", "selasa"):
+            (temp_dir / folder).mkdir()
+            paths.append(temp_dir / folder / "TJUAL.DTA.gz")
+            paths[-1].write_bytes(data)
+        backup = make_zip(temp_dir / "backup.zip", {"STOCK1.DAT": b"y"})
+
+        expanded = archive.expand([*paths, backup])
+        assert [m.stem for m in expanded] == ["senin_TJUAL", "selasa_TJUAL", "STOCK1"]
+
+    def test_expand_prefixes_zip_and_gzip_mix(self, temp_dir, sales_file):
+        """Test zip dan .gz berisi nama yang sama, serta zip bernama sama"""
+        data = sales_file.read_bytes()
+        for folder in ("senin", "selasa"):
+            (temp_dir / folder).mkdir()
+            make_zip(temp_dir / folder / "backup.zip", {"TJUAL.DTA": data})
+        gz = temp_dir / "senin" / "TJUAL.DTA.gz"
+        gz.write_bytes(gzip.compress(data))
+
+        expanded = archive.expand(
+            [temp_dir / "senin" / "backup.zip", temp_dir / "selasa" / "backup.zip", gz]
+        )
+        assert [m.stem for m in expanded] == [
+            "senin_backup_TJUAL",
+            "selasa_backup_TJUAL",
+            "senin_TJUAL",
+        ]
+
+    def test_expand_keeps_missing_archive(self, temp_dir):
+        missing = temp_dir / "hilang.zip"
+        assert archive.expand([missing]) == [missing]
+
+
+class TestReadMember:
+    """Tests untuk membaca record langsung dari anggota arsip"""
+
+    def test_rows_match_plain_file(self, temp_dir, sales_file):
+        path = make_zip(temp_dir / "backup.zip", {"TJUAL.DTA": sales_file.read_bytes()})
+        (member,) = archive.members(path)
+        header = dbase.read_header(member)
+        expected = list(dbase.iter_rows(sales_file, dbase.read_header(sales_file)))
+        config = IOConfig(block_size=64, readahead=2)
+        assert list(dbase.iter_rows(member, header, config)) == expected
+
+    def test_table_over_spool(self, temp_dir, sales_file):
+        path = temp_dir / "TJUAL.DTA.gz"
+        path.write_bytes(gzip.compress(sales_file.read_bytes()))
+        (member,) = archive.members(path)
+        with dbase.DbfTable(member.spool()) as table:
+            assert len(table) == 50
+            assert table[49][0] == "K00049"
+
+
+class TestExportArchive:
+    """Tests untuk ekspor CSV dari arsip"""
+
+    def test_csv_from_zip(self, temp_dir, sales_file):
+        data = sales_file.read_bytes()
+        path = make_zip(temp_dir / "backup.zip", {"A.DTA": data, "B.DTA": data})
+        output = temp_dir / "out.csv"
+        exporter.main(["-i", str(path), "-o", str(output), "--workers", "2"])
+        for name in ("out_A.csv", "out_B.csv"):
+            lines = (temp_dir / name).read_text(encoding="utf-8-sig").splitlines()
+            assert lines[0] == "KODE,QTY"
+            assert len(lines) == 51
+
+    def test_truncated_gzip_reported_per_file(self, temp_dir, sales_file, capsys):
+        """Test .gz terpotong dilaporkan sebagai ERROR, file lain tetap diekspor"""
+        broken = temp_dir / "TRUSAK.DTA.gz"
+        broken.write_bytes(gzip.compress(sales_file.read_bytes())[:-40])
+        output = temp_dir / "out.csv"
+
+        exporter.main(
+            ["-i", str(sales_file), str(broken), "-o", str(output)] + ["--workers", "1"]
+        )
+
+        assert "ERROR" in capsys.readouterr().out
+        lines = (temp_dir / "out_TJUAL.csv").read_text(encoding="utf-8-sig")
+        assert len(lines.splitlines()) == 51
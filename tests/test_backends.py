@@ -0,0 +1,149 @@
+"""
+Unit tests untuk backend pembaca dan pemilihan otomatis (backends)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import backends
+import blockio
+import dbase
+import exporter
+
+FIELDS = [("KODE", "C", 8), ("NAMA", "C", 12), ("QTY", "N", 6)]
+
+
+def rows(n: int) -> list[list[bytes]]:
+    return [[b"K%05d" % i, b"Barang %d" % i, b"%6d" % i] for i in range(n)]
+
+
+@pytest.fixture
+def sales_file(dbase3_factory):
+    return dbase3_factory(name="TJUAL.DTA", fields=FIELDS, rows=rows(50))
+
+
+def profile(**throughputs) -> backends.Profile:
+    """Profil uji: throughput (MB/s) yang sama untuk kedua mode"""
+    result = backends.default_profile()
+    for name, mb in throughputs.items():
+        result.backends[name] = {m: (mb * backends.MB, 0.0) for m in backends.MODES}
+    return result
+
+
+class TestChoose:
+    """Tests untuk pemilihan backend"""
+
+    def test_fastest_supported_backend(self, sales_file):
+        """Test backend dengan perkiraan waktu terkecil yang dipilih"""
+        choice = backends.choose(
+            sales_file, cores=1, profile=profile(manual=500, vectorized=10)
+        )
+        assert choice.backend.name == "manual"
+        assert set(choice.estimates) == {"manual", "vectorized"}
+        assert any("parallel dilewati" in r for r in choice.reasons)
+        assert any("dbfread dilewati" in r for r in choice.reasons)
+
+    def test_parallel_needs_cores(self, sales_file):
+        """Test backend parallel hanya dipertimbangkan dengan > 1 core"""
+        choice = backends.choose(sales_file, cores=4, profile=profile(parallel=1000))
+        assert choice.backend.name == "parallel"
+
+    def test_categorical_restricts_backends(self, sales_file):
+        """Test kolom kategori hanya didukung backend vectorized"""
+        choice = backends.choose(
+            sales_file, cores=4, categorical=True, profile=profile(manual=500)
+        )
+        assert choice.backend.name == "vectorized"
+
+    def test_memo_prefers_dbfread(self, temp_dir, dbase3_factory):
+        """Test field memo dengan .DBT memilih dbfread"""
+        pytest.importorskip("dbfread")
+        path = dbase3_factory(name="NOTA.DTA", fields=[("ISI", "M", 10)], rows=[[b"1"]])
+        (temp_dir / "NOTA.DBT").write_bytes(bytes(512))
+        assert backends.choose(path).backend.name == "dbfread"
+
+    def test_explicit_backend(self, sales_file):
+        """Test backend eksplisit dipakai apa adanya, atau ditolak jika tidak bisa"""
+        assert backends.choose(sales_file, requested="manual").backend.name == "manual"
+        with pytest.raises(ValueError, match="core"):
+            backends.choose(sales_file, requested="parallel", cores=1)
+        with pytest.raises(ValueError):
+            backends.choose(sales_file, requested="cepat")
+
+
+class TestReaders:
+    """Tests bahwa semua backend teks menghasilkan data yang sama"""
+
+    @pytest.mark.parametrize("name", ["manual", "vectorized", "parallel"])
+    def test_rows_and_frame(self, sales_file, name, monkeypatch):
+        monkeypatch.setattr(backends, "PARALLEL_RANGE", 7)
+        backend = backends.BACKENDS[name]
+        header = dbase.read_header(sales_file)
+        expected = list(dbase.iter_rows(sales_file, header))
+
+        columns, stream = backend.rows(sales_file, header, cores=2)
+        assert columns == header.field_names
+        assert list(stream) == expected
+
+        df = backend.frame(sales_file, header, cores=2)
+        assert [tuple(r) for r in df.itertuples(index=False)] == expected
+
+    def test_parallel_ranges_follow_budget(self, sales_file):
+        """Test rentang paralel diperkecil agar 2 x workers rentang muat di anggaran"""
+        header = dbase.read_header(sales_file)
+        config = blockio.IOConfig(max_memory=header.decoded_size * 40)
+        ranges = backends._ranges(header, 2, config)
+        assert max(stop - start for start, stop in ranges) == 10
+        assert ranges[-1][1] == 50
+
+    def test_parallel_stops_at_eof(self, sales_file, monkeypatch):
+        """Test EOF di tengah file: rentang sesudahnya tidak ikut dibaca"""
+        monkeypatch.setattr(backends, "PARALLEL_RANGE", 7)
+        header = dbase.read_header(sales_file)
+        data = bytearray(sales_file.read_bytes())
+        data[header.header_size + 20 * header.record_size] = 0x1A
+        sales_file.write_bytes(bytes(data))
+
+        _, stream = backends.BACKENDS["parallel"].rows(sales_file, header, cores=2)
+        assert len(list(stream)) == 20
+
+
+class TestProfile:
+    """Tests untuk kalibrasi dan penyimpanan profil"""
+
+    def test_calibrate_and_reload(self, temp_dir, monkeypatch):
+        monkeypatch.setattr(backends.os, "cpu_count", lambda: 1)
+        result = backends.calibrate(records=2000, workdir=temp_dir)
+        path = temp_dir / "profile.json"
+        backends.save_profile(result, path)
+
+        loaded = backends.load_profile(path)
+        assert loaded.created == result.created
+        throughput, overhead = loaded.backends["vectorized"]["rows"]
+        assert throughput > 0 and overhead >= 0
+
+    def test_other_host_uses_default(self, temp_dir, monkeypatch):
+        """Test profil dari jumlah core lain diabaikan"""
+        path = temp_dir / "profile.json"
+        saved = backends.default_profile()
+        saved.created, saved.cpu_count = "2024-01-01T00:00:00", 64
+        backends.save_profile(saved, path)
+        monkeypatch.setattr(backends.os, "cpu_count", lambda: 2)
+        assert backends.load_profile(path).created is None
+
+
+class TestStats:
+    """Tests untuk --stats di CLI"""
+
+    def test_stats_shows_choice(self, sales_file, temp_dir, capsys):
+        exporter.main(
+            ["-i", str(sales_file), "-o", str(temp_dir / "out.csv"), "--stats"]
+        )
+        out = capsys.readouterr().out
+        assert "Backend:" in out
+        assert "Statistik: 50 baris" in out
@@ -0,0 +1,182 @@
+"""
+Unit tests untuk mode batch manifest dengan checkpoint (batch)
+"""
+
+import csv
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import batch
+import exporter
+
+FIELDS = [("KODE", "C", 6), ("QTY", "N", 4)]
+
+
+@pytest.fixture
+def archive_dirs(temp_dir, dbase3_factory):
+    """Dua folder bulanan, masing-masing berisi TJUAL.DTA dan TBELI.DTA"""
+    for month, count in (("2024-01", 3), ("2024-02", 5)):
+        (temp_dir / month).mkdir()
+        for name in ("TJUAL.DTA", "TBELI.DTA"):
+            dbase3_factory(
+                name=f"{month}/{name}",
+                fields=FIELDS,
+                rows=[[b"K%d" % i, b"%d" % i] for i in range(count)],
+            )
+    return temp_dir
+
+
+def write_manifest(temp_dir: Path, **manifest) -> Path:
+    path = temp_dir / "bulanan.json"
+    path.write_text(json.dumps(manifest), encoding="utf-8")
+    return path
+
+
+def read_csv(path: Path) -> list[list[str]]:
+    with open(path, encoding="utf-8-sig") as f:
+        return list(csv.reader(f))
+
+
+class TestManifest:
+    """Tests untuk ekspansi manifest"""
+
+    def test_globs_templates_and_defaults(self, archive_dirs):
+        manifest = write_manifest(
+            archive_dirs,
+            output_dir="hasil",
+            defaults={"encoding": "cp850"},
+            jobs=[
+                {"input": "*/TJUAL.DTA", "output": "{parent}_{stem}.{format}"},
+                {"input": ["2024-02/TBELI.DTA"], "format": "xlsx", "encoding": None},
+            ],
+        )
+        tasks = batch.load_manifest(manifest)
+        assert [t.output.name for t in tasks] == [
+            "2024-01_TJUAL.csv",
+            "2024-02_TJUAL.csv",
+            "TBELI.xlsx",
+        ]
+        assert all(t.output.parent == archive_dirs / "hasil" for t in tasks)
+        assert [t.encoding for t in tasks] == ["cp850", "cp850", None]
+
+    def test_colliding_outputs_rejected(self, archive_dirs):
+        manifest = write_manifest(archive_dirs, jobs=[{"input": "*/TJUAL.DTA"}])
+        with pytest.raises(ValueError, match="parent"):
+            batch.load_manifest(manifest)
+
+    def test_invalid_options(self, archive_dirs):
+        manifest = write_manifest(
+            archive_dirs, jobs=[{"input": "*/TJUAL.DTA", "format": "pdf"}]
+        )
+        with pytest.raises(ValueError, match="format"):
+            batch.load_manifest(manifest)
+        manifest = write_manifest(archive_dirs, jobs=[{"files": "*.DTA"}])
+        with pytest.raises(ValueError, match="input"):
+            batch.load_manifest(manifest)
+
+
+class TestRun:
+    """Tests untuk eksekusi dan checkpoint"""
+
+    @pytest.fixture
+    def manifest(self, archive_dirs):
+        return write_manifest(
+            archive_dirs,
+            output_dir="hasil",
+            jobs=[{"input": "*/*.DTA", "output": "{parent}/{stem}.csv"}],
+        )
+
+    def test_resume_skips_finished(self, manifest, archive_dirs):
+        tasks = batch.load_manifest(manifest)
+        checkpoint = batch.Checkpoint(batch.checkpoint_path(manifest))
+        results = batch.run(tasks, checkpoint, workers=1)
+        assert [r.error for r in results] == [None] * 4
+        assert read_csv(archive_dirs / "hasil" / "2024-02" / "TJUAL.csv")[-1] == [
+            "K4",
+            "4",
+        ]
+
+        # Run ulang: semua dilewati; input yang berubah diekspor lagi
+        checkpoint = batch.Checkpoint(batch.checkpoint_path(manifest))
+        assert batch.run(tasks, checkpoint, workers=1) == []
+        changed = archive_dirs / "2024-01" / "TBELI.DTA"
+        changed.write_bytes(changed.read_bytes() + b"\x00")
+        results = batch.run(tasks, checkpoint, workers=1)
+        assert [r.task.input for r in results] == [changed]
+
+    def test_worker_pool(self, manifest):
+        tasks = batch.load_manifest(manifest)
+        checkpoint = batch.Checkpoint(batch.checkpoint_path(manifest))
+        results = batch.run(tasks, checkpoint, workers=2)
+        assert sorted(r.rows for r in results if r.error is None) == [3, 3, 5, 5]
+        assert all(checkpoint.is_done(task) for task in tasks)
+
+    def test_interrupted_run_resumes(self, manifest, monkeypatch):
+        tasks = batch.load_manifest(manifest)
+        convert = exporter.convert_file
+        calls = []
+
+        def flaky(filepath, target, *args):
+            calls.append(filepath)
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+            return convert(filepath, target, *args)
+
+        monkeypatch.setattr(exporter, "convert_file", flaky)
+        checkpoint = batch.Checkpoint(batch.checkpoint_path(manifest))
+        with pytest.raises(KeyboardInterrupt):
+            batch.run(tasks, checkpoint, workers=1)
+        assert not list(tasks[2].output.parent.glob("*.tmp"))
+
+        monkeypatch.setattr(exporter, "convert_file", convert)
+        checkpoint = batch.Checkpoint(batch.checkpoint_path(manifest))
+        results = batch.run(tasks, checkpoint, workers=1)
+        assert [r.task for r in results] == tasks[2:]
+
+    def test_failed_file_not_recorded(self, manifest, archive_dirs):
+        (archive_dirs / "2024-01" / "RUSAK.DTA").write_bytes(b"\x03\x00")
+        tasks = batch.load_manifest(manifest)
+        checkpoint = batch.Checkpoint(batch.checkpoint_path(manifest))
+        results = batch.run(tasks, checkpoint, workers=1)
+
+        failed = [r for r in results if r.error]
+        assert [r.task.input.name for r in failed] == ["RUSAK.DTA"]
+        assert not failed[0].task.output.exists()
+        assert not checkpoint.is_done(failed[0].task)
+
+    def test_truncated_journal_line(self, manifest):
+        tasks = batch.load_manifest(manifest)
+        path = batch.checkpoint_path(manifest)
+        batch.run(tasks[:1], batch.Checkpoint(path), workers=1)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"input": "terpotong')
+
+        checkpoint = batch.Checkpoint(path)
+        assert checkpoint.is_done(tasks[0])
+        batch.run(tasks[1:2], checkpoint, workers=1)
+        assert batch.Checkpoint(path).is_done(tasks[1])
+
+    def test_xlsx_output(self, archive_dirs):
+        openpyxl = pytest.importorskip("openpyxl")
+        manifest = write_manifest(
+            archive_dirs, jobs=[{"input": "2024-02/TJUAL.DTA", "format": "xlsx"}]
+        )
+        tasks = batch.load_manifest(manifest)
+        batch.run(tasks, batch.Checkpoint(batch.checkpoint_path(manifest)))
+        sheet = openpyxl.load_workbook(tasks[0].output).active
+        assert sheet.title == "TJUAL"
+        assert sheet.max_row == 6
+
+    def test_cli(self, manifest, capsys):
+        assert exporter.main(["batch", str(manifest)]) == 0
+        assert "4 diekspor, 0 dilewati" in capsys.readouterr().out
+        assert exporter.main(["batch", str(manifest)]) == 0
+        assert "0 diekspor, 4 dilewati" in capsys.readouterr().out
+        assert exporter.main(["batch", str(manifest), "--restart"]) == 0
+        assert "4 diekspor, 0 dilewati" in capsys.readouterr().out
@@ -0,0 +1,170 @@
+"""
+Unit tests untuk lapisan I/O blok (blockio)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import blockio
+from blockio import BlockReader, IOConfig
+
+
+@pytest.fixture
+def data_file(temp_dir):
+    """File biner 1000 byte dengan pola berulang"""
+    filepath = temp_dir / "data.bin"
+    filepath.write_bytes(bytes(range(250)) * 4)
+    return filepath
+
+
+class TestBlockReader:
+    """Tests untuk BlockReader"""
+
+    @pytest.mark.parametrize("readahead", [0, 1, 3])
+    def test_blocks_reassemble_file(self, data_file, readahead):
+        """Test gabungan semua blok sama dengan isi file"""
+        blocks = list(BlockReader(data_file, block_size=64, readahead=readahead))
+
+        assert b"".join(blocks) == data_file.read_bytes()
+        assert all(len(b) <= 64 for b in blocks)
+
+    def test_start_and_length(self, data_file):
+        """Test membaca rentang tertentu saja"""
+        data = b"".join(BlockReader(data_file, start=100, length=50, block_size=16))
+
+        assert data == data_file.read_bytes()[100:150]
+
+    def test_early_stop_does_not_hang(self, data_file):
+        """Test berhenti di tengah iterasi tidak membuat thread menggantung"""
+        reader = BlockReader(data_file, block_size=8, readahead=1)
+        for _ in reader:
+            break
+        reader.close()
+
+    def test_invalid_block_size(self, data_file):
+        """Test block_size 0 ditolak"""
+        with pytest.raises(ValueError):
+            BlockReader(data_file, block_size=0)
+
+    def test_missing_file_raises(self, temp_dir):
+        """Test error dari thread read-ahead diteruskan ke pemanggil"""
+        with pytest.raises(FileNotFoundError):
+            list(BlockReader(temp_dir / "tidak_ada.bin"))
+
+    def test_producer_error_reraised(self, data_file, monkeypatch):
+        """Test error selain OSError di thread read-ahead juga sampai ke consumer"""
+
+        def broken_blocks(self):
+            yield b"x"
+            raise ValueError("data rusak")
+
+        monkeypatch.setattr(BlockReader, "_blocks", broken_blocks)
+        with pytest.raises(ValueError, match="data rusak"):
+            list(BlockReader(data_file, readahead=2))
+
+
+class TestIterRecordChunks:
+    """Tests untuk iter_record_chunks"""
+
+    def test_chunks_are_record_aligned(self, data_file):
+        """Test setiap chunk berisi record utuh walau blok tidak sejajar"""
+        config = IOConfig(block_size=50, readahead=1)
+        chunks = list(blockio.iter_record_chunks(data_file, 10, 21, None, config))
+
+        assert all(len(c) % 21 == 0 for c in chunks)
+        assert b"".join(chunks) == data_file.read_bytes()[10 : 10 + 47 * 21]
+
+    def test_count_limits_records(self, data_file):
+        """Test jumlah record dibatasi count"""
+        chunks = list(blockio.iter_record_chunks(data_file, 0, 10, 5))
+
+        assert b"".join(chunks) == data_file.read_bytes()[:50]
+
+
+class TestStaged:
+    """Tests untuk strategi salin ke scratch lokal"""
+
+    def test_direct_returns_original_path(self, data_file):
+        """Test strategi direct memakai file asli"""
+        with blockio.staged(data_file, IOConfig(strategy="direct")) as path:
+            assert path == data_file
+
+    def test_local_copies_and_cleans_up(self, data_file, temp_dir):
+        """Test strategi local menyalin file lalu menghapus salinannya"""
+        scratch = temp_dir / "scratch"
+        scratch.mkdir()
+        config = IOConfig(strategy="local", scratch_dir=scratch)
+
+        with blockio.staged(data_file, config) as path:
+            assert path != data_file
+            assert path.name == data_file.name
+            assert path.read_bytes() == data_file.read_bytes()
+
+        assert not path.exists()
+
+    def test_auto_keeps_small_files_direct(self, data_file):
+        """Test file kecil tidak disalin pada strategi auto"""
+        assert blockio.choose_strategy(data_file, IOConfig(strategy="auto")) == (
+            "direct"
+        )
+
+    def test_unknown_strategy(self, data_file):
+        """Test strategi tidak dikenal ditolak"""
+        with (
+            pytest.raises(ValueError),
+            blockio.staged(data_file, IOConfig(strategy="nfs")),
+        ):
+            pass
+
+
+class TestMemoryBudget:
+    """Tests untuk --max-memory: ukuran blok dan jumlah proses"""
+
+    def test_parse_size(self):
+        assert blockio.parse_size("512M") == 512 * blockio.MB
+        assert blockio.parse_size("1.5g") == 1536 * blockio.MB
+        assert blockio.parse_size("800KB") == 800 * 1024
+        assert blockio.parse_size("64") == 64 * blockio.MB
+        with pytest.raises(ValueError):
+            blockio.parse_size("banyak")
+
+    def test_fit_block_size(self):
+        """Test blok diperkecil ke kelipatan record, tidak pernah diperbesar"""
+        config = IOConfig(readahead=2, max_memory=4 * blockio.MB)
+        fitted = blockio.fit_block_size(config, 100, 700)
+        # (2 + 1) x 100 byte mentah + 700 byte hasil decode per record
+        assert fitted.block_size == 4 * blockio.MB // 1000 * 100
+        assert fitted.max_memory == config.max_memory
+
+        tiny = blockio.fit_block_size(IOConfig(max_memory=1024), 100, 700)
+        assert tiny.block_size == blockio.MIN_BLOCK_SIZE
+        large = blockio.fit_block_size(IOConfig(max_memory=64 * 1024**3), 100, 700)
+        assert large.block_size == blockio.DEFAULT_BLOCK_SIZE
+        assert blockio.fit_block_size(IOConfig(), 100, 700) == IOConfig()
+
+    def test_workers_and_share(self):
+        config = IOConfig(max_memory=3 * blockio.WORKER_MEMORY)
+        assert blockio.budget_workers(config, 8) == 3
+        assert blockio.budget_workers(IOConfig(max_memory=1), 8) == 1
+        assert blockio.budget_workers(IOConfig(), 8) == 8
+        assert blockio.share_memory(config, 3).max_memory == blockio.WORKER_MEMORY
+        assert blockio.share_memory(IOConfig(), 3) == IOConfig()
+
+    def test_dbase_chunks_follow_budget(self, dbase3_factory):
+        """Test chunk record dBase mengikuti anggaran, isi tetap sama"""
+        import dbase
+
+        rows = [[b"%08d" % i] for i in range(20000)]
+        path = dbase3_factory(fields=[("KODE", "C", 8)], rows=rows)
+        header = dbase.read_header(path)
+        config = IOConfig(max_memory=header.decoded_size * 1000, readahead=0)
+
+        chunks = list(dbase.iter_record_chunks(path, header, config))
+        assert len(chunks) > 1
+        assert max(map(len, chunks)) <= blockio.MIN_BLOCK_SIZE
+        assert b"".join(chunks) == b"".join(dbase.iter_record_chunks(path, header))
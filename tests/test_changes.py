@@ -0,0 +1,194 @@
+"""
+Unit tests untuk diff snapshot per blok (changes)
+"""
+
+import csv
+import struct
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import changes
+import exporter
+
+FIELDS = [("KODE", "C", 6), ("QTY", "N", 4)]
+
+
+def rows(n: int) -> list[list[bytes]]:
+    return [[b"K%04d" % i, b"%4d" % i] for i in range(n)]
+
+
+@pytest.fixture
+def snapshots(temp_dir, dbase3_factory):
+    """Factory (lama, baru) TJUAL.DTA di folder terpisah"""
+    (temp_dir / "lama").mkdir()
+    (temp_dir / "baru").mkdir()
+
+    def factory(old_rows, new_rows, old_deleted=(), new_deleted=()):
+        old = dbase3_factory(
+            name="lama/TJUAL.DTA",
+            fields=FIELDS,
+            rows=old_rows,
+            deleted=set(old_deleted),
+        )
+        new = dbase3_factory(
+            name="baru/TJUAL.DTA",
+            fields=FIELDS,
+            rows=new_rows,
+            deleted=set(new_deleted),
+        )
+        return old, new
+
+    return factory
+
+
+class TestDiff:
+    """Tests untuk pencocokan per posisi record"""
+
+    def test_update_insert_delete(self, snapshots):
+        new_rows = rows(25)
+        new_rows[3] = [b"K0003", b"  99"]
+        old, new = snapshots(rows(20), new_rows, new_deleted={7})
+
+        result = changes.diff(old, new, block_records=4)
+        assert result.columns == ["PERUBAHAN", "RECNO", "KODE", "QTY"]
+        assert result.rows == [
+            ("UBAH", 4, "K0003", "99"),
+            ("HAPUS", 8, "K0007", "7"),
+            *[("BARU", i + 1, f"K{i:04d}", str(i)) for i in range(20, 25)],
+        ]
+        # Hanya blok 0, 1 (ubah/hapus) dan 5, 6 (append) yang dibaca
+        assert (result.changed_blocks, result.blocks) == (4, 7)
+
+    def test_undelete_and_shrink(self, snapshots):
+        """Test record dipulihkan = baru, record hilang di akhir = hapus"""
+        old, new = snapshots(rows(10), rows(8), old_deleted={2})
+        result = changes.diff(old, new, block_records=4)
+        assert [(r[0], r[1]) for r in result.rows] == [
+            ("BARU", 3),
+            ("HAPUS", 9),
+            ("HAPUS", 10),
+        ]
+
+    def test_identical(self, snapshots):
+        old, new = snapshots(rows(10), rows(10))
+        result = changes.diff(old, new, block_records=4)
+        assert result.rows == []
+        assert result.changed_blocks == 0
+
+    def test_schema_change_rejected(self, snapshots, temp_dir, dbase3_factory):
+        old, _ = snapshots(rows(3), rows(3))
+        new = dbase3_factory(
+            name="baru/TJUAL.DTA", fields=[("KODE", "C", 10)], rows=[[b"A"]]
+        )
+        with pytest.raises(ValueError, match="Struktur"):
+            changes.diff(old, new)
+
+    def test_key_ignores_moved_records(self, snapshots):
+        """Test dengan --key, record yang hanya pindah posisi (pack) tidak dilaporkan"""
+        old_rows = rows(10)
+        new_rows = old_rows[:2] + old_rows[3:]
+        new_rows[5] = [b"K0006", b"  60"]
+        old, new = snapshots(old_rows, new_rows)
+
+        result = changes.diff(old, new, block_records=4, key=["kode"])
+        assert sorted((r[0], r[2]) for r in result.rows) == [
+            ("HAPUS", "K0002"),
+            ("UBAH", "K0006"),
+        ]
+
+
+class TestSidecar:
+    """Tests untuk cache hash blok di sidecar"""
+
+    def test_sidecar_reused_until_file_changes(self, snapshots):
+        old, new = snapshots(rows(10), rows(10))
+        assert not changes.diff(old, new, block_records=4, cache_hashes=True).cached
+        assert changes.sidecar_path(old).exists()
+        assert changes.diff(old, new, block_records=4).cached
+        # Ukuran blok berbeda: hash dihitung ulang
+        assert not changes.diff(old, new, block_records=2, cache_hashes=True).cached
+
+        old.write_bytes(old.read_bytes().replace(b"K0001", b"X0001"))
+        result = changes.diff(old, new, block_records=2)
+        assert [(r[0], r[1]) for r in result.rows] == [("UBAH", 2)]
+
+    def test_no_sidecar_next_to_inputs_by_default(self, snapshots):
+        """Test diff biasa tidak menulis apa pun ke folder input"""
+        old, new = snapshots(rows(10), rows(10))
+        before = {p: sorted(p.parent.iterdir()) for p in (old, new)}
+
+        changes.diff(old, new, block_records=4)
+
+        assert {p: sorted(p.parent.iterdir()) for p in (old, new)} == before
+
+    def test_snapshot_rolls_forward(self, snapshots, temp_dir):
+        """Test --snapshot menggantikan snapshot lama dengan salinan baru + sidecar"""
+        old, new = snapshots(rows(5), rows(6))
+        result = changes.diff(old, new, block_records=4, snapshot_dir=old.parent)
+        assert [r[0] for r in result.rows] == ["BARU"]
+        assert old.read_bytes() == new.read_bytes()
+        assert changes.diff(old, new, block_records=4).cached
+        assert not list(old.parent.glob("*.tmp"))
+
+
+class TestFormats:
+    """Tests untuk STOCK1.DAT dan snapshot dari arsip"""
+
+    def test_stock(self, sample_stock_file, temp_dir):
+        old = temp_dir / "lama" / "STOCK1.DAT"
+        old.parent.mkdir()
+        old.write_bytes(sample_stock_file.read_bytes() + b"\x00" * 23)
+        data = bytearray(old.read_bytes())
+        pos = data.find(b"8997654321098")
+        data[pos + 17 : pos + 21] = struct.pack("<I", 5)
+        sample_stock_file.write_bytes(bytes(data))
+
+        result = changes.diff(old, sample_stock_file, block_records=2)
+        assert [r[:4] for r in result.rows] == [("UBAH", 2, "8997654321098", 5)]
+
+    def test_stock_layout(self, sample_stock_file, temp_dir):
+        """Test kolom STOCK mengikuti skema --stock-layout"""
+        old = temp_dir / "lama" / "STOCK1.DAT"
+        old.parent.mkdir()
+        old.write_bytes(sample_stock_file.read_bytes() + b"\x00" * 23)
+        data = bytearray(old.read_bytes())
+        pos = data.find(b"8997654321098")
+        data[pos + 13 : pos + 17] = struct.pack("<I", 2021)
+        sample_stock_file.write_bytes(bytes(data))
+        schema = temp_dir / "stock.json"
+        schema.write_text(
+            '{"fields": [{"name": "BARCODE", "offset": 0, "type": "13s"},'
+            ' {"name": "TAHUN", "offset": 13, "type": "<I"}]}'
+        )
+
+        output = temp_dir / "perubahan.csv"
+        argv = ["diff", str(old), str(sample_stock_file), "-o", str(output)]
+        assert exporter.main(argv + ["--stock-layout", str(schema)]) == 0
+        with open(output, encoding="utf-8-sig") as f:
+            assert list(csv.reader(f)) == [
+                ["PERUBAHAN", "RECNO", "BARCODE", "TAHUN"],
+                ["UBAH", "2", "8997654321098", "2021"],
+            ]
+
+    def test_cli_with_zip_snapshot(self, snapshots, temp_dir, capsys):
+        new_rows = rows(6)
+        new_rows[0] = [b"K0000", b"   7"]
+        old, new = snapshots(rows(6), new_rows)
+        backup = temp_dir / "backup.zip"
+        with zipfile.ZipFile(backup, "w") as zf:
+            zf.write(old, "DATA/TJUAL.DTA")
+
+        output = temp_dir / "perubahan.csv"
+        assert exporter.main(["diff", str(backup), str(new), "-o", str(output)]) == 0
+        with open(output, encoding="utf-8-sig") as f:
+            assert list(csv.reader(f)) == [
+                ["PERUBAHAN", "RECNO", "KODE", "QTY"],
+                ["UBAH", "1", "K0000", "7"],
+            ]
+        assert "1 diubah" in capsys.readouterr().out
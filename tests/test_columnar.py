@@ -0,0 +1,242 @@
+"""
+Unit tests untuk penyimpanan kolumnar (columnar)
+"""
+
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import columnar
+import dbase
+import stock
+from blockio import IOConfig
+from columnar import ColumnarTable, ColumnSpec
+
+FIELDS = [("KODE", "C", 6), ("NAMA", "C", 8)]
+
+
+class TestColumnarTable:
+    """Tests untuk ColumnarTable"""
+
+    def test_append_grows_beyond_capacity(self):
+        """Test kapasitas bertambah bila data melebihi praalokasi"""
+        table = ColumnarTable([ColumnSpec("N", dtype="<i4")], capacity=2)
+        table.append({"N": np.arange(3, dtype="<i4")})
+        table.append({"N": np.arange(3, dtype="<i4")})
+
+        assert len(table) == 6
+        assert table.raw("N").tolist() == [0, 1, 2, 0, 1, 2]
+
+    def test_row_view_has_no_dict(self):
+        """Test RowView memakai __slots__"""
+        table = ColumnarTable([ColumnSpec("A", width=3)], capacity=1)
+        table.append({"A": np.array([b"ab "], dtype="S3")})
+
+        row = table[0]
+        assert not hasattr(row, "__dict__")
+        assert row["A"] == "ab"
+        assert row.as_dict() == {"A": "ab"}
+
+    def test_index_out_of_range(self):
+        """Test index di luar jangkauan"""
+        table = ColumnarTable([ColumnSpec("A", width=3)], capacity=5)
+
+        with pytest.raises(IndexError):
+            table[0]
+
+    def test_numeric_column_shares_buffer_with_pandas(self):
+        """Test kolom numerik tidak disalin saat konversi ke pandas"""
+        table = ColumnarTable([ColumnSpec("N", dtype="<u4")], capacity=3)
+        table.append({"N": np.array([1, 2, 3], dtype="<u4")})
+
+        df = table.to_pandas()
+        assert np.shares_memory(df["N"].to_numpy(), table.raw("N"))
+
+
+class TestCategorical:
+    """Tests untuk kolom teks dictionary-encoded"""
+
+    @staticmethod
+    def table(values: list[bytes], width: int = 4) -> ColumnarTable:
+        table = ColumnarTable([ColumnSpec("A", width=width)], capacity=len(values))
+        table.append({"A": np.array(values, dtype=f"S{width}")})
+        return table
+
+    @pytest.mark.parametrize("width", [4, 12])
+    def test_dictionary_matches_text(self, width):
+        """Test codes + categories sama dengan decode per sel"""
+        table = self.table([b"PCS", b"KG", b"PCS", b" KG", b"", b"KG"], width)
+
+        codes, categories = table.dictionary("A")
+        assert categories.tolist() == ["", "KG", "PCS"]
+        assert categories[codes].tolist() == table.text("A").tolist()
+
+    def test_to_pandas_selected_column(self):
+        """Test kolom yang dipilih menjadi pd.Categorical"""
+        table = self.table([b"X", b"Y", b"X"])
+
+        df = table.to_pandas(categorical=["A"])
+        assert df["A"].dtype == "category"
+        assert df["A"].tolist() == ["X", "Y", "X"]
+
+    def test_auto_by_cardinality(self):
+        """Test auto hanya memilih kolom dengan sedikit nilai unik"""
+        n = 1000
+        table = ColumnarTable(
+            [ColumnSpec("SAT", width=3), ColumnSpec("ID", width=6)], capacity=n
+        )
+        table.append(
+            {
+                "SAT": np.array([b"PCS", b"KG"] * (n // 2), dtype="S3"),
+                "ID": np.array([b"%06d" % i for i in range(n)], dtype="S6"),
+            }
+        )
+
+        assert table.categorical_names("auto") == ["SAT"]
+        assert table.categorical_names() == []
+
+    def test_unknown_column(self):
+        """Test kolom bukan teks ditolak"""
+        table = ColumnarTable([ColumnSpec("N", dtype="<u4")], capacity=1)
+
+        with pytest.raises(ValueError):
+            table.categorical_names(["N"])
+
+
+class TestLoadDbase:
+    """Tests untuk load_dbase"""
+
+    def test_matches_row_reader(self, dbase3_factory):
+        """Test hasil sama dengan pembaca baris stdlib"""
+        rows = [[f"K{i}".encode(), "Café".encode("cp437")] for i in range(40)]
+        path = dbase3_factory(fields=FIELDS, rows=rows)
+        header = dbase.read_header(path)
+        config = IOConfig(block_size=header.record_size * 9)
+
+        table = columnar.load_dbase(path, header, config)
+
+        assert table.capacity == 40
+        assert [tuple(r) for r in table] == list(dbase.iter_rows(path, header))
+
+    def test_stores_fixed_width_bytes(self, sample_dbase3_file):
+        """Test kolom teks disimpan sebagai bytes lebar tetap"""
+        table = columnar.load_dbase(sample_dbase3_file)
+
+        assert table.raw("NAME").dtype == np.dtype("S10")
+        assert table.nbytes == 3 * 20
+
+    def test_to_pandas(self, sample_dbase3_file):
+        """Test konversi ke DataFrame"""
+        df = columnar.load_dbase(sample_dbase3_file).to_pandas()
+
+        assert df["NAME"].tolist() == ["Product A", "Product B", "Product C"]
+        assert df["VALUE"].tolist() == ["1000", "2000", "3000"]
+
+
+class TestLoadStock:
+    """Tests untuk load_stock"""
+
+    def test_matches_row_parser(self):
+        """Test hasil sama dengan stock.iter_records"""
+        data = bytearray(b"\x06\x00" * 50)
+        for i in range(30):
+            barcode = b" " * 13 if i % 7 == 3 else b"899%010d" % i
+            data += barcode + struct.pack("<II", 2020, i * 10) + b"\x00\x00"
+        data = bytes(data)
+
+        table = columnar.load_stock(data)
+
+        assert [tuple(r) for r in table] == list(stock.iter_records(data))
+        assert table.raw("VALUE").dtype == np.dtype("<u4")
+
+    def test_no_barcodes(self):
+        """Test data tanpa barcode menghasilkan tabel kosong"""
+        table = columnar.load_stock(b"\x00" * 100)
+
+        assert len(table) == 0
+        assert len(table.to_pandas()) == 0
+
+    def test_custom_layout(self):
+        """Test layout kustom: kolom bertipe sama dengan parser per record"""
+        layout = stock.StockLayout(
+            (
+                stock.StockField("BARCODE", 0, "13s"),
+                stock.StockField("TAHUN", 13, "<I"),
+                stock.StockField("HARGA", 17, "<f"),
+                stock.StockField("KODE", 21, "2s"),
+                stock.StockField("LEBIH", 30, "<h"),
+            )
+        )
+        data = bytearray(b"\x06\x00" * 50)
+        for i in range(20):
+            data += b"899%010d" % i + struct.pack("<If", 2020 + i, i / 4) + b"K%d" % i
+        data = bytes(data)
+
+        table = columnar.load_stock(data, layout=layout)
+
+        assert table.names == ["BARCODE", "TAHUN", "HARGA", "KODE", "LEBIH"]
+        assert table.raw("TAHUN").dtype == np.dtype("<u4")
+        assert table.raw("HARGA").dtype == np.dtype("<f4")
+        # Field di luar ukuran record bernilai 0
+        assert not table.raw("LEBIH").any()
+        expected = list(stock.iter_records(data, layout=layout))
+        assert [tuple(r) for r in table] == expected
+        assert list(table.iter_rows(chunk_rows=7)) == expected
+
+    def test_raw_column_is_binary(self):
+        """Test RAW_DATA opsional berisi bytes (termasuk NUL di akhir)"""
+        layout = stock.StockLayout(stock.DEFAULT_LAYOUT.fields, raw=True)
+        payload = struct.pack("<II", 2020, 1000) + b"\x00\x00"
+        data = b"\x06\x00" * 50 + (b"8991234567890" + payload) * 3
+
+        table = columnar.load_stock(data, layout=layout)
+        df = table.to_pandas()
+
+        assert df["RAW_DATA"].tolist() == [payload, payload]
+        assert next(table.iter_rows())[-1] == payload.hex()
+        assert next(table.iter_rows(binary=True))[-1] == payload
+
+
+class TestStockLayout:
+    """Tests untuk skema STOCK1.DAT (stock.StockLayout/load_layout)"""
+
+    def test_load_layout(self, temp_dir):
+        """Test skema JSON dibaca, tipe tanpa prefix menjadi little-endian"""
+        path = temp_dir / "stock.json"
+        path.write_text(
+            '{"raw": true, "fields": [{"name": "BARCODE", "offset": 0, "type": "13s"},'
+            ' {"name": "QTY", "offset": 13, "type": "h"}]}'
+        )
+
+        layout = stock.load_layout(path)
+
+        assert layout.columns == ["BARCODE", "QTY", "RAW_DATA"]
+        assert layout.fields[1].type == "<h"
+        assert layout.fields[1].size == 2
+
+    @pytest.mark.parametrize(
+        "schema",
+        [
+            '{"fields": [{"name": "A", "offset": 0, "type": "x"}]}',
+            '{"fields": [{"name": "A", "offset": 0}]}',
+            (
+                '{"fields": [{"name": "A", "offset": 0, "type": "<I"},'
+                ' {"name": "a", "offset": 4, "type": "<I"}]}'
+            ),
+            '{"record_size": 16, "fields": [{"name": "A", "offset": 14, "type": "<I"}]}',
+            "bukan json",
+        ],
+    )
+    def test_invalid_layout(self, temp_dir, schema):
+        """Test skema tidak valid ditolak dengan ValueError"""
+        path = temp_dir / "stock.json"
+        path.write_text(schema)
+
+        with pytest.raises(ValueError, match="Skema STOCK"):
+            stock.load_layout(path)
@@ -0,0 +1,205 @@
+"""
+Unit tests untuk inti pembaca dBase III (dbase)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import dbase
+from blockio import IOConfig
+
+FIELDS = [("KODE", "C", 6), ("NAMA", "C", 8), ("QTY", "N", 4)]
+
+
+class TestReadHeader:
+    """Tests untuk read_header"""
+
+    def test_parses_fields_and_offsets(self, sample_dbase3_file):
+        """Test field dan offset di dalam record"""
+        header = dbase.read_header(sample_dbase3_file)
+
+        assert header.num_records == 3
+        assert header.record_size == 21
+        assert header.field_names == ["NAME", "VALUE"]
+        assert [f.offset for f in header.fields] == [1, 11]
+
+    def test_reads_language_driver_byte(self, dbase3_factory):
+        """Test language driver byte (offset 29) dipetakan ke codec"""
+        path = dbase3_factory(fields=FIELDS, rows=[], language_driver=0x02)
+        header = dbase.read_header(path)
+
+        assert header.language_driver == 0x02
+        assert header.encoding == "cp850"
+
+    def test_unknown_language_driver_uses_default(self, dbase3_factory):
+        """Test language driver 0 memakai encoding default"""
+        path = dbase3_factory(fields=FIELDS, rows=[])
+
+        assert dbase.read_header(path).encoding == dbase.DEFAULT_ENCODING
+
+    def test_short_file_raises(self, empty_file):
+        """Test file terlalu pendek ditolak"""
+        with pytest.raises(ValueError):
+            dbase.read_header(empty_file)
+
+    def test_missing_terminator_raises(self, temp_dir):
+        """Test file bukan dBase (tanpa terminator) ditolak tanpa memindai semuanya"""
+        path = temp_dir / "JUNK.DAT"
+        path.write_bytes(b"\x03" + b"\x41" * (2 * 1024 * 1024))
+
+        with pytest.raises(ValueError, match="Terminator"):
+            dbase.read_header(path)
+
+    def test_wrong_header_size_still_parses(self, sample_dbase3_file):
+        """Test header_size terlalu kecil: deskriptor tetap dibaca sampai terminator"""
+        data = bytearray(sample_dbase3_file.read_bytes())
+        data[8:10] = (32).to_bytes(2, "little")
+        sample_dbase3_file.write_bytes(data)
+
+        assert dbase.read_header(sample_dbase3_file).field_names == ["NAME", "VALUE"]
+
+
+class TestDecode:
+    """Tests untuk decode kolom per chunk"""
+
+    def test_cp437_box_drawing_and_accents(self, dbase3_factory):
+        """Test karakter DOS (box drawing, aksen) di-decode dengan benar"""
+        nama = "╔═Café".encode("cp437")
+        path = dbase3_factory(
+            fields=FIELDS, rows=[[b"A1", nama, b"5"]], language_driver=0x01
+        )
+        header = dbase.read_header(path)
+
+        assert list(dbase.iter_rows(path, header)) == [("A1", "╔═Café", "5")]
+
+    def test_explicit_encoding_overrides_header(self, dbase3_factory):
+        """Test encoding eksplisit menang atas language driver"""
+        path = dbase3_factory(
+            fields=FIELDS, rows=[[b"A1", "Ñandú".encode("cp850"), b"1"]]
+        )
+        header = dbase.read_header(path)
+
+        rows = list(dbase.iter_rows(path, header, encoding="cp850"))
+        assert rows[0][1] == "Ñandú"
+
+    def test_multibyte_encoding_falls_back_per_cell(self, dbase3_factory):
+        """Test codepage multi-byte tetap di-decode per sel"""
+        path = dbase3_factory(
+            fields=FIELDS, rows=[[b"A1", "日本".encode("cp932"), b"1"]]
+        )
+        header = dbase.read_header(path)
+
+        rows = list(dbase.iter_rows(path, header, encoding="cp932"))
+        assert rows[0] == ("A1", "日本", "1")
+
+    def test_columns_across_chunks(self, dbase3_factory):
+        """Test record dibagi ke beberapa chunk tetap terbaca semua"""
+        rows = [[f"K{i}".encode(), b"X", str(i).encode()] for i in range(50)]
+        path = dbase3_factory(fields=FIELDS, rows=rows)
+        header = dbase.read_header(path)
+        config = IOConfig(block_size=header.record_size * 7)
+
+        chunks = list(dbase.iter_column_chunks(path, header, config))
+        assert len(chunks) > 1
+        assert sum(len(c[0]) for c in chunks) == 50
+        assert chunks[-1][2][-1] == "49"
+
+    def test_stops_at_eof_marker(self, dbase3_factory):
+        """Test pembacaan berhenti di EOF marker walau num_records lebih besar"""
+        path = dbase3_factory(fields=FIELDS, rows=[[b"A", b"B", b"1"]])
+        data = bytearray(path.read_bytes())
+        data[4] = 10  # num_records palsu
+        data.extend(b"\x20" * 19)  # sampah setelah EOF marker
+        path.write_bytes(bytes(data))
+
+        header = dbase.read_header(path)
+        assert len(list(dbase.iter_rows(path, header))) == 1
+
+
+class TestIsSingleByte:
+    """Tests untuk deteksi codepage satu-byte"""
+
+    @pytest.mark.parametrize("encoding", ["cp437", "cp850", "cp1252", "latin-1"])
+    def test_single_byte(self, encoding):
+        assert dbase.is_single_byte(encoding)
+
+    @pytest.mark.parametrize("encoding", ["cp932", "utf-8", "utf-16"])
+    def test_multi_byte(self, encoding):
+        assert not dbase.is_single_byte(encoding)
+
+
+class TestDbfTable:
+    """Tests untuk akses acak DbfTable"""
+
+    @pytest.fixture
+    def table_path(self, dbase3_factory):
+        rows = [
+            [f"K{i}".encode(), f"N{i}".encode(), str(i).encode()] for i in range(20)
+        ]
+        return dbase3_factory(fields=FIELDS, rows=rows, deleted={3, 7})
+
+    def test_len_and_index(self, table_path):
+        """Test len() dan table[i]"""
+        with dbase.DbfTable(table_path) as table:
+            assert len(table) == 20
+            assert table[0] == ("K0", "N0", "0")
+            assert table[-1] == ("K19", "N19", "19")
+
+    def test_deleted_record_raises(self, table_path):
+        """Test record terhapus tidak dikembalikan"""
+        with dbase.DbfTable(table_path) as table:
+            assert table.is_deleted(3)
+            with pytest.raises(KeyError):
+                table[3]
+
+    def test_include_deleted(self, table_path):
+        """Test include_deleted mengembalikan record terhapus"""
+        with dbase.DbfTable(table_path, include_deleted=True) as table:
+            assert table[3] == ("K3", "N3", "3")
+            assert len(table[0:10]) == 10
+
+    def test_slice_skips_deleted(self, table_path):
+        """Test slicing melewati record terhapus"""
+        with dbase.DbfTable(table_path) as table:
+            rows = table[2:9]
+            assert [r[2] for r in rows] == ["2", "4", "5", "6", "8"]
+            assert [r[2] for r in table[0:10:4]] == ["0", "4", "8"]
+
+    def test_read_range_returns_record_numbers(self, table_path):
+        """Test read_range mengembalikan nomor record fisik"""
+        with dbase.DbfTable(table_path) as table:
+            recnos, columns = table.read_range(6, 9)
+            assert recnos == [6, 8]
+            assert columns[0] == ["K6", "K8"]
+
+    def test_take(self, table_path):
+        """Test take() dengan index acak"""
+        with dbase.DbfTable(table_path) as table:
+            rows = table.take([15, 1, 7, -1])
+            assert [r[0] for r in rows] == ["K15", "K1", "K19"]
+
+    def test_out_of_range(self, table_path):
+        """Test index di luar jangkauan"""
+        with dbase.DbfTable(table_path) as table, pytest.raises(IndexError):
+            table[20]
+
+    def test_iter_matches_sequential_reader(self, table_path):
+        """Test iterasi sama dengan pembacaan sekuensial tanpa record terhapus"""
+        header = dbase.read_header(table_path)
+        with dbase.DbfTable(table_path) as table:
+            sequential = list(dbase.iter_rows(table_path, header))
+            expected = [r for i, r in enumerate(sequential) if i not in (3, 7)]
+            assert list(table) == expected
+
+    def test_truncated_file_limits_length(self, table_path):
+        """Test num_records di header tidak dipercaya melebihi isi file"""
+        data = table_path.read_bytes()
+        table_path.write_bytes(data[: len(data) - 1 - 19 * 5 - 4])
+
+        with dbase.DbfTable(table_path) as table:
+            assert len(table) == 14
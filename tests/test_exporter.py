@@ -0,0 +1,198 @@
+"""
+Tests untuk CLI exporter (jalur CSV streaming dan lazy import)
+"""
+
+import csv
+import struct
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import exporter
+
+ROOT = Path(__file__).parent.parent
+
+
+def read_csv(path: Path) -> list[list[str]]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return list(csv.reader(f))
+
+
+class TestExportToCsv:
+    """Tests untuk export_to_csv"""
+
+    def test_dbase3_to_csv(self, sample_dbase3_file, temp_dir):
+        """Test ekspor dBase III ke CSV"""
+        output = temp_dir / "out.csv"
+        exporter.export_to_csv([sample_dbase3_file], output)
+
+        rows = read_csv(output)
+        assert rows[0] == ["NAME", "VALUE"]
+        assert rows[1] == ["Product A", "1000"]
+        assert len(rows) == 4
+
+    def test_stock_to_csv(self, sample_stock_file, temp_dir):
+        """Test ekspor STOCK1.DAT ke CSV"""
+        output = temp_dir / "out.csv"
+        exporter.export_to_csv([sample_stock_file], output)
+
+        rows = read_csv(output)
+        assert rows[0] == ["BARCODE", "VALUE"]
+        assert rows[1][0] == "8991234567890"
+
+    def test_stock_layout_option(self, sample_stock_file, temp_dir):
+        """Test --stock-layout: field bertipe dan RAW_DATA hex di CSV"""
+        schema = temp_dir / "stock.json"
+        schema.write_text(
+            '{"raw": true, "fields": [{"name": "BARCODE", "offset": 0, "type": "13s"},'
+            ' {"name": "TAHUN", "offset": 13, "type": "<I"},'
+            ' {"name": "VALUE", "offset": 17, "type": "<I"}]}'
+        )
+        output = temp_dir / "out.csv"
+
+        exporter.main(
+            ["-i", str(sample_stock_file), "-o", str(output)]
+            + ["--stock-layout", str(schema)]
+        )
+
+        rows = read_csv(output)
+        assert rows[0] == ["BARCODE", "TAHUN", "VALUE", "RAW_DATA"]
+        assert rows[1][1:3] == ["2020", "1000"]
+        assert bytes.fromhex(rows[1][3])[:4] == struct.pack("<I", 2020)
+
+    def test_invalid_stock_layout(self, sample_stock_file, temp_dir):
+        """Test skema STOCK tidak valid ditolak sebelum ekspor"""
+        schema = temp_dir / "stock.json"
+        schema.write_text('{"fields": [{"name": "X", "offset": 0, "type": "z"}]}')
+
+        with pytest.raises(SystemExit):
+            exporter.main(
+                ["-i", str(sample_stock_file), "-o", str(temp_dir / "out.csv")]
+                + ["--stock-layout", str(schema)]
+            )
+
+    @pytest.mark.parametrize(
+        "option",
+        [
+            ["--block-size", "0"],
+            ["--block-size", "-1"],
+            ["--block-size", "nan"],
+            ["--readahead", "-1"],
+            ["--max-memory", "0"],
+        ],
+    )
+    def test_invalid_io_options_rejected(
+        self, sample_dbase3_file, temp_dir, option, capsys
+    ):
+        """Test ukuran I/O tidak valid ditolak saat parsing argumen"""
+        output = temp_dir / "out.csv"
+
+        with pytest.raises(SystemExit) as exc:
+            exporter.main(["-i", str(sample_dbase3_file), "-o", str(output)] + option)
+
+        assert exc.value.code == 2
+        assert option[0] in capsys.readouterr().err
+        assert not output.exists()
+
+    def test_multiple_inputs_write_one_csv_each(
+        self, sample_dbase3_file, sample_stock_file, temp_dir
+    ):
+        """Test beberapa input menghasilkan satu CSV per file"""
+        output = temp_dir / "hasil.csv"
+        exporter.export_to_csv([sample_dbase3_file, sample_stock_file], output)
+
+        assert (temp_dir / "hasil_test.csv").exists()
+        assert (temp_dir / "hasil_STOCK1.csv").exists()
+
+    def test_same_stem_gets_unique_csv(self, dbase3_factory, temp_dir):
+        """Test dua input bernama sama (folder berbeda) tidak menimpa satu CSV"""
+        fields = [("KODE", "C", 7)]
+        for folder in ("a", "b"):
+            (temp_dir / folder).mkdir()
+        first = dbase3_factory(
+            name="a/TJUAL.DTA", fields=fields, rows=[[b"A%d" % i] for i in range(500)]
+        )
+        second = dbase3_factory(
+            name="b/TJUAL.DTA", fields=fields, rows=[[b"B%d" % i] for i in range(300)]
+        )
+        output = temp_dir / "out.csv"
+
+        exporter.main(
+            ["-i", str(first), str(second), "-o", str(output), "--workers", "2"]
+        )
+
+        assert len(read_csv(temp_dir / "out_TJUAL.csv")) == 501
+        assert len(read_csv(temp_dir / "out_TJUAL_2.csv")) == 301
+
+    def test_max_memory_same_output(self, dbase3_factory, temp_dir):
+        """Test --max-memory hanya mengubah ukuran chunk, bukan hasil"""
+        rows = [[b"K%06d" % i, b"%d" % (i % 97)] for i in range(5000)]
+        path = dbase3_factory(fields=[("KODE", "C", 7), ("QTY", "N", 3)], rows=rows)
+        exporter.main(["-i", str(path), "-o", str(temp_dir / "a.csv")])
+        exporter.main(
+            ["-i", str(path), "-o", str(temp_dir / "b.csv"), "--max-memory", "1M"]
+        )
+        assert (temp_dir / "a.csv").read_bytes() == (temp_dir / "b.csv").read_bytes()
+
+
+class TestLazyImports:
+    """Tests bahwa CLI tidak mengimpor modul berat tanpa perlu"""
+
+    def test_csv_path_never_imports_pandas(self, sample_dbase3_file, temp_dir):
+        """Test import exporter + ekspor CSV tidak mengimpor pandas/dbfread"""
+        output = temp_dir / "out.csv"
+        code = (
+            "import sys, exporter; from pathlib import Path; "
+            f"exporter.export_to_csv([Path({str(sample_dbase3_file)!r})], "
+            f"Path({str(output)!r})); "
+            "print('pandas' in sys.modules, 'dbfread' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().endswith("False False")
+        assert output.exists()
+
+    def test_import_app_does_not_import_gradio(self):
+        """Test gradio, pandas dan numpy baru diimpor saat UI/handler dipakai"""
+        code = (
+            "import sys, app; "
+            "print(any(m in sys.modules for m in ('gradio', 'pandas', 'numpy')))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "False"
+
+
+class TestExportAggregate:
+    """Tests untuk export_aggregate"""
+
+    def test_group_by_to_csv(self, sample_dbase3_file, temp_dir):
+        """Test ringkasan group-by ditulis ke CSV"""
+        output = temp_dir / "ringkasan.csv"
+        exporter.export_aggregate(
+            [sample_dbase3_file], output, "csv", ["NAME"], ["VALUE"]
+        )
+
+        rows = read_csv(output)
+        assert rows[0] == ["NAME", "COUNT", "SUM_VALUE", "MIN_VALUE", "MAX_VALUE"]
+        assert rows[1] == ["Product A", "1", "1000", "1000", "1000"]
+        assert len(rows) == 4
@@ -0,0 +1,148 @@
+"""
+Unit tests untuk ekspor terurut dengan external merge sort (extsort)
+"""
+
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import dbase
+import exporter
+import extsort
+from blockio import IOConfig
+
+FIELDS = [("TANGGAL", "D", 8), ("NOTA", "C", 6), ("QTY", "N", 5)]
+# Cukup besar untuk beberapa run dengan --max-memory minimum (blok 64 KB)
+COUNT = 20000
+
+
+def make_rows(count):
+    return [
+        [
+            b"202401%02d" % (i * 7 % 28 + 1),
+            b"N%05d" % (i * 13 % 97),
+            str(i).rjust(5).encode(),
+        ]
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def sales_file(dbase3_factory):
+    # Record terhapus tetap diekspor, sama seperti tanpa --sort-by
+    return dbase3_factory(
+        name="TJUAL.DTA", fields=FIELDS, rows=make_rows(COUNT), deleted={5, 1234}
+    )
+
+
+def expected(rows, key):
+    """Urutan naif: sort stabil di Python atas semua record"""
+    return sorted((tuple(v.decode().strip() for v in row) for row in rows), key=key)
+
+
+class TestSortedRows:
+    """Tests untuk sorted_rows"""
+
+    def test_sorts_in_memory(self, sales_file):
+        """Test file yang muat dalam satu run diurutkan tanpa menulis ke disk"""
+        header = dbase.read_header(sales_file)
+
+        rows = list(extsort.sorted_rows(sales_file, header, ["tanggal", "NOTA"]))
+
+        assert rows == expected(make_rows(COUNT), lambda r: r[:2])
+
+    def test_merges_spilled_runs(self, sales_file, temp_dir, monkeypatch):
+        """Test banyak run di scratch digabung stabil (kunci sama: urutan asli)"""
+        spilled = []
+        spill = extsort._spill
+        monkeypatch.setattr(
+            extsort,
+            "_spill",
+            lambda items, path: spilled.append(path) or spill(items, path),
+        )
+        header = dbase.read_header(sales_file)
+        config = IOConfig(scratch_dir=temp_dir, max_memory=64 * 1024)
+
+        rows = list(extsort.sorted_rows(sales_file, header, ["TANGGAL"], None, config))
+
+        assert len(spilled) > 2
+        assert all(p.parent.parent == temp_dir for p in spilled)
+        assert rows == expected(make_rows(COUNT), lambda r: r[0])
+        # Direktori run dihapus setelah selesai
+        assert list(temp_dir.iterdir()) == [sales_file]
+
+    def test_multi_pass_merge(self, sales_file, temp_dir, monkeypatch):
+        """Test run melebihi fan-in digabung bertahap, file terbuka tetap dibatasi"""
+        monkeypatch.setattr(extsort, "MERGE_FAN_IN", 2)
+        fan_in = []
+        merged = extsort._merged
+        monkeypatch.setattr(
+            extsort,
+            "_merged",
+            lambda paths, *args: fan_in.append(len(paths)) or merged(paths, *args),
+        )
+        header = dbase.read_header(sales_file)
+        config = IOConfig(scratch_dir=temp_dir, max_memory=64 * 1024)
+
+        rows = list(extsort.sorted_rows(sales_file, header, ["NOTA"], None, config))
+
+        assert len(fan_in) > 2
+        assert max(fan_in) == 2
+        assert rows == expected(make_rows(COUNT), lambda r: r[1])
+        assert list(temp_dir.iterdir()) == [sales_file]
+
+    def test_unknown_field(self, sales_file):
+        """Test kolom tidak dikenal ditolak sebelum baris dibaca"""
+        header = dbase.read_header(sales_file)
+
+        with pytest.raises(ValueError, match="tidak ditemukan"):
+            extsort.sorted_rows(sales_file, header, ["HARGA"])
+
+    def test_parse_fields(self):
+        """Test daftar kolom dipisah koma"""
+        assert extsort.parse_fields(" TANGGAL, NOTA ") == ["TANGGAL", "NOTA"]
+        with pytest.raises(ValueError):
+            extsort.parse_fields(" , ")
+
+
+class TestSortByOption:
+    """Tests untuk opsi --sort-by di CLI"""
+
+    def test_csv_sorted(self, sales_file, temp_dir):
+        """Test CSV ditulis terurut dengan --max-memory kecil"""
+        output = temp_dir / "out.csv"
+
+        exporter.main(
+            ["-i", str(sales_file), "-o", str(output), "--sort-by", "NOTA,TANGGAL"]
+            + ["--max-memory", "64K"]
+        )
+
+        with open(output, newline="", encoding="utf-8-sig") as f:
+            rows = [tuple(r) for r in csv.reader(f)]
+        assert rows[0] == ("TANGGAL", "NOTA", "QTY")
+        assert rows[1:] == expected(make_rows(COUNT), lambda r: (r[1], r[0]))
+
+    def test_same_rows_as_unsorted(self, sales_file, temp_dir):
+        """Test --sort-by hanya mengubah urutan, bukan isi (termasuk record terhapus)"""
+        outputs = []
+        for extra in ([], ["--sort-by", "QTY"]):
+            output = temp_dir / f"out{len(outputs)}.csv"
+            exporter.main(["-i", str(sales_file), "-o", str(output)] + extra)
+            with open(output, newline="", encoding="utf-8-sig") as f:
+                outputs.append(sorted(tuple(r) for r in csv.reader(f)))
+
+        assert outputs[0] == outputs[1]
+        assert len(outputs[0]) == COUNT + 1
+
+    def test_rejected_for_sqlite(self, sales_file, temp_dir):
+        """Test --sort-by tidak bisa dipakai untuk output SQLite"""
+        with pytest.raises(SystemExit):
+            exporter.main(
+                ["-i", str(sales_file), "-o", str(temp_dir / "out.db")]
+                + ["--sort-by", "NOTA"]
+            )
@@ -2,6 +2,8 @@
 Integration tests untuk full export workflow
 """
 
+import zipfile
+
 import pandas as pd
 import pytest
 from pathlib import Path
@@ -12,11 +14,17 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import app
 from app import (
     detect_and_read,
+    member_choices,
     preview_file,
     export_single,
     export_multiple,
+    browse_page,
+    next_page,
+    prev_page,
+    jump_to_record,
 )
 
 
@@ -56,6 +64,98 @@ class TestPreviewFileIntegration:
         assert len(df) <= 100
 
 
+class TestPagedPreviewIntegration:
+    """Integration tests untuk preview per halaman"""
+
+    @pytest.fixture
+    def paged_file(self, dbase3_factory):
+        rows = [[f"K{i}".encode(), str(i).encode()] for i in range(250)]
+        mock_file = MagicMock()
+        mock_file.name = str(
+            dbase3_factory(fields=[("KODE", "C", 6), ("QTY", "N", 5)], rows=rows)
+        )
+        return mock_file
+
+    def test_page_window(self, paged_file):
+        """Test halaman hanya berisi record pada jendelanya"""
+        df, status, page = browse_page(paged_file, 2, 100)
+
+        assert page == 2
+        assert len(df) == 100
+        assert df.iloc[0]["No."] == 101
+        assert df.iloc[0]["KODE"] == "K100"
+        assert "Halaman 2/3" in status
+
+    def test_page_is_clamped(self, paged_file):
+        """Test nomor halaman dibatasi ke rentang yang valid"""
+        df, _, page = browse_page(paged_file, 99, 100)
+        assert page == 3
+        assert len(df) == 50
+
+        _, _, page = prev_page(paged_file, 1, 100)
+        assert page == 1
+
+    def test_next_page(self, paged_file):
+        """Test tombol halaman berikutnya"""
+        df, _, page = next_page(paged_file, 1, 50)
+
+        assert page == 2
+        assert df.iloc[0]["KODE"] == "K50"
+
+    def test_jump_to_record(self, paged_file):
+        """Test lompat ke halaman yang berisi record tertentu"""
+        df, _, page = jump_to_record(paged_file, 175, 50)
+
+        assert page == 4
+        assert 175 in df["No."].tolist()
+
+    def test_non_dbase_file_is_paged(self, sample_stock_file):
+        """Test file STOCK (tanpa akses acak) tetap bisa dipaging"""
+        mock_file = MagicMock()
+        mock_file.name = str(sample_stock_file)
+
+        df, status, page = browse_page(mock_file, 1, 1)
+
+        assert "[OK]" in status
+        assert len(df) == 1
+        assert "BARCODE" in df.columns
+
+    def test_archive_member_choice(self, dbase3_factory, temp_dir):
+        """Test anggota arsip lain bisa dipilih untuk preview"""
+        fields = [("KODE", "C", 6)]
+        first = dbase3_factory(name="TJUAL.DTA", fields=fields, rows=[[b"A1"]])
+        second = dbase3_factory(name="TBELI.DTA", fields=fields, rows=[[b"B1"]])
+        backup = temp_dir / "backup.zip"
+        with zipfile.ZipFile(backup, "w") as zf:
+            zf.write(first, "DATA/TJUAL.DTA")
+            zf.write(second, "DATA/TBELI.DTA")
+        mock_file = MagicMock()
+        mock_file.name = str(backup)
+
+        assert member_choices(str(backup)) == ["DATA/TJUAL.DTA", "DATA/TBELI.DTA"]
+        df, status, _ = browse_page(mock_file, 1, 100, "DATA/TBELI.DTA")
+        assert df["KODE"].tolist() == ["B1"]
+        assert "TBELI.DTA (2/2 file di arsip)" in status
+
+        _, status, _ = browse_page(mock_file, 1, 100, "DATA/TSTOK.DTA")
+        assert "[ERROR]" in status
+
+    def test_evicted_tables_are_closed(self, dbase3_factory, monkeypatch):
+        """Test DbfTable yang keluar dari cache langsung ditutup (mmap + file)"""
+        monkeypatch.setattr(app, "_tables", app._TableCache(1))
+        paths = [
+            dbase3_factory(name=f"T{i}.DTA", fields=[("K", "C", 2)], rows=[[b"x"]])
+            for i in range(2)
+        ]
+
+        first = app._open_table(app._file_key(str(paths[0])))
+        assert app._open_table(app._file_key(str(paths[0]))) is first
+        app._open_table(app._file_key(str(paths[1])))
+
+        assert first._file.closed
+        app._tables.clear()
+
+
 class TestExportSingleIntegration:
     """Integration tests untuk export_single function"""
 
@@ -83,6 +183,26 @@ class TestExportSingleIntegration:
         assert len(df) > 0
         assert "NAME" in df.columns
 
+    def test_export_single_sorted(self, dbase3_factory):
+        """Test isian "Urutkan berdasarkan" menghasilkan sheet terurut"""
+        path = dbase3_factory(
+            name="SORT.DTA",
+            fields=[("NAME", "C", 4)],
+            rows=[[b"CC"], [b"AA"], [b"BB"]],
+        )
+        mock_file = MagicMock()
+        mock_file.name = str(path)
+
+        output_path, status = export_single(mock_file, "name")
+        df = pd.read_excel(output_path)
+
+        assert "[OK]" in status
+        assert df["NAME"].tolist() == ["AA", "BB", "CC"]
+
+        # Kolom tidak dikenal dilaporkan sebagai error
+        output_path, status = export_single(mock_file, "HARGA")
+        assert "[ERROR]" in status
+
     def test_export_single_none_file_returns_error(self):
         """Test export dengan None file"""
         output_path, status = export_single(None)
@@ -0,0 +1,176 @@
+"""
+Unit tests untuk pemeriksaan integritas dan pemulihan (integrity)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import dbase
+import exporter
+import integrity
+from blockio import IOConfig
+
+FIELDS = [("KODE", "C", 8), ("NAMA", "C", 12), ("QTY", "N", 6), ("TGL", "D", 8)]
+
+
+def rows(n: int) -> list[list[bytes]]:
+    return [[b"K%05d" % i, b"Barang %d" % i, b"%6d" % i, b"20240105"] for i in range(n)]
+
+
+@pytest.fixture
+def sales_file(dbase3_factory):
+    return dbase3_factory(name="TJUAL.DTA", fields=FIELDS, rows=rows(200))
+
+
+def corrupt(
+    filepath: Path, record: int, inserted: bytes = b"", removed: int = 0, at: int = 3
+):
+    """Sisipkan/hapus byte di tengah record tertentu (menggeser semua sesudahnya)"""
+    header = dbase.read_header(filepath)
+    data = bytearray(filepath.read_bytes())
+    pos = header.header_size + record * header.record_size + at
+    data[pos : pos + removed] = inserted
+    filepath.write_bytes(bytes(data))
+
+
+class TestSizeCheck:
+    """Tests untuk size_check"""
+
+    def test_healthy_file(self, sales_file):
+        """Test file utuh (dengan EOF 0x1A) tidak menghasilkan peringatan"""
+        report = integrity.size_check(sales_file)
+
+        assert report.records_in_file == 200
+        assert report.ok
+
+    def test_truncated_file(self, sales_file):
+        """Test file terpotong di tengah record"""
+        sales_file.write_bytes(sales_file.read_bytes()[:-100])
+        report = integrity.size_check(sales_file)
+
+        assert report.truncated
+        assert report.records_in_file == 197
+        assert report.trailing_bytes == 35 * 3 - 99
+        assert "terpotong" in report.warnings()[0]
+
+
+class TestScan:
+    """Tests untuk scan (validasi deletion flag)"""
+
+    def test_deleted_records_are_valid(self, dbase3_factory):
+        """Test flag '*' bukan kerusakan"""
+        filepath = dbase3_factory(fields=FIELDS, rows=rows(20), deleted={3, 4})
+
+        assert integrity.scan(filepath).ok
+
+    def test_misaligned_region(self, sales_file):
+        """Test byte sisipan menggeser semua record sesudahnya"""
+        corrupt(sales_file, 50, inserted=b"\x00\x01\x02")
+        report = integrity.scan(sales_file, io_config=IOConfig(block_size=1024))
+
+        assert report.scanned
+        (start, stop) = report.bad_regions[0]
+        assert 50 <= start <= 51
+        assert stop >= 190
+
+    def test_early_eof(self, sales_file):
+        """Test EOF 0x1A di tengah data dilaporkan"""
+        header = dbase.read_header(sales_file)
+        data = bytearray(sales_file.read_bytes())
+        data[header.header_size + 120 * header.record_size] = 0x1A
+        sales_file.write_bytes(bytes(data))
+
+        assert integrity.scan(sales_file).eof_at == 120
+
+
+class TestRecover:
+    """Tests untuk recover"""
+
+    def test_resync_after_insert_and_delete(self, sales_file, temp_dir):
+        """Test record sesudah area rusak diselamatkan dengan sinkron ulang"""
+        corrupt(sales_file, 150, removed=5)
+        corrupt(sales_file, 50, inserted=b"XY\x00")
+        output = temp_dir / "pulih.DTA"
+        result = integrity.recover(sales_file, output)
+
+        header = dbase.read_header(output)
+        kept = [row[0] for row in dbase.iter_rows(output, header)]
+        assert header.num_records == result.recovered == len(kept)
+        assert len(result.resyncs) == 2
+        # Hanya record yang terkena kerusakan yang hilang
+        expected = {f"K{i:05d}" for i in range(200)} - {"K00050", "K00150"}
+        assert set(kept) == expected
+        assert integrity.scan(output).ok
+
+    @pytest.mark.parametrize("learn", [True, False])
+    def test_resync_with_padded_text_field_last(
+        self, dbase3_factory, temp_dir, monkeypatch, learn
+    ):
+        """Test offset yang bergeser ke padding spasi field C terakhir tidak dipakai"""
+        fields = [("KODE", "C", 8), ("QTY", "N", 6), ("TGL", "D", 8), ("NAMA", "C", 20)]
+        path = dbase3_factory(
+            name="TJUAL.DTA",
+            fields=fields,
+            rows=[
+                [b"K%05d" % i, b"%6d" % i, b"20240105", b"Barang %d" % i]
+                for i in range(3000)
+            ],
+        )
+        if learn:
+            # Sisipan di field C: hanya profil field C yang mendeteksinya
+            corrupt(path, 1000, inserted=b"XY\x00")
+        else:
+            # Tanpa profil: kandidat yang sejajar dengan akhir data didahulukan
+            monkeypatch.setattr(integrity._Validator, "learn", lambda *args: None)
+            corrupt(path, 1000, inserted=b"abc", at=12)
+        output = temp_dir / "pulih.DTA"
+
+        result = integrity.recover(path, output)
+
+        assert len(result.resyncs) == 1
+        header = dbase.read_header(output)
+        kept = [row[0] for row in dbase.iter_rows(output, header)]
+        expected = [f"K{i:05d}" for i in range(3000) if i != 1000]
+        assert [k for k in kept if k != "K0XY\x00100"] == expected
+        assert integrity.scan(output).ok
+
+    def test_records_after_early_eof(self, sales_file, temp_dir):
+        """Test record setelah EOF 0x1A yang terlalu awal ikut diselamatkan"""
+        header = dbase.read_header(sales_file)
+        data = bytearray(sales_file.read_bytes())
+        data[header.header_size + 10 * header.record_size] = 0x1A
+        sales_file.write_bytes(bytes(data))
+        output = temp_dir / "pulih.DTA"
+
+        result = integrity.recover(sales_file, output)
+
+        assert result.recovered == 199
+
+
+class TestCheckCommand:
+    """Tests untuk subcommand exporter.py check"""
+
+    def test_check_and_recover(self, sales_file, temp_dir, capsys):
+        """Test file rusak dilaporkan dan salinan pulih ditulis"""
+        corrupt(sales_file, 80, inserted=b"\x00")
+        status = exporter.main(
+            ["check", str(sales_file), "--recover", str(temp_dir / "pulih")]
+        )
+
+        out = capsys.readouterr().out
+        assert status == 1
+        assert "PERINGATAN" in out
+        assert (temp_dir / "pulih" / "TJUAL.DTA").exists()
+
+    def test_read_warns_on_truncation(self, sales_file, capsys):
+        """Test pembacaan biasa memberi peringatan untuk file terpotong"""
+        sales_file.write_bytes(sales_file.read_bytes()[:-100])
+        df = exporter.read_dbase3_manual(sales_file)
+
+        assert len(df) == 197
+        assert "terpotong" in capsys.readouterr().out
@@ -0,0 +1,125 @@
+"""
+Unit tests untuk inventaris header (inventory / exporter.py inspect)
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import exporter
+import inventory
+
+ROOT = Path(__file__).parent.parent
+FIELDS = [("KODE", "C", 6), ("HARGA", "N", 8, 2)]
+ROWS = [[b"A%d" % i, b"%8.2f" % i] for i in range(10)]
+
+
+class TestInspectFile:
+    """Tests untuk inspect_file"""
+
+    def test_dbase3(self, dbase3_factory):
+        """Test format, tanggal, struktur field, dan ukuran sesuai header"""
+        info = inventory.inspect_file(dbase3_factory(fields=FIELDS, rows=ROWS))
+
+        assert info.format == "dbase3"
+        assert info.version == 0x03
+        assert info.last_update == "2024-01-01"
+        assert info.num_records == 10
+        assert info.expected_size == info.size - 1  # + EOF 0x1A
+        assert info.fields[1] == {
+            "name": "HARGA",
+            "type": "N",
+            "length": 8,
+            "decimals": 2,
+        }
+        assert info.status == inventory.STATUS_OK
+
+    def test_truncated_dbase3(self, dbase3_factory):
+        """Test file lebih pendek dari ukuran menurut header"""
+        filepath = dbase3_factory(fields=FIELDS, rows=ROWS)
+        filepath.write_bytes(filepath.read_bytes()[:-20])
+
+        assert inventory.inspect_file(filepath).status == inventory.STATUS_TRUNCATED
+
+    def test_header_from_probe_only(self, temp_dir):
+        """Test file tanpa terminator header: ERROR dari probe, bukan scan seluruh file"""
+        filepath = temp_dir / "JUNK.DTA"
+        filepath.write_bytes(b"\x03" + b"\x41" * (2 * 1024 * 1024))
+
+        info = inventory.inspect_file(filepath)
+
+        assert info.status == inventory.STATUS_ERROR
+        assert "Terminator" in info.error
+
+    def test_stock(self, sample_stock_file):
+        """Test STOCK1.DAT: ukuran record terdeteksi dari barcode"""
+        info = inventory.inspect_file(sample_stock_file)
+
+        assert info.format == "stock"
+        assert info.record_size == 23
+        assert info.num_records == 3
+
+    def test_empty_file(self, empty_file):
+        """Test file kosong tidak membuat scan gagal"""
+        info = inventory.inspect_file(empty_file)
+
+        assert info.size == 0
+        assert info.format == "unknown"
+
+    def test_import_does_not_load_exporter(self):
+        """Test modul library tidak memuat modul CLI exporter"""
+        code = "import sys, inventory, changes; print('exporter' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "False"
+
+
+class TestScan:
+    """Tests untuk find_files dan scan"""
+
+    def test_recursive_scan_keeps_order(self, dbase3_factory, temp_dir):
+        """Test subdirektori ikut di-scan, file lain diabaikan"""
+        (temp_dir / "sub").mkdir()
+        dbase3_factory(name="sub/B.DTA", fields=FIELDS, rows=ROWS)
+        dbase3_factory(name="A.DTA", fields=FIELDS, rows=ROWS[:2])
+        (temp_dir / "catatan.txt").write_text("bukan data")
+
+        files = inventory.find_files([temp_dir])
+        infos = inventory.scan(files, workers=4)
+
+        assert [Path(i.path).name for i in infos] == ["A.DTA", "B.DTA"]
+        assert [i.num_records for i in infos] == [2, 10]
+        assert inventory.find_files([temp_dir], recursive=False) == [temp_dir / "A.DTA"]
+
+
+class TestInspectCommand:
+    """Tests untuk subcommand exporter.py inspect"""
+
+    def test_json_output(self, dbase3_factory, temp_dir, capsys):
+        """Test output JSON bisa di-parse"""
+        dbase3_factory(name="TJUAL.DTA", fields=FIELDS, rows=ROWS)
+        exporter.main(["inspect", str(temp_dir), "--json"])
+
+        (info,) = json.loads(capsys.readouterr().out)
+        assert info["format"] == "dbase3"
+        assert info["num_records"] == 10
+
+    def test_table_output(self, dbase3_factory, temp_dir, capsys):
+        """Test tabel berisi nama file dan struktur field"""
+        dbase3_factory(name="TJUAL.DTA", fields=FIELDS, rows=ROWS)
+        exporter.main(["inspect", str(temp_dir), "--fields"])
+
+        out = capsys.readouterr().out
+        assert "TJUAL.DTA" in out
+        assert "N(8,2)" in out
@@ -0,0 +1,168 @@
+"""
+Unit tests untuk join streaming STOCK1.DAT x record dBase (join)
+"""
+
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import columnar
+import exporter
+import join
+import stock
+from blockio import IOConfig
+
+FIELDS = [("NOTA", "C", 6), ("KODE", "C", 15), ("QTY", "N", 4)]
+STOCK = {"8991234567890": 10, "8997654321098": 20, "8990000000001": 30}
+
+
+@pytest.fixture
+def stock_file(temp_dir):
+    filepath = temp_dir / "STOCK1.DAT"
+    data = bytearray(b"\x06\x00" * 50)
+    # Record terakhir tidak terbaca oleh parser STOCK, jadi tambahkan satu dummy
+    for barcode, value in [*STOCK.items(), ("0000000000000", 0)]:
+        data += barcode.encode() + struct.pack("<II", 2020, value) + b"\x00\x00"
+    filepath.write_bytes(bytes(data))
+    return filepath
+
+
+@pytest.fixture
+def sales_file(dbase3_factory):
+    codes = ["8991234567890", "1111111111111", "  8990000000001", "", "8997654321098"]
+    rows = [
+        [b"N%05d" % i, codes[i % len(codes)].encode(), str(i).rjust(4).encode()]
+        for i in range(25)
+    ]
+    return dbase3_factory(name="TJUAL.DTA", fields=FIELDS, rows=rows, deleted={0})
+
+
+class TestStockIndex:
+    """Tests untuk StockIndex"""
+
+    def test_lookup(self, stock_file):
+        """Test pencocokan barcode, termasuk kunci yang lebih lebar dan kosong"""
+        index = join.StockIndex.from_file(stock_file)
+        probe = np.array(
+            [b"8997654321098  ", b"  8990000000001", b"1111111111111", b""],
+            dtype="S15",
+        )
+        matched, pos = index.lookup(probe)
+
+        assert matched.tolist() == [True, True, False, False]
+        assert index.fields(pos[matched]) == [[20, 30]]
+        assert index.fields(pos, matched) == [[20, 30, None, None]]
+        assert index.columns == ["STOCK_VALUE"]
+
+    def test_carries_every_stock_field(self, stock_file):
+        """Test semua kolom STOCK selain BARCODE ikut di indeks"""
+        layout = stock.StockLayout(
+            (
+                stock.StockField("BARCODE", 0, "13s"),
+                stock.StockField("TAHUN", 13, "<I"),
+                stock.StockField("VALUE", 17, "<I"),
+            )
+        )
+        table = columnar.load_stock(stock_file.read_bytes(), layout=layout)
+        index = join.StockIndex(table)
+        matched, pos = index.lookup(np.array([b"8990000000001"], dtype="S13"))
+
+        assert index.columns == ["STOCK_TAHUN", "STOCK_VALUE"]
+        assert index.fields(pos[matched]) == [[2020], [30]]
+
+
+class TestJoinRows:
+    """Tests untuk join_rows"""
+
+    def expected(self, how):
+        codes = ["8991234567890", "1111111111111", "8990000000001", "", "8997654321098"]
+        rows = []
+        for i in range(1, 25):
+            code = codes[i % len(codes)]
+            if code in STOCK or how == "left":
+                rows.append((f"N{i:05d}", code, str(i), STOCK.get(code)))
+        return rows
+
+    @pytest.mark.parametrize("how", ["inner", "left"])
+    def test_matches_naive_join(self, stock_file, sales_file, how):
+        """Test hasil join sama dengan join naif per record"""
+        index = join.StockIndex.from_file(stock_file)
+        # Chunk kecil agar join melewati banyak chunk
+        config = IOConfig(block_size=64, readahead=0)
+        columns, rows = join.join_rows(sales_file, index, "kode", how, config)
+
+        assert columns == ["NOTA", "KODE", "QTY", "STOCK_VALUE"]
+        assert list(rows) == self.expected(how)
+
+    def test_unknown_field(self, stock_file, sales_file):
+        """Test kolom --on tidak ada -> ValueError"""
+        index = join.StockIndex.from_file(stock_file)
+        with pytest.raises(ValueError, match="tidak ditemukan"):
+            join.join_rows(sales_file, index, "BARCODE")
+
+
+class TestExportJoin:
+    """Tests untuk exporter.export_join"""
+
+    def test_join_to_csv_skips_stock_input(self, stock_file, sales_file, temp_dir):
+        """Test output CSV; file STOCK di daftar input tidak ikut di-join"""
+        output = temp_dir / "jual.csv"
+        exporter.export_join(
+            [sales_file, stock_file], output, "csv", stock_file, "KODE"
+        )
+
+        target = temp_dir / "jual_TJUAL.csv"
+        lines = target.read_text(encoding="utf-8-sig").splitlines()
+        assert lines[0] == "NOTA,KODE,QTY,STOCK_VALUE"
+        assert len(lines) == 1 + len(TestJoinRows().expected("inner"))
+        assert not (temp_dir / "jual_STOCK1.csv").exists()
+
+    def test_join_to_xlsx(self, stock_file, sales_file, temp_dir):
+        """Test output xlsx ditulis lewat sheet di scratch (tanpa DataFrame)"""
+        openpyxl = pytest.importorskip("openpyxl")
+        output = temp_dir / "jual.xlsx"
+        scratch = temp_dir / "scratch"
+        scratch.mkdir()
+        exporter.export_join(
+            [sales_file],
+            output,
+            "xlsx",
+            stock_file,
+            "KODE",
+            "left",
+            IOConfig(scratch_dir=scratch),
+        )
+
+        sheet = openpyxl.load_workbook(output)["TJUAL"]
+        assert [c.value for c in sheet[1]] == ["NOTA", "KODE", "QTY", "STOCK_VALUE"]
+        assert sheet.max_row == 1 + len(TestJoinRows().expected("left"))
+        assert not list(scratch.iterdir())
+
+    def test_cli_stock_layout(self, stock_file, sales_file, temp_dir):
+        """Test --stock-layout juga berlaku untuk indeks --join-stock"""
+        schema = temp_dir / "stock.json"
+        schema.write_text(
+            '{"fields": [{"name": "BARCODE", "offset": 0, "type": "13s"},'
+            ' {"name": "TAHUN", "offset": 13, "type": "<I"}]}'
+        )
+        output = temp_dir / "jual.csv"
+        exporter.main(
+            ["-i", str(sales_file), "-o", str(output), "--join-stock", str(stock_file)]
+            + ["--on", "KODE", "--stock-layout", str(schema)]
+        )
+
+        lines = output.read_text(encoding="utf-8-sig").splitlines()
+        assert lines[0] == "NOTA,KODE,QTY,STOCK_TAHUN"
+        assert {line.rsplit(",", 1)[1] for line in lines[1:]} == {"2020"}
+
+    def test_layout_without_barcode(self, stock_file):
+        """Test skema tanpa field BARCODE ditolak untuk join"""
+        layout = stock.StockLayout((stock.StockField("VALUE", 17, "<I"),))
+        with pytest.raises(ValueError, match="BARCODE"):
+            join.StockIndex.from_file(stock_file, layout=layout)
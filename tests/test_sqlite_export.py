@@ -0,0 +1,154 @@
+"""
+Unit tests untuk ekspor bulk SQLite (sqlite_export)
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import exporter
+import sqlite_export
+
+FIELDS = [
+    ("TANGGAL", "D", 8),
+    ("KODE", "C", 4),
+    ("QTY", "N", 5),
+    ("HARGA", "N", 8, 2),
+    ("LUNAS", "L", 1),
+]
+
+
+def sale(i: int) -> list[bytes]:
+    return [
+        b"2024010%d" % (i % 3 + 1),
+        b"P%02d" % (i % 4),
+        str(i).rjust(5).encode(),
+        f"{i * 1.5:8.2f}".encode(),
+        b"T" if i % 2 else b"F",
+    ]
+
+
+def query(db: Path, sql: str) -> list[tuple]:
+    conn = sqlite3.connect(db)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+class TestLoadDbase:
+    """Tests untuk load_dbase"""
+
+    def test_typed_columns(self, dbase3_factory, temp_dir):
+        """Test tipe kolom dari deskriptor field dan konversi nilai"""
+        filepath = dbase3_factory(
+            name="TJUAL.DTA",
+            fields=FIELDS,
+            rows=[sale(i) for i in range(10)],
+            deleted={0},
+        )
+        db = temp_dir / "out.db"
+        conn = sqlite_export.connect(db)
+        count, appended = sqlite_export.load_dbase(conn, filepath, "TJUAL")
+        sqlite_export.finish(conn)
+
+        assert (count, appended) == (9, False)
+        types = [row[2] for row in query(db, "PRAGMA table_info(TJUAL)")]
+        assert types == ["TEXT", "TEXT", "INTEGER", "REAL", "INTEGER"]
+        assert query(db, "SELECT * FROM TJUAL LIMIT 1") == [
+            ("2024-01-02", "P01", 1, 1.5, 1)
+        ]
+
+    def test_blank_and_overflow_numbers_are_null(self, dbase3_factory, temp_dir):
+        """Test sel angka kosong atau '*****' menjadi NULL"""
+        filepath = dbase3_factory(
+            fields=[("QTY", "N", 5)], rows=[[b"     "], [b"*****"], [b"   42"]]
+        )
+        conn = sqlite_export.connect(temp_dir / "out.db")
+        sqlite_export.load_dbase(conn, filepath, "data")
+        rows = conn.execute("SELECT QTY FROM data").fetchall()
+        conn.close()
+
+        assert rows == [(None,), (None,), (42,)]
+
+    def test_append_loads_only_new_records(self, dbase3_factory, temp_dir):
+        """Test append hanya memuat record yang bertambah sejak load sebelumnya"""
+        db = temp_dir / "out.db"
+        filepath = dbase3_factory(
+            name="TJUAL.DTA", fields=FIELDS, rows=[sale(i) for i in range(5)]
+        )
+        conn = sqlite_export.connect(db)
+        sqlite_export.load_dbase(conn, filepath, "TJUAL", append=True)
+
+        # File tumbuh: record baru ditambahkan di akhir
+        dbase3_factory(
+            name="TJUAL.DTA", fields=FIELDS, rows=[sale(i) for i in range(8)]
+        )
+        count, appended = sqlite_export.load_dbase(conn, filepath, "TJUAL", append=True)
+        sqlite_export.finish(conn)
+
+        assert (count, appended) == (3, True)
+        assert query(db, "SELECT QTY FROM TJUAL") == [(i,) for i in range(8)]
+
+    def test_append_reloads_when_structure_changes(self, dbase3_factory, temp_dir):
+        """Test struktur field berubah -> tabel dimuat ulang penuh"""
+        db = temp_dir / "out.db"
+        filepath = dbase3_factory(
+            name="TJUAL.DTA", fields=FIELDS, rows=[sale(i) for i in range(5)]
+        )
+        conn = sqlite_export.connect(db)
+        sqlite_export.load_dbase(conn, filepath, "TJUAL")
+
+        dbase3_factory(
+            name="TJUAL.DTA", fields=FIELDS[:3], rows=[sale(i)[:3] for i in range(2)]
+        )
+        count, appended = sqlite_export.load_dbase(conn, filepath, "TJUAL", append=True)
+        sqlite_export.finish(conn)
+
+        assert (count, appended) == (2, False)
+        assert len(query(db, "PRAGMA table_info(TJUAL)")) == 3
+
+
+class TestCreateIndexes:
+    """Tests untuk create_indexes"""
+
+    def test_single_and_composite_index(self, dbase3_factory, temp_dir):
+        """Test index tunggal dan gabungan (nama kolom tidak peka huruf)"""
+        filepath = dbase3_factory(fields=FIELDS, rows=[sale(i) for i in range(4)])
+        conn = sqlite_export.connect(temp_dir / "out.db")
+        sqlite_export.load_dbase(conn, filepath, "data")
+        names = sqlite_export.create_indexes(conn, "data", ["kode", "TANGGAL,KODE"])
+        conn.close()
+
+        assert names == ["idx_data_KODE", "idx_data_TANGGAL_KODE"]
+
+    def test_unknown_column(self, dbase3_factory, temp_dir):
+        """Test kolom tidak ada -> ValueError"""
+        filepath = dbase3_factory(fields=FIELDS, rows=[sale(0)])
+        conn = sqlite_export.connect(temp_dir / "out.db")
+        sqlite_export.load_dbase(conn, filepath, "data")
+
+        with pytest.raises(ValueError, match="tidak ditemukan"):
+            sqlite_export.create_indexes(conn, "data", ["NOTA"])
+        conn.close()
+
+
+class TestExportToSqlite:
+    """Tests untuk exporter.export_to_sqlite"""
+
+    def test_one_table_per_file(self, sample_dbase3_file, sample_stock_file, temp_dir):
+        """Test dBase dan STOCK1.DAT masuk ke tabel masing-masing"""
+        db = temp_dir / "hasil.db"
+        exporter.export_to_sqlite([sample_dbase3_file, sample_stock_file], db)
+
+        assert query(db, "SELECT NAME, VALUE FROM test") == [
+            ("Product A", 1000),
+            ("Product B", 2000),
+            ("Product C", 3000),
+        ]
+        assert query(db, "SELECT BARCODE FROM STOCK1 LIMIT 1") == [("8991234567890",)]
@@ -0,0 +1,111 @@
+"""
+Unit tests untuk penulis xlsx multi-sheet (xlsx)
+"""
+
+import sys
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import openpyxl
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import exporter
+import xlsx
+
+FIELDS = [("KODE", "C", 8), ("QTY", "N", 6)]
+
+
+def rows(n: int) -> list[list[bytes]]:
+    return [[b"K%05d" % i, b"%6d" % i] for i in range(n)]
+
+
+class TestHelpers:
+    """Tests untuk huruf kolom dan nama sheet"""
+
+    def test_column_letter(self):
+        assert [xlsx.column_letter(i) for i in (0, 25, 26, 701, 702)] == [
+            "A",
+            "Z",
+            "AA",
+            "ZZ",
+            "AAA",
+        ]
+
+    def test_sheet_names_unique_and_valid(self):
+        names = xlsx.sheet_names(["TJUAL", "tjual", "A/B", "X" * 40])
+        assert names == ["TJUAL", "tjual (2)", "A_B", "X" * 31]
+
+
+class TestWorkbook:
+    """Tests untuk write_sheet + assemble"""
+
+    def test_roundtrip_values(self, temp_dir):
+        part = xlsx.write_sheet(
+            temp_dir / "p1",
+            ["TEKS", "ANGKA", "LAIN"],
+            [("a & <b>", 5, 1.5), (" spasi", None, True), ("x\x01y", float("nan"), 0)],
+        )
+        empty = xlsx.write_sheet(temp_dir / "p2", ["K"], [])
+        output = temp_dir / "out.xlsx"
+        xlsx.assemble(output, [("Satu", part), ("Dua", empty)])
+
+        assert zipfile.ZipFile(output).testzip() is None
+        wb = openpyxl.load_workbook(output)
+        assert wb.sheetnames == ["Satu", "Dua"]
+        values = [[c.value for c in r] for r in wb["Satu"].iter_rows()]
+        assert values == [
+            ["TEKS", "ANGKA", "LAIN"],
+            ["a & <b>", 5, 1.5],
+            [" spasi", None, True],
+            ["xy", None, 0],
+        ]
+        assert wb["Satu"]["A1"].font.b
+        assert part.rows == 3 and empty.rows == 0
+
+    def test_numpy_scalars(self, temp_dir):
+        """Test skalar numpy ditulis sebagai angka, bukan repr numpy"""
+        part = xlsx.write_sheet(
+            temp_dir / "p", ["A", "B"], [(np.float64(1.5), np.int64(7))]
+        )
+        output = temp_dir / "out.xlsx"
+        xlsx.assemble(output, [("Satu", part)])
+
+        wb = openpyxl.load_workbook(output)
+        assert [c.value for c in wb["Satu"][2]] == [1.5, 7]
+
+    def test_row_limit(self, temp_dir, monkeypatch):
+        monkeypatch.setattr(xlsx, "MAX_ROWS", 3)
+        with pytest.raises(ValueError, match="batas Excel"):
+            xlsx.write_sheet(temp_dir / "p", ["A"], [(i,) for i in range(3)])
+
+    def test_no_sheets(self, temp_dir):
+        with pytest.raises(ValueError):
+            xlsx.assemble(temp_dir / "out.xlsx", [])
+
+
+class TestExportToExcel:
+    """Tests untuk ekspor multi-sheet paralel"""
+
+    def test_sheet_per_file(self, temp_dir, dbase3_factory):
+        first = dbase3_factory(name="A.DTA", fields=FIELDS, rows=rows(30))
+        second = dbase3_factory(name="B.DTA", fields=FIELDS, rows=rows(5))
+        missing = temp_dir / "C.DTA"
+        output = temp_dir / "out.xlsx"
+        exporter.export_to_excel([first, missing, second], output, workers=2)
+
+        wb = openpyxl.load_workbook(output, read_only=True)
+        assert wb.sheetnames == ["A", "B"]
+        values = list(wb["B"].iter_rows(values_only=True))
+        assert values[0] == ("KODE", "QTY")
+        assert values[-1] == ("K00004", "4")
+        assert len(list(wb["A"].iter_rows())) == 31
+
+    def test_no_data_writes_nothing(self, temp_dir, capsys):
+        output = temp_dir / "out.xlsx"
+        exporter.export_to_excel([temp_dir / "X.DTA"], output)
+        assert not output.exists()
+        assert "Tidak ada data" in capsys.readouterr().out
@@ -0,0 +1,328 @@
+"""
+Penulis xlsx multi-sheet yang bisa diparalelkan (hanya stdlib)
+XML setiap worksheet dibuat dan langsung dikompresi (deflate) ke file part
+sendiri, sehingga tiap sheet bisa dikerjakan proses terpisah. Part yang sudah
+terkompresi lalu dirangkai apa adanya ke kontainer zip bersama workbook,
+styles dan [Content_Types].xml, tanpa dekompresi/kompresi ulang.
+"""
+
+from __future__ import annotations
+
+import math
+import numbers
+import re
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+# Batas Excel per sheet (termasuk baris judul kolom)
+MAX_ROWS = 1_048_576
+MAX_COLUMNS = 16_384
+MAX_SHEET_NAME = 31
+# Baris XML yang dikumpulkan sebelum dikompresi dan ditulis
+FLUSH_ROWS = 2048
+COMPRESS_LEVEL = 6
+COPY_BLOCK = 1024 * 1024
+ZIP_LIMIT = 0xFFFFFFFF
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# Karakter kontrol yang tidak sah di XML 1.0 (openpyxl menolaknya)
+ILLEGAL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+# Style 1 = judul kolom tebal (seperti header DataFrame.to_excel)
+STYLES_XML = (
+    f'{XML_DECL}<styleSheet xmlns="{MAIN_NS}">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/>'
+    "</border></borders>"
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/>'
+    "</cellStyleXfs>"
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    "</cellXfs>"
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/>'
+    "</cellStyles></styleSheet>"
+)
+SHEET_HEAD = f'{XML_DECL}<worksheet xmlns="{MAIN_NS}"><sheetData>'
+SHEET_TAIL = "</sheetData></worksheet>"
+
+
+@dataclass(frozen=True)
+class SheetPart:
+    """Worksheet XML terkompresi (deflate mentah) di file part"""
+
+    path: Path
+    crc: int
+    compressed_size: int
+    size: int
+    rows: int  # Baris data, tanpa judul kolom
+
+
+def column_letter(index: int) -> str:
+    """0 -> A, 25 -> Z, 26 -> AA"""
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _cell(ref: str, value, style: str = "") -> str:
+    """XML satu sel; string kosong untuk nilai kosong (sel dilewati)"""
+    if type(value) is str:
+        # Jalur tercepat: hampir semua sel dari file dBase berupa teks
+        if not value:
+            return ""
+        text = escape(value)
+        if text[0].isspace() or text[-1].isspace():
+            return (
+                f'<c r="{ref}"{style} t="inlineStr"><is>'
+                f'<t xml:space="preserve">{text}</t></is></c>'
+            )
+        return f'<c r="{ref}"{style} t="inlineStr"><is><t>{text}</t></is></c>'
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{style} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, numbers.Real):
+        if not math.isfinite(value):
+            return ""
+        # repr() skalar numpy menghasilkan "np.float64(1.5)"
+        if isinstance(value, numbers.Integral):
+            return f'<c r="{ref}"{style}><v>{int(value)}</v></c>'
+        return f'<c r="{ref}"{style}><v>{float(value)!r}</v></c>'
+    return _cell(ref, str(value), style)
+
+
+def write_sheet(path: Path | str, columns: list, rows) -> SheetPart:
+    """Tulis judul kolom + baris ke file part (deflate), kembalikan SheetPart
+
+    Sel teks ditulis inline (tanpa sharedStrings) agar setiap sheet berdiri
+    sendiri dan bisa dibuat di proses terpisah.
+    """
+    if len(columns) > MAX_COLUMNS:
+        raise ValueError(f"Melebihi batas Excel {MAX_COLUMNS:,} kolom per sheet")
+    path = Path(path)
+    letters = [column_letter(i) for i in range(len(columns))]
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+    crc = size = compressed = 0
+    count = 0
+
+    with open(path, "wb") as f:
+
+        def put(text: str):
+            nonlocal crc, size, compressed
+            # Tag tidak pernah berisi karakter kontrol: bersihkan sekaligus
+            data = ILLEGAL_CHARS.sub("", text).encode("utf-8")
+            crc = zlib.crc32(data, crc)
+            size += len(data)
+            out = compressor.compress(data)
+            compressed += len(out)
+            f.write(out)
+
+        head = "".join(_cell(f"{c}1", v, ' s="1"') for c, v in zip(letters, columns))
+        put(f'{SHEET_HEAD}<row r="1">{head}</row>')
+
+        buffer = []
+        for row in rows:
+            count += 1
+            if count >= MAX_ROWS:
+                raise ValueError(f"Melebihi batas Excel {MAX_ROWS:,} baris per sheet")
+            r = count + 1
+            cells = "".join(_cell(f"{c}{r}", v) for c, v in zip(letters, row))
+            buffer.append(f'<row r="{r}">{cells}</row>')
+            if len(buffer) >= FLUSH_ROWS:
+                put("".join(buffer))
+                buffer.clear()
+        put("".join(buffer) + SHEET_TAIL)
+
+        out = compressor.flush()
+        compressed += len(out)
+        f.write(out)
+
+    return SheetPart(path, crc, compressed, size, count)
+
+
+def sheet_names(stems: list[str]) -> list[str]:
+    """Nama sheet yang sah dan unik (max 31 karakter, tanpa []:*?/\\)"""
+    names = []
+    taken = set()
+    for stem in stems:
+        base = INVALID_SHEET_CHARS.sub("_", stem)[:MAX_SHEET_NAME] or "Sheet"
+        name = base
+        n = 1
+        # Excel membandingkan nama sheet tanpa membedakan huruf besar/kecil
+        while name.upper() in taken:
+            n += 1
+            suffix = f" ({n})"
+            name = base[: MAX_SHEET_NAME - len(suffix)] + suffix
+        taken.add(name.upper())
+        names.append(name)
+    return names
+
+
+def _package_parts(names: list[str]) -> list[tuple[str, str]]:
+    """Part XML workbook, relasi, styles dan content types untuk sheet-sheet ini"""
+    sheets = "".join(
+        f'<sheet name={quoteattr(name)} sheetId="{i}" r:id="rId{i}"/>'
+        for i, name in enumerate(names, 1)
+    )
+    sheet_rels = "".join(
+        f'<Relationship Id="rId{i}" Type="{REL_NS}/worksheet" '
+        f'Target="worksheets/sheet{i}.xml"/>'
+        for i in range(1, len(names) + 1)
+    )
+    overrides = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for i in range(1, len(names) + 1)
+    )
+    return [
+        (
+            "[Content_Types].xml",
+            (
+                f"{XML_DECL}<Types "
+                'xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                '<Default Extension="rels" '
+                'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                '<Default Extension="xml" ContentType="application/xml"/>'
+                '<Override PartName="/xl/workbook.xml" ContentType="application/'
+                'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                '<Override PartName="/xl/styles.xml" ContentType="application/'
+                'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+                f"{overrides}</Types>"
+            ),
+        ),
+        (
+            "_rels/.rels",
+            (
+                f'{XML_DECL}<Relationships xmlns="{PKG_REL_NS}">'
+                f'<Relationship Id="rId1" Type="{REL_NS}/officeDocument" '
+                'Target="xl/workbook.xml"/></Relationships>'
+            ),
+        ),
+        (
+            "xl/workbook.xml",
+            (
+                f'{XML_DECL}<workbook xmlns="{MAIN_NS}" xmlns:r="{REL_NS}">'
+                f"<sheets>{sheets}</sheets></workbook>"
+            ),
+        ),
+        (
+            "xl/_rels/workbook.xml.rels",
+            (
+                f'{XML_DECL}<Relationships xmlns="{PKG_REL_NS}">{sheet_rels}'
+                f'<Relationship Id="rId{len(names) + 1}" Type="{REL_NS}/styles" '
+                'Target="styles.xml"/></Relationships>'
+            ),
+        ),
+        ("xl/styles.xml", STYLES_XML),
+    ]
+
+
+class _ZipWriter:
+    """Penulis zip minimal yang menerima data yang sudah di-deflate"""
+
+    def __init__(self, f):
+        self.f = f
+        self.entries = []
+        t = time.localtime()
+        self.dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+        self.dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+    def _local_header(self, name: bytes, crc: int, compressed: int, size: int):
+        if max(compressed, size, self.f.tell()) >= ZIP_LIMIT:
+            raise ValueError("Workbook melebihi 4 GB (ZIP64 tidak didukung)")
+        self.entries.append((name, crc, compressed, size, self.f.tell()))
+        self.f.write(
+            struct.pack(
+                "<IHHHHHIIIHH",
+                0x04034B50,
+                20,
+                0,
+                8,
+                self.dos_time,
+                self.dos_date,
+                crc,
+                compressed,
+                size,
+                len(name),
+                0,
+            )
+            + name
+        )
+
+    def write_str(self, name: str, text: str):
+        data = text.encode("utf-8")
+        compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+        deflated = compressor.compress(data) + compressor.flush()
+        self._local_header(name.encode(), zlib.crc32(data), len(deflated), len(data))
+        self.f.write(deflated)
+
+    def write_part(self, name: str, part: SheetPart):
+        self._local_header(name.encode(), part.crc, part.compressed_size, part.size)
+        with open(part.path, "rb") as src:
+            while block := src.read(COPY_BLOCK):
+                self.f.write(block)
+
+    def close(self):
+        start = self.f.tell()
+        for name, crc, compressed, size, offset in self.entries:
+            self.f.write(
+                struct.pack(
+                    "<IHHHHHHIIIHHHHHII",
+                    0x02014B50,
+                    20,
+                    20,
+                    0,
+                    8,
+                    self.dos_time,
+                    self.dos_date,
+                    crc,
+                    compressed,
+                    size,
+                    len(name),
+                    0,
+                    0,
+                    0,
+                    0,
+                    0,
+                    offset,
+                )
+                + name
+            )
+        end = self.f.tell()
+        if end >= ZIP_LIMIT:
+            raise ValueError("Workbook melebihi 4 GB (ZIP64 tidak didukung)")
+        count = len(self.entries)
+        self.f.write(
+            struct.pack(
+                "<IHHHHIIH", 0x06054B50, 0, 0, count, count, end - start, start, 0
+            )
+        )
+
+
+def assemble(output: Path | str, sheets: list[tuple[str, SheetPart]]):
+    """Rangkai (nama sheet, part) menjadi file xlsx; part disalin tanpa kompresi ulang"""
+    if not sheets:
+        raise ValueError("Tidak ada sheet untuk ditulis")
+    names = [name for name, _ in sheets]
+    with open(output, "wb") as f:
+        zf = _ZipWriter(f)
+        for name, text in _package_parts(names):
+            zf.write_str(name, text)
+        for i, (_, part) in enumerate(sheets, 1):
+            zf.write_part(f"xl/worksheets/sheet{i}.xml", part)
+        zf.close()